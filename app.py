@@ -1,13 +1,18 @@
 import os
+import sys
 import json
-from flask import Flask, render_template, request, session, flash, redirect, url_for, jsonify, send_from_directory
+import time
+import threading
+from flask import Flask, render_template, request, session, flash, redirect, url_for, jsonify, send_from_directory, Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+_import_start = time.perf_counter()
+
+# Set up logging (DEBUG logging slows the analysis hot path, so it is opt-in)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 class Base(DeclarativeBase):
@@ -28,17 +33,29 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
 # initialize the app with the extension, flask-sqlalchemy >= 3.0.x
 db.init_app(app)
 
-# Import the analysis engine
-from sst_osint.fde import FieldDistortionEngine
+# The analysis engine (spaCy and the analyzers) is loaded on first use, so
+# workers boot quickly and pages that need no analysis never pay for it
 from sst_osint.utils.text_processing import preprocess_text, segment_text
 
-# Initialize the Field Distortion Engine
 fde = None
-try:
-    fde = FieldDistortionEngine(use_gpu=False)
-    logger.info("Field Distortion Engine initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Field Distortion Engine: {e}")
+_fde_lock = threading.Lock()
+startup_timings = {}
+
+def get_fde():
+    """Return the process-wide Field Distortion Engine, creating it on first use."""
+    global fde
+    if fde is None:
+        with _fde_lock:
+            if fde is None:
+                start = time.perf_counter()
+                try:
+                    from sst_osint.fde import FieldDistortionEngine
+                    fde = FieldDistortionEngine(use_gpu=False)
+                    startup_timings["engine"] = time.perf_counter() - start
+                    logger.info(f"Field Distortion Engine initialized in {startup_timings['engine']:.2f} s")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Field Distortion Engine: {e}")
+    return fde
 
 @app.route('/')
 def index():
@@ -47,7 +64,8 @@ def index():
 @app.route('/analyze', methods=['GET', 'POST'])
 def analyze():
     if request.method == 'POST':
-        if not fde:
+        engine = get_fde()
+        if not engine:
             flash("Field Distortion Engine is not available at the moment.", "error")
             return redirect(url_for('index'))
         
@@ -57,12 +75,19 @@ def analyze():
             return redirect(url_for('index'))
         
         try:
-            # Analyze the text
-            results = fde.analyze(text)
+            # Analyze the text with the selected modules (all if none selected)
+            modules = request.form.getlist('modules') or None
+            results = engine.analyze(text, modules=modules)
+            if 'error' in results:
+                flash(f"An error occurred during analysis: {results['error']}", "error")
+                return redirect(url_for('index'))
             
-            # Store in session for the display page
-            session['analysis_results'] = results
-            session['analyzed_text'] = text
+            # Persist the results; the session only carries the id
+            from models import Analysis
+            analysis = Analysis.from_results(text, results, preprocess_text(text))
+            db.session.add(analysis)
+            db.session.commit()
+            session['analysis_id'] = analysis.id
             
             return redirect(url_for('results'))
         except Exception as e:
@@ -74,8 +99,11 @@ def analyze():
 
 @app.route('/results')
 def results():
-    results = session.get('analysis_results')
-    text = session.get('analyzed_text', '')
+    from models import Analysis
+    analysis_id = session.get('analysis_id')
+    analysis = db.session.get(Analysis, analysis_id) if analysis_id is not None else None
+    results = analysis.load_results() if analysis else None
+    text = analysis.text if analysis else ''
     
     if not results:
         flash("No analysis results found. Please analyze some text first.", "warning")
@@ -160,7 +188,7 @@ def get_analysis_data(analysis_id):
         else:
             # Try to look up in database
             from models import Analysis
-            analysis = Analysis.query.get(analysis_id)
+            analysis = db.session.get(Analysis, int(analysis_id)) if analysis_id.isdigit() else None
             if analysis:
                 # Convert database model to visualization JSON format
                 data = {
@@ -169,8 +197,8 @@ def get_analysis_data(analysis_id):
                     "field_classification": analysis.field_classification or "Uncategorized",
                     "total_segments": analysis.num_segments,
                     "summary": analysis.summary,
-                    # This is simplified - in a real app we'd have segment data
-                    "segments": []
+                    "segments": [segment.to_dict(analysis.field_classification) 
+                                 for segment in analysis.segments]
                 }
                 return jsonify(data)
         
@@ -179,6 +207,127 @@ def get_analysis_data(analysis_id):
         logger.error(f"Error fetching analysis data: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Background analysis jobs
+job_queue = None
+
+# Longest a job event stream may hold a request worker (see job_events)
+JOB_EVENTS_SECONDS = int(os.environ.get("FDE_JOB_EVENTS_SECONDS", "30"))
+
+def get_job_queue():
+    """Return the process-wide job queue, creating it on first use."""
+    global job_queue
+    if job_queue is None:
+        from jobs import JobQueue
+        job_queue = JobQueue(app)
+    return job_queue
+
+def job_queue_autostart():
+    """Whether this process should run the job queue without waiting for a submission."""
+    if os.environ.get("FDE_JOB_AUTOSTART", "1").lower() not in ("1", "true", "yes"):
+        return False
+    # The debug reloader's file watcher (main.py) never serves requests; its child does
+    main_file = os.path.basename(getattr(sys.modules.get("__main__"), "__file__", None) or "")
+    return main_file not in ("main.py", "app.py") or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+
+@app.before_request
+def ensure_job_queue():
+    """Start the job queue in workers forked after import (e.g. gunicorn --preload)."""
+    if job_queue_autostart():
+        get_job_queue().start()
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """API endpoint to queue a text for background analysis"""
+    payload = request.get_json(silent=True) or request.form
+    text = payload.get('text', '')
+    if not text:
+        return jsonify({"error": "No text provided"}), 400
+    
+    job_id = get_job_queue().submit(text)
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": url_for('get_job', job_id=job_id),
+        "events_url": url_for('job_events', job_id=job_id)
+    }), 202
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """API endpoint to poll the status of a background analysis"""
+    from models import AnalysisJob
+    job = db.session.get(AnalysisJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    
+    data = job.to_dict()
+    if job.analysis_id:
+        data["analysis_url"] = url_for('get_analysis_data', analysis_id=job.analysis_id)
+    return jsonify(data)
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent event stream reporting status changes of a background analysis.
+    
+    The stream holds a request worker while it is open, so with gunicorn's
+    sync workers it is capped at JOB_EVENTS_SECONDS and clients should poll
+    get_job (the status_url sent with the timeout event) for longer jobs.
+    Open-ended streaming needs threaded or async workers (e.g. --threads or
+    gevent).
+    """
+    from models import AnalysisJob
+    if not db.session.get(AnalysisJob, job_id):
+        return jsonify({"error": "Job not found"}), 404
+    status_url = url_for('get_job', job_id=job_id)
+    
+    def generate():
+        last_status = None
+        deadline = time.time() + JOB_EVENTS_SECONDS
+        while time.time() < deadline:
+            db.session.expire_all()
+            job = db.session.get(AnalysisJob, job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            if job.status != last_status:
+                last_status = job.status
+                event = "complete" if job.done else "status"
+                yield f"event: {event}\ndata: {json.dumps(job.to_dict())}\n\n"
+                if job.done:
+                    return
+            time.sleep(0.5)
+        yield f"event: timeout\ndata: {json.dumps({'status_url': status_url})}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache"})
+
+@app.route('/api/status')
+def status():
+    """API endpoint reporting startup timings, for tracking boot-time regressions"""
+    data = {
+        "engine_loaded": fde is not None,
+        "startup_timings": dict(startup_timings)
+    }
+    if fde is not None:
+        data["engine_timings"] = dict(fde.startup_timings)
+    return jsonify(data)
+
+@app.route('/metrics')
+def metrics():
+    """Cumulative analysis stage timings and item counts in Prometheus text format.
+    
+    With FDE_METRICS_DIR set to a directory shared by all gunicorn and job
+    workers, the totals cover every process. Otherwise they cover only the
+    worker answering the scrape (including the background jobs it dispatched),
+    so they vary between scrapes when several workers run. fde_engine_loaded
+    always describes the answering worker.
+    """
+    from sst_osint.utils.instrumentation import METRICS
+    text = METRICS.render_prometheus()
+    text += "# HELP fde_engine_loaded Whether the analysis engine has been loaded.\n"
+    text += "# TYPE fde_engine_loaded gauge\n"
+    text += f"fde_engine_loaded {int(fde is not None)}\n"
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
 @app.route('/visualize/<analysis_id>')
 def visualize_analysis(analysis_id):
     """Page to visualize a specific analysis"""
@@ -196,11 +345,27 @@ def serve_data(filename):
 # Create database tables
 with app.app_context():
     # Import models
-    from models import Analysis  # noqa: F401
+    from models import Analysis, AnalysisSegment, AnalysisPayload, AnalysisJob  # noqa: F401
     
     # Create tables
     db.create_all()
 
+# Start the job queue at boot, so jobs still queued (or left running by a process
+# that died) are picked up without waiting for a new submission. Every worker
+# process runs its own dispatcher; jobs are claimed atomically. With --preload
+# the master only imports the app, and each worker starts its queue on its first
+# request, since threads do not survive the fork.
+if job_queue_autostart() and os.environ.get("FDE_PRELOAD", "").lower() not in ("1", "true", "yes"):
+    get_job_queue().start()
+
+# Build the engine at import time when requested, e.g. under `gunicorn --preload`
+# so forked workers share the loaded model copy-on-write
+if os.environ.get("FDE_PRELOAD", "").lower() in ("1", "true", "yes"):
+    get_fde()
+
+startup_timings["app_import"] = time.perf_counter() - _import_start
+logger.info(f"App imported in {startup_timings['app_import'] * 1000:.1f} ms")
+
 # Run the app if executed directly
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the Field Distortion Engine.
+
+Run ``python -m benchmarks.run_benchmarks --help`` from the repository root.
+"""
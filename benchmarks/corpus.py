@@ -0,0 +1,95 @@
+"""
+Synthetic corpora for the Field Distortion Engine benchmarks.
+
+Corpora are generated from a fixed seed, so every run of the suite analyzes
+exactly the same text. The repetition rate controls how many sentences are
+verbatim repeats of earlier ones, which is what drives the work done by the
+echo pattern search.
+"""
+
+import random
+from typing import List
+
+from sst_osint.utils.lexicon import SymbolLexicon
+
+SUBJECTS = [
+    "the witness", "my mother", "the officer", "a neighbor", "the teacher", "our group",
+    "the company", "his brother", "the reporter", "everyone here", "the doctor", "she", "he", "they"
+]
+
+VERBS = [
+    "remembered", "described", "denied", "explained", "questioned", "repeated", "ignored",
+    "recorded", "noticed", "avoided", "believed", "rejected", "confirmed", "imagined"
+]
+
+OBJECTS = [
+    "the meeting", "the letter", "the old house", "the long night", "the agreement", "the report",
+    "the phone call", "the promise", "the journey", "the last conversation", "the warning", "the plan"
+]
+
+CLAUSES = [
+    "before anyone arrived", "after the storm passed", "while the others were asleep",
+    "because nobody asked", "as if nothing had happened", "during the second week",
+    "without saying a word", "according to the records", "when the lights went out"
+]
+
+# Phrases matched by the grooming pattern detector
+GROOMING_PHRASES = [
+    "this is our secret", "you understand me", "they don't understand", "just between us",
+    "you owe me", "look what you made me do", "no one else matters"
+]
+
+def _sentence(rng: random.Random, symbols: List[str]) -> str:
+    """Build one random sentence."""
+    words = [rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(OBJECTS)]
+    if rng.random() < 0.6:
+        words.append(rng.choice(CLAUSES))
+    if rng.random() < 0.5:
+        words.append("with " + " and ".join(rng.sample(symbols, 2)))
+    sentence = " ".join(words)
+    if rng.random() < 0.05:
+        sentence += ", and " + rng.choice(GROOMING_PHRASES)
+    return sentence[0].upper() + sentence[1:] + "."
+
+def generate_corpus(size: int, repetition_rate: float = 0.2, seed: int = 0,
+                    paragraph_sentences: int = 6) -> str:
+    """
+    Generate a synthetic corpus.
+
+    Args:
+        size: Approximate corpus size in characters
+        repetition_rate: Fraction of sentences that repeat an earlier sentence
+        seed: Random seed
+        paragraph_sentences: Sentences per paragraph
+
+    Returns:
+        Corpus text of at least ``size`` characters, cut at a sentence boundary
+    """
+    if not 0.0 <= repetition_rate < 1.0:
+        raise ValueError("repetition_rate must be in [0, 1)")
+
+    rng = random.Random(seed)
+    symbols = SymbolLexicon.load().lemmas
+
+    sentences: List[str] = []
+    paragraphs: List[str] = []
+    paragraph: List[str] = []
+    length = 0
+
+    while length < size:
+        if sentences and rng.random() < repetition_rate:
+            sentence = rng.choice(sentences)
+        else:
+            sentence = _sentence(rng, symbols)
+            sentences.append(sentence)
+
+        paragraph.append(sentence)
+        length += len(sentence) + 1
+        if len(paragraph) == paragraph_sentences:
+            paragraphs.append(" ".join(paragraph))
+            paragraph = []
+            length += 1
+
+    if paragraph:
+        paragraphs.append(" ".join(paragraph))
+    return "\n\n".join(paragraphs)
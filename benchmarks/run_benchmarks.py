@@ -0,0 +1,285 @@
+"""
+Benchmark runner for the Field Distortion Engine.
+
+For each corpus size and repetition rate, this times spaCy parsing, every
+analyzer on the parsed segments, the end-to-end ``analyze`` call and a typing
+simulation through ``analyze_stream``, and records the peak memory of each.
+Results are written to JSON; given a baseline file, the run fails when a
+measurement regresses by more than the threshold.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1KB 100KB 1MB -o results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.2
+
+Only the ``en_core_web_sm`` model is needed; nothing is downloaded.
+"""
+
+import os
+import re
+import sys
+import gc
+import json
+import time
+import logging
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from .corpus import generate_corpus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = ["1KB", "10KB", "100KB", "1MB", "5MB"]
+DEFAULT_REPETITION_RATES = [0.0, 0.3]
+
+# Measurements compared against a baseline, and the smallest time worth comparing
+COMPARED_METRICS = ("seconds", "peak_mb")
+DEFAULT_MIN_SECONDS = 0.01
+
+def parse_size(size: str) -> int:
+    """
+    Parse a size such as "100KB" or "5MB" into a number of characters.
+
+    Args:
+        size: Size with an optional B/KB/MB suffix (powers of 1000)
+
+    Returns:
+        Size in characters
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*(B|KB|MB)?", size.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {size}")
+    scale = {"B": 1, "KB": 1000, "MB": 1000 ** 2}[match.group(2) or "B"]
+    return int(float(match.group(1)) * scale)
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time a function and record its peak memory.
+
+    The timed runs are separate from the memory run, because tracing
+    allocations slows the code down.
+
+    Args:
+        function: Function to benchmark
+        repeat: Number of timed runs
+
+    Returns:
+        Dictionary with the best and mean run time in seconds and the peak
+        traced memory in MB
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "mean_seconds": sum(times) / len(times),
+        "peak_mb": peak / 1024 ** 2
+    }
+
+def simulate_typing(engine, text: str, steps: int):
+    """
+    Feed a growing buffer to ``analyze_stream``, as an editor would.
+
+    Args:
+        engine: FieldDistortionEngine
+        text: Full text
+        steps: Number of updates
+    """
+    session = engine.stream_session()
+    for step in range(1, steps + 1):
+        engine.analyze_stream(text[:len(text) * step // steps], session)
+
+def benchmark_case(engine, text: str, modules: List[str], repeat: int,
+                   stream_steps: int) -> Dict[str, Any]:
+    """
+    Benchmark one corpus.
+
+    Args:
+        engine: FieldDistortionEngine with caching disabled
+        text: Corpus text
+        modules: Names of the analyzers to benchmark
+        repeat: Number of timed runs per measurement
+        stream_steps: Number of ``analyze_stream`` updates (0 skips streaming)
+
+    Returns:
+        Dictionary of measurements for the corpus
+    """
+    from sst_osint.utils.features import extract_features
+    from sst_osint.utils.text_processing import preprocess_text, segment_text
+
+    segments = segment_text(preprocess_text(text))
+    results = {"characters": len(text), "segments": len(segments)}
+
+    results["parse"] = measure(lambda: engine._parse_segments(segments, modules), repeat)
+
+    docs = engine._parse_segments(segments, modules)
+    features = extract_features(docs)
+    results["tokens"] = sum(f.num_tokens for f in features)
+
+    results["analyzers"] = {}
+    for name in modules:
+        analyzer = engine.get_analyzer(name)
+        results["analyzers"][name] = measure(lambda: analyzer.analyze(docs, features=features), repeat)
+        logger.info(f"  {name}: {results['analyzers'][name]['seconds']:.3f} s")
+
+    results["analyze"] = measure(lambda: engine.analyze(text, modules=modules), repeat)
+    logger.info(f"  analyze: {results['analyze']['seconds']:.3f} s")
+
+    if stream_steps:
+        results["analyze_stream"] = measure(lambda: simulate_typing(engine, text, stream_steps), repeat)
+        results["analyze_stream"]["steps"] = stream_steps
+        logger.info(f"  analyze_stream: {results['analyze_stream']['seconds']:.3f} s")
+
+    return results
+
+def environment_info(engine) -> Dict[str, Any]:
+    """Describe the environment a benchmark ran in."""
+    import numpy
+    import spacy
+    from sst_osint import __version__
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "sst_osint": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "spacy": spacy.__version__,
+        "model": f"{engine.nlp.meta.get('name', 'unknown')} {engine.nlp.meta.get('version', '')}".strip()
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+            min_seconds: float = DEFAULT_MIN_SECONDS) -> List[str]:
+    """
+    Find measurements that regressed against a baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        threshold: Allowed relative increase (0.2 allows 20% slower or larger)
+        min_seconds: Timings below this in the baseline are too noisy to compare
+
+    Returns:
+        One description per regression
+    """
+    regressions = []
+
+    def walk(current: Dict[str, Any], previous: Dict[str, Any], path: str):
+        for key, value in current.items():
+            if key not in previous:
+                continue
+            if isinstance(value, dict):
+                walk(value, previous[key], f"{path}/{key}")
+            elif key in COMPARED_METRICS:
+                old = previous[key]
+                if key == "seconds" and old < min_seconds:
+                    continue
+                if old > 0 and value > old * (1 + threshold):
+                    regressions.append(f"{path}/{key}: {old:.4f} -> {value:.4f} "
+                                       f"(+{(value / old - 1) * 100:.0f}%)")
+
+    walk(results["cases"], baseline.get("cases", {}), "")
+    return regressions
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Field Distortion Engine on synthetic corpora",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES,
+                        help="Corpus sizes (e.g. 1KB 100KB 5MB)")
+    parser.add_argument("--repetition-rates", nargs="+", type=float, default=DEFAULT_REPETITION_RATES,
+                        help="Fractions of sentences that repeat an earlier one")
+    parser.add_argument("--modules", nargs="+",
+                        choices=["drift", "entropy", "symbolic", "echo", "observer"],
+                        help="Analyzers to benchmark (all if omitted)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--stream-steps", type=int, default=20,
+                        help="Buffer updates in the analyze_stream simulation (0 to skip)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                        help="File to write the results to")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression against the baseline")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="Baseline timings below this are not compared")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show engine logging")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    """
+    Run the benchmark suite.
+
+    Returns:
+        Exit status: 0 on success, 1 on regressions, 2 if the model is missing
+    """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    import spacy
+    if not spacy.util.is_package("en_core_web_sm"):
+        print("en_core_web_sm is not installed; install it before benchmarking "
+              "(python -m spacy download en_core_web_sm)", file=sys.stderr)
+        return 2
+
+    from sst_osint.fde import FieldDistortionEngine
+
+    # Caches would turn repeated runs into lookups, so both are disabled
+    engine = FieldDistortionEngine(cache_size=0, doc_cache_size=0, calibrate=False)
+    modules = engine.select_modules(args.modules)
+
+    output = {"environment": environment_info(engine), "config": vars(args).copy(), "cases": {}}
+    output["config"]["modules"] = modules
+
+    for size in args.sizes:
+        for rate in args.repetition_rates:
+            case = f"{size}-rep{rate:g}"
+            logger.info(f"Benchmarking {case}")
+            text = generate_corpus(parse_size(size), repetition_rate=rate, seed=args.seed)
+            output["cases"][case] = benchmark_case(engine, text, modules, args.repeat, args.stream_steps)
+
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"Benchmark results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(output, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Background analysis jobs for the web application.
+
+Jobs are stored in the AnalysisJob table, which doubles as the queue: a
+dispatcher thread claims queued rows and runs them on a local process pool
+where every worker holds its own FieldDistortionEngine. No external broker is
+needed, and several app processes can share one database safely because a
+job is claimed with a conditional update. Jobs left running by a process that
+died are put back in the queue once they have run longer than ``stale_after``.
+"""
+
+import os
+import uuid
+import logging
+import threading
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from sqlalchemy import update
+
+from app import db
+from models import Analysis, AnalysisJob
+from sst_osint import worker
+from sst_osint.utils import instrumentation
+from sst_osint.utils.text_processing import preprocess_text
+
+logger = logging.getLogger(__name__)
+
+class JobQueue:
+    """
+    Database-backed job queue with a local worker pool.
+    """
+
+    def __init__(self, app, num_workers=None, poll_interval=2.0, stale_after=None):
+        """
+        Initialize the job queue.
+
+        Args:
+            app: Flask application (for database access from background threads)
+            num_workers: Number of worker processes (defaults to FDE_JOB_WORKERS or 2)
+            poll_interval: Seconds between database polls when idle
+            stale_after: Seconds after which a running job is presumed lost and
+                queued again (defaults to FDE_JOB_STALE_AFTER or 1800); must
+                exceed the longest analysis, or slow jobs run twice
+        """
+        self.app = app
+        self.num_workers = num_workers or int(os.environ.get("FDE_JOB_WORKERS", "2"))
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after or float(os.environ.get("FDE_JOB_STALE_AFTER", "1800"))
+
+        self._executor = None
+        self._dispatcher = None
+        self._pid = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def start(self):
+        """
+        Start the worker pool and the dispatcher thread (idempotent).
+
+        A queue inherited through a fork (e.g. ``gunicorn --preload``) has no
+        running dispatcher, so it is started again in the new process.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._in_flight = 0
+            self._executor = self._create_executor()
+            self._dispatcher = threading.Thread(target=self._dispatch_loop,
+                                                name="fde-job-dispatcher", daemon=True)
+            self._dispatcher.start()
+            self._pid = os.getpid()
+            self._wakeup.set()
+            logger.info(f"Job queue started with {self.num_workers} workers")
+
+    def _create_executor(self):
+        """Create the worker pool."""
+        # Spawned workers import only the engine, not the web app
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=worker.init_worker
+        )
+
+    def _replace_broken_executor(self, executor):
+        """
+        Replace a pool that broke (a worker died or failed to load the engine).
+
+        Args:
+            executor: The pool that was found broken; nothing happens if it was
+                already replaced
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            logger.error("Job worker pool broke; starting a new one")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+
+    def submit(self, text):
+        """
+        Queue a text for analysis.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Id of the queued job
+        """
+        job = AnalysisJob(id=uuid.uuid4().hex, status=AnalysisJob.QUEUED, text=text)
+        db.session.add(job)
+        db.session.commit()
+
+        self.start()
+        self._wakeup.set()
+        return job.id
+
+    def _dispatch_loop(self):
+        """Claim queued jobs and hand them to the worker pool."""
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+            try:
+                with self.app.app_context():
+                    self._requeue_stale()
+                    while self._in_flight < self.num_workers:
+                        job = self._claim_next()
+                        if job is None:
+                            break
+                        self._run(job)
+            except Exception as e:
+                logger.error(f"Job dispatcher error: {e}")
+
+    def _requeue_stale(self):
+        """Queue again the jobs that have been running for longer than ``stale_after``."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        requeued = db.session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.status == AnalysisJob.RUNNING, AnalysisJob.started_at < cutoff)
+            .values(status=AnalysisJob.QUEUED, started_at=None)
+        )
+        db.session.commit()
+        if requeued.rowcount:
+            logger.warning(f"Requeued {requeued.rowcount} job(s) running for over {self.stale_after:.0f} s")
+
+    def _claim_next(self):
+        """
+        Atomically move the oldest queued job to running.
+
+        Returns:
+            Tuple (job id, text) or None if nothing is queued
+        """
+        candidates = db.session.execute(
+            db.select(AnalysisJob.id)
+            .where(AnalysisJob.status == AnalysisJob.QUEUED)
+            .order_by(AnalysisJob.created_at)
+            .limit(5)
+        ).scalars().all()
+
+        for job_id in candidates:
+            claimed = db.session.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == job_id, AnalysisJob.status == AnalysisJob.QUEUED)
+                .values(status=AnalysisJob.RUNNING, started_at=datetime.utcnow())
+            )
+            db.session.commit()
+            if claimed.rowcount == 1:
+                return job_id, db.session.get(AnalysisJob, job_id).text
+
+        return None
+
+    def _requeue(self, job_id):
+        """Put a claimed job that never ran back in the queue."""
+        db.session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == AnalysisJob.RUNNING)
+            .values(status=AnalysisJob.QUEUED, started_at=None)
+        )
+        db.session.commit()
+
+    def _run(self, job):
+        """Submit a claimed job to the pool."""
+        job_id, text = job
+        with self._lock:
+            self._in_flight += 1
+            executor = self._executor
+
+        try:
+            future = executor.submit(worker.analyze_text, text)
+        except Exception as e:
+            # The job never reached a worker, so it goes back in the queue and
+            # the dispatcher retries after its next poll
+            with self._lock:
+                self._in_flight -= 1
+            self._requeue(job_id)
+            if isinstance(e, BrokenProcessPool):
+                self._replace_broken_executor(executor)
+            raise
+
+        future.add_done_callback(lambda f: self._finish(job_id, text, f, executor))
+
+    def _finish(self, job_id, text, future, executor=None):
+        """Store the outcome of a finished job."""
+        try:
+            if future.cancelled():
+                # Dropped with a broken pool before it reached a worker
+                with self.app.app_context():
+                    self._requeue(job_id)
+                return
+            if executor is not None and isinstance(future.exception(), BrokenProcessPool):
+                # A worker died, possibly running this job, which is failed
+                # below rather than requeued so it cannot break the pool again
+                self._replace_broken_executor(executor)
+
+            with self.app.app_context():
+                job = db.session.get(AnalysisJob, job_id)
+                try:
+                    results = future.result()
+                    # Report the worker's measurements in this process's metrics
+                    instrumentation.merge(results.get('timings', {}))
+                    if 'error' in results:
+                        raise ValueError(results['error'])
+
+                    analysis = Analysis.from_results(text, results, preprocess_text(text))
+                    db.session.add(analysis)
+                    db.session.flush()
+
+                    job.analysis_id = analysis.id
+                    job.status = AnalysisJob.COMPLETED
+                except Exception as e:
+                    logger.error(f"Analysis job {job_id} failed: {e}")
+                    db.session.rollback()
+                    job = db.session.get(AnalysisJob, job_id)
+                    job.status = AnalysisJob.FAILED
+                    job.error = str(e)
+
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._wakeup.set()
@@ -1,5 +1,17 @@
 from app import db
 from datetime import datetime
+import json
+import zlib
+
+import numpy as np
+
+def _json_default(value):
+    """Convert NumPy values left in FDE results to plain JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 class Analysis(db.Model):
     """Model to store analysis results from the Field Distortion Engine."""
@@ -14,5 +26,167 @@ class Analysis(db.Model):
     num_segments = db.Column(db.Integer, nullable=False)
     summary = db.Column(db.Text, nullable=True)
 
+    segments = db.relationship('AnalysisSegment', backref='analysis', lazy='select',
+                               order_by='AnalysisSegment.index', cascade='all, delete-orphan')
+    payload = db.relationship('AnalysisPayload', backref='analysis', uselist=False,
+                              cascade='all, delete-orphan')
+
+    @classmethod
+    def from_results(cls, text, results, preprocessed_text=None):
+        """
+        Build an Analysis (with its segments and payload) from FDE results.
+
+        Args:
+            text: Original analyzed text
+            results: Results dictionary returned by FieldDistortionEngine.analyze
+            preprocessed_text: Text the segments were cut from, used for offsets
+                when the results carry no "segment_spans"
+
+        Returns:
+            Unsaved Analysis instance
+        """
+        num_segments = results['num_segments']
+        zeros = [0.0] * num_segments
+
+        # Modules that were not selected contribute zeros
+        entropy = results.get('narrative_entropy', {'mean_entropy': 0.0, 'entropy_values': zeros})
+        fractal = results.get('fractal_drift', {'recursion_score': 0.0, 'fractal_signatures': []})
+        symbolic = results.get('symbolic_density', {'mean_density': 0.0, 'symbol_density': zeros,
+                                                    'grooming_patterns': []})
+        echo = results.get('echo_patterns', {'mean_intensity': 0.0, 'echo_intensity': zeros,
+                                             'echo_count': 0})
+        field_classification = results.get('field_classification')
+
+        analysis = cls(
+            text=text,
+            field_classification=field_classification,
+            entropy_score=entropy['mean_entropy'],
+            fractal_recursion_score=fractal['recursion_score'],
+            symbol_density=symbolic['mean_density'],
+            echo_intensity=echo['mean_intensity'],
+            num_segments=num_segments,
+            summary=(f"{num_segments} segments analyzed; "
+                     f"{echo['echo_count']} echo patterns, "
+                     f"{len(fractal['fractal_signatures'])} fractal signatures, "
+                     f"{len(symbolic['grooming_patterns'])} segments with grooming language.")
+        )
+
+        # Per-segment fractal recursion: strongest signature the segment takes part in
+        segment_recursion = [0.0] * num_segments
+        for signature in fractal['fractal_signatures']:
+            for i in signature['segment_pair']:
+                segment_recursion[i] = max(segment_recursion[i], signature['similarity'])
+
+        # Offsets come with the results; older results are searched for each segment
+        spans = results.get('segment_spans')
+        source_text = preprocessed_text if preprocessed_text is not None else text
+        cursor = 0
+        for i, segment_text in enumerate(results['segments']):
+            if spans is not None:
+                start, end = spans[i]
+            else:
+                start = source_text.find(segment_text, cursor)
+                end = start + len(segment_text) if start >= 0 else -1
+                if start >= 0:
+                    cursor = end
+
+            analysis.segments.append(AnalysisSegment(
+                index=i,
+                text_start=start,
+                text_end=end,
+                preview=segment_text[:280],
+                entropy=entropy['entropy_values'][i],
+                symbolic_density=symbolic['symbol_density'][i],
+                echo_intensity=echo['echo_intensity'][i],
+                fractal_recursion=segment_recursion[i]
+            ))
+
+        analysis.payload = AnalysisPayload.from_results(results)
+        return analysis
+
+    def load_results(self):
+        """Return the full results dictionary stored with this analysis."""
+        return self.payload.load() if self.payload else None
+
+    def __repr__(self):
+        return f'<Analysis {self.id}: {self.field_classification or "No classification"}>'
+
+class AnalysisSegment(db.Model):
+    """Per-segment metrics for a stored analysis."""
+    id = db.Column(db.Integer, primary_key=True)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('analysis.id'), nullable=False, index=True)
+    index = db.Column(db.Integer, nullable=False)
+    text_start = db.Column(db.Integer, nullable=False)
+    text_end = db.Column(db.Integer, nullable=False)
+    preview = db.Column(db.Text, nullable=True)
+    entropy = db.Column(db.Float, nullable=False)
+    symbolic_density = db.Column(db.Float, nullable=False)
+    echo_intensity = db.Column(db.Float, nullable=False)
+    fractal_recursion = db.Column(db.Float, nullable=False)
+
+    def to_dict(self, classification=None):
+        """Serialize in the segment format used by the visualizations."""
+        return {
+            "index": self.index,
+            "text_start": self.text_start,
+            "text_end": self.text_end,
+            "preview": self.preview,
+            "classification": classification or "Uncategorized",
+            "entropy": self.entropy,
+            "symbolic_density": self.symbolic_density,
+            "echo_intensity": self.echo_intensity,
+            "fractal_recursion": self.fractal_recursion
+        }
+
+    def __repr__(self):
+        return f'<AnalysisSegment {self.analysis_id}:{self.index}>'
+
+class AnalysisPayload(db.Model):
+    """Full FDE results for a stored analysis, as zlib-compressed JSON."""
+    analysis_id = db.Column(db.Integer, db.ForeignKey('analysis.id'), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    @classmethod
+    def from_results(cls, results):
+        raw = json.dumps(results, default=_json_default).encode('utf-8')
+        return cls(data=zlib.compress(raw))
+
+    def load(self):
+        return json.loads(zlib.decompress(self.data).decode('utf-8'))
+
+    def __repr__(self):
+        return f'<AnalysisPayload {self.analysis_id}>'
+
+class AnalysisJob(db.Model):
+    """Queued or running FDE analysis submitted through the job API."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(16), nullable=False, default=QUEUED, index=True)
+    text = db.Column(db.Text, nullable=False)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('analysis.id'), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def done(self):
+        return self.status in (self.COMPLETED, self.FAILED)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "analysis_id": self.analysis_id,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
     def __repr__(self):
-        return f'<Analysis {self.id}: {self.field_classification or "No classification"}>'
\ No newline at end of file
+        return f'<AnalysisJob {self.id}: {self.status}>'
@@ -0,0 +1,230 @@
+"""
+Result caching for the Field Distortion Engine.
+
+This module provides a content-addressed cache for analysis results, with an
+in-process LRU tier and an optional size-bounded SQLite tier on disk, and an
+LRU cache of parsed spaCy Docs keyed by segment content.
+"""
+
+import os
+import copy
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+def content_key(*parts: str) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        parts: Strings identifying the content (e.g. config and text)
+
+    Returns:
+        Hex digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _json_default(value):
+    """Convert NumPy values in results to plain JSON types."""
+    # Results only contain NumPy values once the analyzers (and NumPy) are loaded
+    import numpy as np
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache bounded by entry count and, optionally,
+    by the total of the sizes given to ``put``.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None):
+        """
+        Initialize the LRU cache.
+
+        Args:
+            max_entries: Maximum number of entries (0 disables the cache)
+            max_bytes: Maximum total size of the entries (unbounded if None)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any, size: int = 0):
+        if self.max_entries <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskCache:
+    """
+    SQLite-backed cache of compressed JSON results with size-bounded eviction.
+
+    Entries are evicted least-recently-accessed first once the total stored
+    size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the disk cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            max_bytes: Maximum total size of stored entries
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "fde_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        text = self.get_json(key)
+        return json.loads(text) if text is not None else None
+
+    def get_json(self, key: str) -> Optional[str]:
+        """Return a stored result as JSON text."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def put(self, key: str, value: Dict[str, Any]):
+        self.put_json(key, json.dumps(value, default=_json_default))
+
+    def put_json(self, key: str, text: str):
+        """Store a result already serialized to JSON."""
+        data = zlib.compress(text.encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, data, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time())
+            )
+
+            # Evict least recently accessed entries until under the size bound
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM results ORDER BY accessed").fetchall()
+                for old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                    total -= size
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM results")
+
+class ResultCache:
+    """
+    Two-tier cache for analysis results: in-process LRU, then optional disk.
+
+    Results are stored as they round-trip through JSON, so both tiers return
+    the same plain types (lists and floats rather than NumPy values or tuples).
+    Returned results are copies, so callers may modify them freely.
+    """
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024,
+                 max_memory_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the result cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            cache_dir: Directory for the on-disk tier (disabled if None)
+            max_disk_bytes: Maximum total size of the on-disk tier
+            max_memory_bytes: Maximum total JSON size of the results kept in
+                memory (their in-memory footprint is a few times larger)
+        """
+        self.memory = LRUCache(max_entries, max_memory_bytes)
+        self.disk = DiskCache(cache_dir, max_disk_bytes) if cache_dir else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            text = None
+            try:
+                text = self.disk.get_json(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache read failed: {e}")
+            if text is not None:
+                value = json.loads(text)
+                self.memory.put(key, value, len(text))
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        text = json.dumps(value, default=_json_default)
+        self.memory.put(key, json.loads(text), len(text))
+        if self.disk is not None:
+            try:
+                self.disk.put_json(key, text)
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed: {e}")
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
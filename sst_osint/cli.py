@@ -7,15 +7,37 @@ using the Field Distortion Engine.
 
 import os
 import sys
+import glob
+import json
 import argparse
+import time
 import logging
+import numpy as np
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-from .fde import FieldDistortionEngine
-
 logger = logging.getLogger(__name__)
 
+ANALYSIS_TYPES = ["drift", "entropy", "symbolic", "echo", "observer", "full"]
+
+def analysis_types(value: str) -> List[str]:
+    """
+    Parse a comma-separated ``--analysis-type`` value.
+    
+    Args:
+        value: One analysis type or several separated by commas
+        
+    Returns:
+        List of analysis types
+    """
+    types = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in types if name not in ANALYSIS_TYPES]
+    if not types or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {value!r} (choose from {', '.join(ANALYSIS_TYPES)})"
+        )
+    return types
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -44,20 +66,127 @@ def parse_args() -> argparse.Namespace:
     
     parser.add_argument(
         "--analysis-type", 
-        type=str, 
-        choices=["drift", "entropy", "symbolic", "echo", "observer", "full"],
-        default="full",
-        help="Type of analysis to run"
+        type=analysis_types, 
+        action="extend",
+        metavar="TYPE[,TYPE...]",
+        help="Type(s) of analysis to run, comma-separated or repeated; only the selected "
+             f"analyzers are executed (choices: {', '.join(ANALYSIS_TYPES)}; default: full)"
     )
     
     parser.add_argument(
         "--segment-length", 
         type=int, 
-        default=200,
-        help="Length of text segments for analysis (in characters)"
+        default=1000,
+        help="Maximum length of text segments for analysis (in units of --segment-strategy)"
+    )
+    
+    parser.add_argument(
+        "--segment-strategy", 
+        type=str, 
+        choices=["chars", "tokens"],
+        default="chars",
+        help="Measure segment length in characters, or in tokens for a predictable parsing cost "
+             "per segment (stream mode supports chars only)"
+    )
+    
+    parser.add_argument(
+        "--parallel", 
+        type=str, 
+        choices=["serial", "thread", "process"],
+        default="serial",
+        help="How to run the selected analyzers: one after another, on threads, or on worker processes"
+    )
+    
+    parser.add_argument(
+        "--stream", 
+        action="store_true",
+        help="Read the input incrementally and analyze it in windows of segments, "
+             "writing one JSON result per window (for inputs too large to load at once)"
+    )
+    
+    parser.add_argument(
+        "--window-size", 
+        type=int, 
+        default=100,
+        help="Segments per window in stream mode"
+    )
+    
+    parser.add_argument(
+        "--window-overlap", 
+        type=int, 
+        default=10,
+        help="Segments carried over between windows in stream mode"
+    )
+    
+    parser.add_argument(
+        "--batch", 
+        type=str, 
+        nargs="+",
+        metavar="PATH",
+        help="Analyze many files: directories, files or glob patterns ('-' reads paths from stdin), "
+             "writing one JSON line of summary metrics per file; the input argument, if given, "
+             "is added to these paths"
+    )
+    
+    parser.add_argument(
+        "--pattern", 
+        type=str, 
+        default="*.txt",
+        help="File name pattern matched when a batch path is a directory"
+    )
+    
+    parser.add_argument(
+        "--workers", 
+        type=int, 
+        default=os.cpu_count() or 1,
+        help="Worker processes in batch mode (each loads the spaCy model once)"
+    )
+    
+    parser.add_argument(
+        "--overwrite", 
+        action="store_true",
+        help="Start the batch output over instead of resuming it"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--jsonl", 
+        type=str, 
+        help="Stream or batch mode output file ('-' for stdout; defaults to windows.jsonl or "
+             "batch.jsonl in the output directory)"
+    )
+    
+    parser.add_argument(
+        "--profile", 
+        action="store_true",
+        help="Profile the analysis and write the report to profile.txt in the output directory"
+    )
+    
+    parser.add_argument(
+        "--profiler", 
+        type=str, 
+        choices=["cprofile", "pyinstrument"],
+        default="cprofile",
+        help="Profiler used by --profile"
+    )
+    
+    parser.add_argument(
+        "--startup-report", 
+        action="store_true",
+        help="Print how long importing and initializing the engine took"
+    )
+    
+    args = parser.parse_args()
+    if not args.analysis_type:
+        args.analysis_type = ["full"]
+    if args.batch and args.input:
+        # An input argument before --batch is one more path, as it is after it
+        args.batch.append(args.input)
+        args.input = None
+    if args.segment_length < 1:
+        parser.error("--segment-length must be at least 1")
+    if args.stream and args.segment_strategy != "chars":
+        parser.error("--stream segments by characters only")
+    return args
 
 def print_divider():
     """Print a divider line."""
@@ -74,28 +203,63 @@ def print_summary(results: Dict[str, Any]):
     print("FIELD DISTORTION ENGINE - ANALYSIS SUMMARY")
     print_divider()
     
-    print(f"Field Classification: {results['field_classification']}")
-    print(f"Field Curvature (λ∇Ψ): {results['field_curvature']:.4f}")
+    if 'field_classification' in results:
+        print(f"Field Classification: {results['field_classification']}")
+    if 'field_curvature' in results:
+        print(f"Field Curvature (λ∇Ψ): {results['field_curvature']:.4f}")
     print(f"Number of Segments Analyzed: {results['num_segments']}")
+    if 'modules' in results:
+        print(f"Modules Run: {', '.join(results['modules'])}")
     
-    print("\nNarrative Entropy:")
-    print(f"  Mean Entropy: {results['narrative_entropy']['mean_entropy']:.4f}")
-    print(f"  Max Entropy: {results['narrative_entropy']['max_entropy']:.4f}")
-    print(f"  Entropy Variance: {results['narrative_entropy']['entropy_variance']:.4f}")
+    if 'fractal_drift' in results:
+        print("\nFractal Drift:")
+        print(f"  Recursion Score: {results['fractal_drift']['recursion_score']:.4f}")
+        print(f"  Narrative Stability: {results['fractal_drift']['narrative_stability']:.4f}")
+        print(f"  Fractal Signatures: {len(results['fractal_drift']['fractal_signatures'])}")
     
-    print("\nSymbolic Density:")
-    print(f"  Mean Density: {results['symbolic_density']['mean_density']:.4f}")
-    print(f"  Max Density: {results['symbolic_density']['max_density']:.4f}")
-    print(f"  Top Symbols: {', '.join(results['symbolic_density']['top_symbols'][:5])}")
+    if 'narrative_entropy' in results:
+        print("\nNarrative Entropy:")
+        print(f"  Mean Entropy: {results['narrative_entropy']['mean_entropy']:.4f}")
+        print(f"  Max Entropy: {results['narrative_entropy']['max_entropy']:.4f}")
+        print(f"  Entropy Variance: {results['narrative_entropy']['entropy_variance']:.4f}")
     
-    print("\nEcho Patterns:")
-    print(f"  Echo Count: {results['echo_patterns']['echo_count']}")
-    print(f"  Mean Echo Intensity: {results['echo_patterns']['mean_intensity']:.4f}")
-    if results['echo_patterns']['top_echoes']:
-        print(f"  Top Echo: \"{results['echo_patterns']['top_echoes'][0][0]}\" " +
-              f"(intensity: {results['echo_patterns']['top_echoes'][0][1]:.2f})")
+    if 'symbolic_density' in results:
+        print("\nSymbolic Density:")
+        print(f"  Mean Density: {results['symbolic_density']['mean_density']:.4f}")
+        print(f"  Max Density: {results['symbolic_density']['max_density']:.4f}")
+        print(f"  Top Symbols: {', '.join(results['symbolic_density']['top_symbols'][:5])}")
+    
+    if 'echo_patterns' in results:
+        print("\nEcho Patterns:")
+        print(f"  Echo Count: {results['echo_patterns']['echo_count']}")
+        print(f"  Mean Echo Intensity: {results['echo_patterns']['mean_intensity']:.4f}")
+        if results['echo_patterns']['top_echoes']:
+            print(f"  Top Echo: \"{results['echo_patterns']['top_echoes'][0][0]}\" " +
+                  f"(intensity: {results['echo_patterns']['top_echoes'][0][1]:.2f})")
+    
+    if 'observer_simulation' in results:
+        print("\nObserver Simulation:")
+        for persona, score in results['observer_simulation']['resonance_scores'].items():
+            print(f"  {persona}: {score:.4f}")
+    
+    if results.get('module_timings'):
+        print("\nModule Timings:")
+        for name, seconds in results['module_timings'].items():
+            print(f"  {name}: {seconds:.3f}s")
+    
+    if results.get('timings'):
+        print("\nStage Timings:")
+        for name, seconds in results['timings']['timers'].items():
+            print(f"  {name}: {seconds:.3f}s")
+        counters = results['timings']['counters']
+        if counters:
+            print(f"  Counts: {', '.join(f'{name}={value}' for name, value in counters.items())}")
     
     print_divider()
+    
+    if 'field_classification' not in results:
+        return
+    
     print("INTERPRETATION GUIDELINES:")
     
     if results['field_classification'] == "Stable Field":
@@ -116,6 +280,62 @@ def print_summary(results: Dict[str, Any]):
     
     print_divider()
 
+def summarize_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce analysis results to the summary metrics shown by ``print_summary``.
+    
+    Args:
+        results: Dictionary containing analysis results
+        
+    Returns:
+        Dictionary of summary metrics, small enough for one JSON line
+    """
+    summary = {"num_segments": results['num_segments']}
+    if 'modules' in results:
+        summary['modules'] = results['modules']
+    
+    if 'fractal_drift' in results:
+        drift = results['fractal_drift']
+        summary['fractal_drift'] = {
+            "recursion_score": drift['recursion_score'],
+            "narrative_stability": drift['narrative_stability'],
+            "num_signatures": len(drift['fractal_signatures'])
+        }
+    
+    if 'narrative_entropy' in results:
+        entropy = results['narrative_entropy']
+        summary['narrative_entropy'] = {
+            "mean_entropy": entropy['mean_entropy'],
+            "max_entropy": entropy['max_entropy'],
+            "entropy_variance": entropy['entropy_variance']
+        }
+    
+    if 'symbolic_density' in results:
+        density = results['symbolic_density']
+        summary['symbolic_density'] = {
+            "mean_density": density['mean_density'],
+            "max_density": density['max_density'],
+            "top_symbols": density['top_symbols'][:5],
+            "num_grooming_patterns": len(density['grooming_patterns'])
+        }
+    
+    if 'echo_patterns' in results:
+        echo = results['echo_patterns']
+        summary['echo_patterns'] = {
+            "echo_count": echo['echo_count'],
+            "mean_intensity": echo['mean_intensity'],
+            "top_echo": echo['top_echoes'][0] if echo['top_echoes'] else None
+        }
+    
+    if 'observer_simulation' in results:
+        observer = results['observer_simulation']
+        summary['observer_simulation'] = {
+            "resonance_scores": observer['resonance_scores'],
+            "num_sentiment_shifts": len(observer['sentiment_shifts'])
+        }
+    
+    return summary
+
 def get_input_text(input_arg: Optional[str]) -> str:
     """
     Get input text from file or direct input.
@@ -153,6 +373,195 @@ def get_input_text(input_arg: Optional[str]) -> str:
     # Otherwise, assume it's direct text
     return input_arg
 
+def _json_default(value):
+    """Convert NumPy values in results to plain JSON types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def run_stream(fde, args: argparse.Namespace):
+    """
+    Analyze the input in stream mode and write per-window results as JSONL.
+    
+    The input is read in chunks of lines and segmented on the fly, so memory
+    use is bounded by the window size rather than the input size.
+    
+    Args:
+        fde: FieldDistortionEngine
+        args: Parsed command-line arguments
+    """
+    from .utils.text_processing import read_chunks, iter_segments
+    
+    if args.input is None or args.input == "-":
+        source = sys.stdin
+    elif os.path.isfile(args.input):
+        source = open(args.input, 'r', encoding='utf-8')
+    else:
+        # Direct text is small enough to segment as one chunk
+        source = None
+    chunks = read_chunks(source) if source is not None else [args.input]
+    
+    jsonl_path = args.jsonl or os.path.join(create_output_dir(args.output_dir), "windows.jsonl")
+    output = sys.stdout if jsonl_path == "-" else open(jsonl_path, 'w', encoding='utf-8')
+    
+    start = time.perf_counter()
+    num_windows = 0
+    num_segments = 0
+    try:
+        windows = fde.analyze_windows(iter_segments(chunks, args.segment_length), window_size=args.window_size, 
+                                      overlap=args.window_overlap, modules=args.analysis_type)
+        for results in windows:
+            output.write(json.dumps(results, default=_json_default) + "\n")
+            output.flush()
+            num_windows += 1
+            num_segments += results["window"]["num_new_segments"]
+            print(f"Window {num_windows}: {num_segments} segments analyzed", file=sys.stderr)
+    finally:
+        if source not in (None, sys.stdin):
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {num_segments} segments in {num_windows} windows ({elapsed:.1f} s)", file=sys.stderr)
+    if output is not sys.stdout:
+        print(f"Window results saved to: {jsonl_path}", file=sys.stderr)
+
+def collect_batch_paths(paths: List[str], pattern: str = "*.txt") -> List[str]:
+    """
+    Expand batch inputs into a sorted list of files.
+    
+    Args:
+        paths: Directories (searched recursively for ``pattern``), files, glob
+            patterns, or "-" to read one path per line from stdin
+        pattern: File name pattern matched in directories
+        
+    Returns:
+        Sorted list of unique file paths
+    """
+    files = set()
+    for path in paths:
+        if path == "-":
+            files.update(collect_batch_paths([line.strip() for line in sys.stdin if line.strip()], pattern))
+        elif os.path.isdir(path):
+            files.update(str(file) for file in Path(path).rglob(pattern) if file.is_file())
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            matches = [match for match in glob.glob(path, recursive=True) if os.path.isfile(match)]
+            if not matches:
+                logger.warning(f"No files found for {path}")
+            files.update(matches)
+    return sorted(files)
+
+def read_completed_paths(jsonl_path: str) -> set:
+    """
+    Find the files already analyzed in a batch output, for resuming.
+    
+    A partially written last line (from an interrupted run) is removed from
+    the file, so its input is analyzed again.
+    
+    Args:
+        jsonl_path: Batch output file
+        
+    Returns:
+        Set of input paths with a result line
+    """
+    completed = set()
+    if not os.path.isfile(jsonl_path):
+        return completed
+    
+    with open(jsonl_path, 'rb+') as f:
+        valid_size = 0
+        for line in f:
+            try:
+                completed.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                break
+            valid_size += len(line)
+        f.truncate(valid_size)
+    
+    # A complete last line may still lack its newline
+    if valid_size:
+        with open(jsonl_path, 'rb+') as f:
+            f.seek(valid_size - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    return completed
+
+def run_batch(args: argparse.Namespace):
+    """
+    Analyze many files on worker processes and write one JSON line per file.
+    
+    Each worker loads its own engine (and spaCy model) once. Files already in
+    the output are skipped unless ``--overwrite`` is given, so an interrupted
+    batch can be resumed by running the same command again.
+    
+    Args:
+        args: Parsed command-line arguments
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from . import worker
+    
+    paths = collect_batch_paths(args.batch, args.pattern)
+    jsonl_path = args.jsonl or os.path.join(create_output_dir(args.output_dir), "batch.jsonl")
+    to_stdout = jsonl_path == "-"
+    
+    completed = set() if (to_stdout or args.overwrite) else read_completed_paths(jsonl_path)
+    pending = [path for path in paths if path not in completed]
+    print(f"Batch: {len(paths)} files, {len(paths) - len(pending)} already done, "
+          f"{len(pending)} to analyze", file=sys.stderr)
+    if not pending:
+        return
+    
+    engine_options = {"use_gpu": args.gpu, "cache_size": 0, "doc_cache_size": 0,
+                      "max_segment_length": args.segment_length, "segment_strategy": args.segment_strategy}
+    workers = max(1, min(args.workers, len(pending)))
+    output = sys.stdout if to_stdout else open(jsonl_path, 'w' if args.overwrite else 'a', encoding='utf-8')
+    
+    start = time.perf_counter()
+    num_done = 0
+    num_errors = 0
+    num_bytes = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=worker.init_worker, initargs=(engine_options,)) as pool:
+            # Keep a few files per worker queued instead of submitting them all up front
+            queue = iter(pending)
+            running = set()
+            while True:
+                for path in queue:
+                    running.add(pool.submit(worker.analyze_file, path, args.analysis_type))
+                    if len(running) >= workers * 4:
+                        break
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    line = future.result()
+                    output.write(json.dumps(line, default=_json_default) + "\n")
+                    output.flush()
+                    num_done += 1
+                    num_bytes += line.get("bytes", 0)
+                    if 'error' in line:
+                        num_errors += 1
+                        logger.error(f"{line['path']}: {line['error']}")
+                    elapsed = time.perf_counter() - start
+                    print(f"[{num_done}/{len(pending)}] {num_done / elapsed:.2f} docs/s, "
+                          f"{num_bytes / 1e6 / elapsed:.2f} MB/s", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {num_done} files ({num_errors} errors, {num_bytes / 1e6:.1f} MB) in {elapsed:.1f} s "
+          f"with {workers} workers", file=sys.stderr)
+    if output is not sys.stdout:
+        print(f"Batch results saved to: {jsonl_path}", file=sys.stderr)
+
 def create_output_dir(output_dir: str) -> str:
     """
     Create output directory if it doesn't exist.
@@ -171,6 +580,22 @@ def create_output_dir(output_dir: str) -> str:
         logger.error(f"Error creating output directory: {e}")
         return None
 
+def print_startup_report(import_time: float, timings: Dict[str, float]):
+    """
+    Print the startup cost of the engine.
+    
+    Args:
+        import_time: Seconds spent importing the engine module
+        timings: Engine startup timings in seconds
+    """
+    print_divider()
+    print("STARTUP REPORT")
+    print_divider()
+    print(f"{'import':<20} {import_time * 1000:>10.1f} ms")
+    for name, seconds in timings.items():
+        print(f"{name:<20} {seconds * 1000:>10.1f} ms")
+    print_divider()
+
 def display_ascii_banner():
     """Display ASCII art banner."""
     banner = """
@@ -188,11 +613,32 @@ Shadow Systems Theory - Field Distortion Engine v0.1.0
 
 def run_cli():
     """Run the CLI interface."""
-    display_ascii_banner()
     args = parse_args()
     
-    # Create FDE instance
-    fde = FieldDistortionEngine(use_gpu=args.gpu)
+    # Keep stdout clean when it carries the stream or batch results
+    if not ((args.stream or args.batch) and args.jsonl == "-"):
+        display_ascii_banner()
+    
+    if args.batch:
+        # The workers load their own engines
+        run_batch(args)
+        return
+    
+    # Create FDE instance (spaCy and the analyzers are only imported here)
+    start = time.perf_counter()
+    from .fde import FieldDistortionEngine
+    import_time = time.perf_counter() - start
+    fde = FieldDistortionEngine(use_gpu=args.gpu, parallel=args.parallel, 
+                                max_segment_length=args.segment_length, 
+                                segment_strategy=args.segment_strategy)
+    
+    if args.startup_report:
+        print_startup_report(import_time, fde.startup_timings)
+    
+    if args.stream:
+        run_stream(fde, args)
+        fde.close()
+        return
     
     # Get input text
     input_text = get_input_text(args.input)
@@ -206,17 +652,30 @@ def run_cli():
     output_dir = create_output_dir(args.output_dir)
     
     # Run analysis
-    results = fde.analyze(input_text, output_dir)
+    results = fde.analyze(input_text, output_dir, modules=args.analysis_type,
+                          profile=args.profiler if args.profile else None)
+    fde.close()
+    if 'error' in results:
+        logger.error(results['error'])
+        sys.exit(1)
     
     # Print summary
     print_summary(results)
     
+    if 'profile' in results:
+        profile_path = os.path.join(output_dir, "profile.txt")
+        with open(profile_path, "w") as f:
+            f.write(results['profile']['report'])
+        print(f"\nProfile ({results['profile']['profiler']}) saved to: {profile_path}")
+    
     # Notify about visualizations
-    if output_dir:
+    if output_dir and ('narrative_entropy' in results or 'fractal_drift' in results):
         print(f"\nVisualizations saved to: {output_dir}")
-        print("  • entropy_heatmap.png - Entropy distribution across text segments")
-        print("  • drift_diagram.png - Narrative drift visualization")
-        print("  • fractal_signatures.png - Fractal pattern signatures")
+        if 'narrative_entropy' in results:
+            print("  • entropy_heatmap.png - Entropy distribution across text segments")
+        if 'fractal_drift' in results:
+            print("  • drift_diagram.png - Narrative drift visualization")
+            print("  • fractal_signatures.png - Fractal pattern signatures")
 
 if __name__ == "__main__":
     run_cli()
@@ -6,23 +6,90 @@ using various detection modules and produces visualizations of the results.
 """
 
 import os
+import json
+import time
 import logging
-import spacy
-import numpy as np
+import importlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Union, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Union, Tuple, Optional, Iterable, Iterator
 
-# Import modules
-from .modules.fractal_drift import FractalDriftDetector
-from .modules.narrative_entropy import NarrativeEntropyScanner
-from .modules.symbolic_density import SymbolicDensityAnalyzer
-from .modules.echo_pattern import EchoPatternEngine
-from .modules.observer_simulation import ObserverSimulationLayer
-from .utils.visualization import plot_entropy_heatmap, plot_drift_diagram, plot_fractal_signatures
-from .utils.text_processing import preprocess_text, segment_text
+# spaCy, the analyzers and their dependencies are imported on first use
+from .utils.text_processing import preprocess_text, segment_spans, SEGMENT_STRATEGIES
+from .cache import ResultCache, LRUCache, content_key
+from .utils import instrumentation
+from .utils.instrumentation import Recorder, recording, timer, count
+from . import __version__
+
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
+    from .stream import StreamSession
 
 logger = logging.getLogger(__name__)
 
+# Bump when a change to the modules alters results for the same input
+RESULTS_VERSION = 2
+
+# Analyzer registry: name -> (engine attribute, results key, "module:Class" path)
+# Analyzer modules are imported and instantiated on first use; see analyzer_class
+# and FieldDistortionEngine.get_analyzer
+ANALYZERS = {
+    "drift": ("fdd", "fractal_drift", ".modules.fractal_drift:FractalDriftDetector"),
+    "entropy": ("nes", "narrative_entropy", ".modules.narrative_entropy:NarrativeEntropyScanner"),
+    "symbolic": ("sda", "symbolic_density", ".modules.symbolic_density:SymbolicDensityAnalyzer"),
+    "echo": ("epe", "echo_patterns", ".modules.echo_pattern:EchoPatternEngine"),
+    "observer": ("osl", "observer_simulation", ".modules.observer_simulation:ObserverSimulationLayer"),
+}
+
+# Execution modes for the analyzers (see FieldDistortionEngine.__init__)
+PARALLEL_MODES = ("serial", "thread", "process")
+
+# spaCy components that provide each annotation an analyzer may declare in REQUIRES
+ANNOTATION_COMPONENTS = {
+    "lemma": {"tok2vec", "tagger", "attribute_ruler", "lemmatizer"},
+    "dep": {"tok2vec", "parser"},
+    "sents": {"tok2vec", "parser", "senter", "sentencizer"},
+    "tensor": {"tok2vec"},
+}
+
+# Short passage parsed at startup to measure the cost of the pipeline
+CALIBRATION_TEXT = (
+    "She said it would be our secret, and that nobody else would understand. "
+    "Every night the door stayed locked while he promised the pain would end. "
+    "I trusted him because he told me I was special and different from the others. "
+    "Now the memory feels like a shadow that follows me from room to room."
+)
+
+@lru_cache(maxsize=None)
+def analyzer_class(name: str) -> type:
+    """
+    Import the class of an analyzer.
+    
+    Args:
+        name: Name of the analyzer from ``ANALYZERS``
+        
+    Returns:
+        Analyzer class
+    """
+    module_name, class_name = ANALYZERS[name][2].split(":")
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+def required_components(modules: Iterable[str]) -> set:
+    """
+    Collect the spaCy components needed by a set of analyzers.
+    
+    Args:
+        modules: Names of analyzers from ``ANALYZERS``
+        
+    Returns:
+        Set of component names
+    """
+    components = set()
+    for name in modules:
+        for annotation in analyzer_class(name).REQUIRES:
+            components |= ANNOTATION_COMPONENTS[annotation]
+    return components
+
 class FieldDistortionEngine:
     """
     Field Distortion Engine (FDE) for analyzing text data.
@@ -31,16 +98,46 @@ class FieldDistortionEngine:
     metaphor patterns, and emotional distortion in language.
     """
     
-    def __init__(self, use_gpu: bool = False):
+    def __init__(self, use_gpu: bool = False, cache_size: int = 128, 
+                 cache_dir: Optional[str] = None, cache_max_bytes: int = 256 * 1024 * 1024,
+                 doc_cache_size: int = 2048, calibrate: bool = True,
+                 analyzer_options: Optional[Dict[str, Dict]] = None,
+                 parallel: str = "serial", max_workers: Optional[int] = None,
+                 max_segment_length: int = 1000, segment_strategy: str = "chars"):
         """
         Initialize the Field Distortion Engine.
         
         Args:
             use_gpu: Whether to use GPU acceleration if available.
+            cache_size: Number of analysis results kept in memory (0 disables caching)
+            cache_dir: Directory for the on-disk result cache (disabled if None)
+            cache_max_bytes: Size bound of the on-disk result cache
+            doc_cache_size: Number of parsed segment Docs kept for reuse (0 disables)
+            calibrate: Whether to measure and log the parse time saved by the
+                minimal pipeline at startup
+            analyzer_options: Keyword arguments for individual analyzers by
+                name, e.g. ``{"drift": {"signature_mode": "lsh"}}``
+            parallel: How the selected analyzers run once segments are parsed:
+                "serial" one after another, "thread" concurrently on a thread
+                pool, or "process" on a process pool (segments are sent as a
+                DocBin; analyzers that need tensors stay on threads)
+            max_workers: Size of the pool (defaults to one worker per analyzer)
+            max_segment_length: Default maximum length of the segments texts
+                are split into (see ``utils.text_processing.segment_spans``)
+            segment_strategy: Default unit of ``max_segment_length``: "chars",
+                or "tokens" to bound the parsing cost of each segment
         """
+        if parallel not in PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode: {parallel}")
+        if segment_strategy not in SEGMENT_STRATEGIES:
+            raise ValueError(f"Unknown segmentation strategy: {segment_strategy}")
+
         logger.info("Initializing Field Distortion Engine...")
+        start = time.perf_counter()
+        self.startup_timings = {}
         
         # Load spaCy model
+        import spacy
         try:
             self.nlp = spacy.load("en_core_web_sm")
             logger.info("Loaded spaCy model: en_core_web_sm")
@@ -48,163 +145,710 @@ class FieldDistortionEngine:
             logger.warning("Could not load en_core_web_sm. Installing...")
             os.system("python -m spacy download en_core_web_sm")
             self.nlp = spacy.load("en_core_web_sm")
+        self.startup_timings["model_load"] = time.perf_counter() - start
+        
+        # Keep only the components some analyzer needs (e.g. never NER)
+        pipeline_start = time.perf_counter()
+        self._minimize_pipeline(calibrate)
+        self.startup_timings["pipeline"] = time.perf_counter() - pipeline_start
+        
+        # Analyzers are created on first use (also available as self.fdd, self.nes, ...)
+        self.analyzers = {}
+        self.analyzer_options = {name: dict(options) for name, options in (analyzer_options or {}).items()}
+        unknown = set(self.analyzer_options) - set(ANALYZERS)
+        if unknown:
+            raise ValueError(f"Options given for unknown analyzers: {', '.join(sorted(unknown))}")
+        
+        self.parallel = parallel
+        self.segmentation = (max_segment_length, segment_strategy)
+        self.max_workers = max_workers or len(ANALYZERS)
+        self._thread_pool = None
+        self._process_pool = None
         
-        # Initialize modules
-        self.fdd = FractalDriftDetector(self.nlp)
-        self.nes = NarrativeEntropyScanner(self.nlp)
-        self.sda = SymbolicDensityAnalyzer(self.nlp)
-        self.epe = EchoPatternEngine(self.nlp)
-        self.osl = ObserverSimulationLayer(self.nlp)
+        self._default_stream_session = None
         
+        # Result and parse caches
+        self.cache = ResultCache(cache_size, cache_dir, cache_max_bytes) \
+            if cache_size > 0 or cache_dir else None
+        self.doc_cache = LRUCache(doc_cache_size)
+        
+        self.startup_timings["total"] = time.perf_counter() - start
+        logger.info("Startup timings: " + ", ".join(f"{name} {seconds * 1000:.1f} ms" 
+                                                     for name, seconds in self.startup_timings.items()))
         logger.info("Field Distortion Engine initialized.")
     
-    def analyze(self, text: str, output_dir: Optional[str] = None) -> Dict:
+    def get_analyzer(self, name: str):
         """
-        Analyze a text input using all FDE modules.
+        Return an analyzer by registry name, creating it on first use.
+        
+        Args:
+            name: Name of the analyzer (see ``ANALYZERS``)
+            
+        Returns:
+            Analyzer instance
+        """
+        analyzer = self.analyzers.get(name)
+        if analyzer is None:
+            start = time.perf_counter()
+            analyzer = analyzer_class(name)(self.nlp, **self.analyzer_options.get(name, {}))
+            self.analyzers[name] = analyzer
+            self.startup_timings[f"analyzer.{name}"] = time.perf_counter() - start
+        return analyzer
+    
+    def __getattr__(self, attribute: str):
+        # Resolve the short analyzer attributes (fdd, nes, sda, epe, osl) lazily
+        for name, (analyzer_attribute, _, _) in ANALYZERS.items():
+            if attribute == analyzer_attribute:
+                return self.get_analyzer(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {attribute!r}")
+    
+    def analyze(self, text: str, output_dir: Optional[str] = None, 
+                modules: Optional[Iterable[str]] = None, 
+                profile: Optional[str] = None, max_segment_length: Optional[int] = None,
+                segment_strategy: Optional[str] = None) -> Dict:
+        """
+        Analyze a text input using the selected FDE modules.
         
         Args:
             text: Text to analyze
             output_dir: Directory to save visualization outputs
+            modules: Names of the analyzers to run (see ``ANALYZERS``);
+                all analyzers run if None or if "full" is given
+            profile: Profiler to capture the analysis with ("cprofile" or
+                "pyinstrument"); the report is returned under "profile"
+            max_segment_length: Maximum segment length for this call (the
+                engine default if None)
+            segment_strategy: Unit of ``max_segment_length``, "chars" or
+                "tokens" (the engine default if None)
+            
+        Returns:
+            Dictionary containing analysis results, with the stage timers and
+            counters of this call under "timings". "segment_spans" holds the
+            character offsets of the segments in the preprocessed text.
+        """
+        segmentation = self._segmentation(max_segment_length, segment_strategy)
+        with instrumentation.profile(profile) as captured, recording(Recorder()) as recorder:
+            with timer("analyze"):
+                results = self._analyze_text(text, output_dir, modules, segmentation)
+        
+        # Timings describe this call, so they are added outside the cached results
+        results = {**results, "timings": recorder.as_dict()}
+        if captured is not None:
+            results["profile"] = {"profiler": captured.profiler, "report": captured.report}
+        return results
+    
+    def _analyze_text(self, text: str, output_dir: Optional[str], 
+                      modules: Optional[Iterable[str]], segmentation: Tuple[int, str]) -> Dict:
+        """
+        Analyze a text input; see ``analyze``.
+        
+        Args:
+            text: Text to analyze
+            output_dir: Directory to save visualization outputs
+            modules: Names of the analyzers to run
+            segmentation: Maximum segment length and its unit
             
         Returns:
             Dictionary containing analysis results
         """
         logger.info("Starting analysis...")
+        modules = self.select_modules(modules)
+        count("analyses")
         
         # Preprocess and segment the text
-        preprocessed_text = preprocess_text(text)
-        segments = segment_text(preprocessed_text)
+        with timer("preprocess"):
+            preprocessed_text = preprocess_text(text)
+        
+        # Return cached results for previously analyzed content
+        cache_key = self._cache_key(preprocessed_text, modules, segmentation)
+        if self.cache is not None:
+            with timer("cache_lookup"):
+                results = self.cache.get(cache_key)
+            if results is not None:
+                logger.info("Analysis served from cache.")
+                count("cache_hits")
+                # No module ran, so the stored timings do not apply
+                results = {**results, "module_timings": {}}
+                if output_dir:
+                    self._write_visualizations(results, output_dir)
+                return results
+        
+        with timer("segment"):
+            spans = segment_spans(preprocessed_text, *segmentation)
+            segments = [preprocessed_text[start:end] for start, end in spans]
         
         if len(segments) == 0:
             logger.error("No segments found in the text.")
             return {"error": "No segments found in the text."}
         
         # Process text with spaCy
-        docs = [self.nlp(segment) for segment in segments]
+        with timer("parse"):
+            docs = self._parse_segments(segments, modules)
         
-        # Run all analyses
-        fractal_results = self.fdd.analyze(docs)
-        entropy_results = self.nes.analyze(docs)
-        symbolic_results = self.sda.analyze(docs)
-        echo_results = self.epe.analyze(docs)
-        observer_results = self.osl.analyze(docs)
+        results = self._analyze_docs(docs, segments, output_dir, modules, spans)
+        if self.cache is not None:
+            self.cache.put(cache_key, results)
+        return results
+    
+    def analyze_many(self, texts: Iterable[str], n_process: int = 1, 
+                     batch_size: int = 64, modules: Optional[Iterable[str]] = None,
+                     max_segment_length: Optional[int] = None,
+                     segment_strategy: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Analyze a corpus of texts, streaming one result per input text.
         
-        # Field curvature calculation removed as requested
+        All segments from all texts are pushed through a single ``nlp.pipe``
+        call, so spaCy can batch them and fan them out to worker processes.
+        Parsed segments are regrouped per text and handed to the analysis
+        modules as soon as the text is complete, which keeps memory flat
+        regardless of corpus size. With the "tokens" segmentation strategy
+        every batch holds at most ``batch_size * max_segment_length`` tokens.
         
-        # Generate visualizations if output directory is provided
-        if output_dir:
-            output_path = Path(output_dir)
-            output_path.mkdir(parents=True, exist_ok=True)
+        Args:
+            texts: Iterable of texts to analyze (consumed lazily)
+            n_process: Number of spaCy worker processes
+            batch_size: Number of segments per spaCy batch
+            modules: Names of the analyzers to run (all if None)
+            max_segment_length: Maximum segment length (the engine default if None)
+            segment_strategy: Unit of ``max_segment_length``, "chars" or
+                "tokens" (the engine default if None)
             
-            # Create visualizations
-            plot_entropy_heatmap(entropy_results['entropy_values'], 
-                                str(output_path / "entropy_heatmap.png"))
+        Yields:
+            Dictionary containing analysis results for each text, in input order
+        """
+        logger.info("Starting corpus analysis...")
+        modules = self.select_modules(modules)
+        segmentation = self._segmentation(max_segment_length, segment_strategy)
+        
+        def segment_stream():
+            for text_index, text in enumerate(texts):
+                preprocessed_text = preprocess_text(text)
+                cache_key = self._cache_key(preprocessed_text, modules, segmentation)
+                
+                cached = self.cache.get(cache_key) if self.cache is not None else None
+                if cached is not None:
+                    # Placeholder carrying the cached result, to keep input order
+                    yield "", (text_index, 0, cache_key, cached)
+                    continue
+                
+                spans = segment_spans(preprocessed_text, *segmentation)
+                if not spans:
+                    yield "", (text_index, 0, cache_key, None)
+                    continue
+                for start, end in spans:
+                    yield preprocessed_text[start:end], (text_index, spans, cache_key, None)
+        
+        current_index = None
+        current_docs = []
+        
+        for doc, (text_index, spans, cache_key, cached) in self.nlp.pipe(segment_stream(), 
+                                                                         as_tuples=True,
+                                                                         n_process=n_process,
+                                                                         batch_size=batch_size,
+                                                                         disable=self._disabled_components(modules)):
+            if not spans:
+                if cached is not None:
+                    with recording(Recorder()) as recorder:
+                        count("cache_hits")
+                    yield {**cached, "module_timings": {}, "timings": recorder.as_dict()}
+                else:
+                    logger.error(f"No segments found in text {text_index}.")
+                    yield {"error": "No segments found in the text."}
+                continue
             
-            plot_drift_diagram(fractal_results['drift_vectors'], 
-                              str(output_path / "drift_diagram.png"))
+            if text_index != current_index:
+                current_index = text_index
+                current_docs = []
+            current_docs.append(doc)
             
-            plot_fractal_signatures(fractal_results['fractal_signatures'], 
-                                  str(output_path / "fractal_signatures.png"))
+            if len(current_docs) == len(spans):
+                segments = [d.text for d in current_docs]
+                with recording(Recorder()) as recorder:
+                    results = self._analyze_docs(current_docs, segments, modules=modules, spans=spans)
+                if self.cache is not None:
+                    self.cache.put(cache_key, results)
+                yield {**results, "timings": recorder.as_dict()}
+                current_docs = []
+        
+        logger.info("Corpus analysis completed.")
+    
+    def analyze_windows(self, segments: Iterable[str], window_size: int = 100, 
+                        overlap: int = 10, modules: Optional[Iterable[str]] = None,
+                        echo_memory: int = 1000) -> Iterator[Dict]:
+        """
+        Analyze a stream of segments in overlapping windows with bounded memory.
+        
+        Segments are consumed lazily (e.g. from ``utils.text_processing.iter_segments``)
+        and only one window of segments and Docs is held at a time. The last
+        ``overlap`` segments of each window are carried into the next, so
+        drift and echoes across window boundaries are still seen, and a
+        bounded count of echo phrases from earlier windows is kept to report
+        echoes recurring across windows. Segment indices in each window's
+        results are relative to ``window["first_segment"]``.
+        
+        Args:
+            segments: Iterable of segment texts, in order
+            window_size: Number of segments per window, including the overlap
+            overlap: Number of segments carried over from the previous window
+            modules: Names of the analyzers to run (all if None)
+            echo_memory: Maximum number of echo phrases remembered across windows
+            
+        Yields:
+            Dictionary containing analysis results for each window (without
+            the segment texts)
+        """
+        if not 0 <= overlap < window_size:
+            raise ValueError("overlap must be at least 0 and less than window_size")
+        
+        from collections import Counter
+        
+        modules = self.select_modules(modules)
+        echo_counts = Counter()
+        
+        window = []
+        carried = 0
+        first_segment = 0
+        window_index = 0
+        
+        def analyze_window():
+            with recording(Recorder()) as recorder:
+                with timer("parse"):
+                    docs = self._parse_segments(window, modules)
+                results = self._analyze_docs(docs, window, modules=modules)
+            
+            del results["segments"]
+            results["window"] = {
+                "index": window_index,
+                "first_segment": first_segment,
+                "overlap": carried,
+                "num_new_segments": len(window) - carried
+            }
+            
+            if "echo_patterns" in results:
+                # Echo phrases of this window already seen in earlier windows
+                phrases = list(dict.fromkeys(echo["phrase"] for echo in results["echo_patterns"]["echo_patterns"]))
+                results["cross_window_echoes"] = [
+                    {"phrase": phrase, "previous_windows": echo_counts[phrase]}
+                    for phrase in phrases if phrase in echo_counts
+                ]
+                echo_counts.update(phrases)
+                if len(echo_counts) > echo_memory:
+                    kept = echo_counts.most_common(echo_memory)
+                    echo_counts.clear()
+                    echo_counts.update(dict(kept))
+            
+            results["timings"] = recorder.as_dict()
+            return results
+        
+        for segment in segments:
+            window.append(segment)
+            if len(window) == window_size:
+                yield analyze_window()
+                
+                window = window[window_size - overlap:] if overlap else []
+                first_segment += window_size - overlap
+                carried = len(window)
+                window_index += 1
+        
+        # The final window holds the segments not analyzed yet, if any
+        if len(window) > carried:
+            yield analyze_window()
+            window_index += 1
+        
+        logger.info(f"Windowed analysis completed ({window_index} windows).")
+    
+    def _analyze_docs(self, docs: List["Doc"], segments: List[str], 
+                      output_dir: Optional[str] = None, 
+                      modules: Optional[List[str]] = None,
+                      spans: Optional[List[Tuple[int, int]]] = None) -> Dict:
+        """
+        Run the selected FDE modules over parsed segments and combine the results.
+        
+        Args:
+            docs: List of spaCy Doc objects, one per segment
+            segments: Segment texts corresponding to ``docs``
+            output_dir: Directory to save visualization outputs
+            modules: Names of the analyzers to run (all if None)
+            spans: Character offsets of the segments in the preprocessed text,
+                returned as "segment_spans" if given
+            
+        Returns:
+            Dictionary containing analysis results
+        """
+        modules = modules or list(ANALYZERS)
+        
+        # Token attributes are extracted once and shared by all analyzers
+        from .utils.features import extract_features
+        with timer("features"):
+            features = extract_features(docs)
+        count("segments", len(docs))
+        count("tokens", sum(f.num_tokens for f in features))
+        
+        # Run the selected analyses, recording each module's wall time
+        start = time.perf_counter()
+        if self.parallel == "serial" or len(modules) == 1:
+            outputs = {name: self._run_analyzer(name, docs, features) for name in modules}
+        else:
+            outputs = self._run_analyzers_parallel(modules, docs, features)
+        
+        results = {ANALYZERS[name][1]: outputs[name][0] for name in modules}
+        module_timings = {name: outputs[name][1] for name in modules}
+        module_timings["total"] = time.perf_counter() - start
+        
+        # Field curvature calculation removed as requested
         
-        # Combine all results
-        results = {
-            "fractal_drift": fractal_results,
-            "narrative_entropy": entropy_results,
-            "symbolic_density": symbolic_results,
-            "echo_patterns": echo_results,
-            "observer_simulation": observer_results,
+        results.update({
+            "module_timings": module_timings,
+            "modules": modules,
             "num_segments": len(segments),
             "segments": segments  # Include the segments for reference
-        }
+        })
+        if spans is not None:
+            results["segment_spans"] = [list(span) for span in spans]
+        
+        # Generate visualizations if output directory is provided
+        if output_dir:
+            with timer("visualize"):
+                self._write_visualizations(results, output_dir)
         
         logger.info("Analysis completed successfully.")
         return results
         
-    def analyze_stream(self, text: str) -> Dict:
+    def _run_analyzer(self, name: str, docs: List["Doc"], 
+                      features: List) -> Tuple[Dict, float]:
         """
-        Analyze text input in real-time streaming mode.
+        Run one analyzer in this process.
         
-        This method is optimized for quick analysis of text as it's being entered,
-        using a subset of analysis modules for better performance.
+        Args:
+            name: Name of the analyzer
+            docs: Parsed segments
+            features: Token features of ``docs``
+            
+        Returns:
+            Tuple (analyzer results, wall time in seconds)
+        """
+        start = time.perf_counter()
+        with timer(f"analyzer.{name}"):
+            results = self.get_analyzer(name).analyze(docs, features=features)
+        return results, time.perf_counter() - start
+    
+    def _run_analyzers_parallel(self, modules: List[str], docs: List["Doc"], 
+                                features: List) -> Dict[str, Tuple[Dict, float]]:
+        """
+        Run analyzers concurrently on the thread or process pool.
         
         Args:
-            text: Text to analyze (current buffer)
+            modules: Names of the analyzers to run
+            docs: Parsed segments
+            features: Token features of ``docs``
             
         Returns:
-            Dictionary containing streamlined analysis results
+            Dictionary of analyzer name -> (results, wall time in seconds)
         """
-        logger.debug("Processing text stream...")
+        import contextvars
+        from . import worker
         
-        # For streaming, we use a simplified approach:
-        # 1. We don't segment the text (analyze as single unit)
-        # 2. We run only a subset of analyzers for speed
-        
-        # Preprocess text
-        preprocessed_text = preprocess_text(text)
-        
-        if not preprocessed_text or len(preprocessed_text) < 10:
-            # Too short for meaningful analysis
-            return {
-                "status": "insufficient_data",
-                "message": "Need more text for analysis",
-                "metrics": {
-                    "entropy": 0.0,
-                    "symbolic_density": 0.0,
-                    "sentiment": 0.0
-                }
-            }
+        # Tensors are not serialized with the Docs, so those analyzers use threads
+        remote = [name for name in modules 
+                  if self.parallel == "process" and "tensor" not in analyzer_class(name).REQUIRES]
         
-        # Process with spaCy
-        doc = self.nlp(preprocessed_text)
-        docs = [doc]  # List with single document for module compatibility
+        futures = {}
+        finished = {}
+        start = time.perf_counter()
         
-        # Run lightweight analyses
-        # Use full module analysis but extract just what we need
-        entropy_results = self.nes.analyze(docs)
-        entropy_score = entropy_results['mean_entropy']
+        if remote:
+            from spacy.tokens import DocBin
+            doc_bytes = DocBin(docs=docs).to_bytes()
+            pool = self._get_process_pool()
+            for name in remote:
+                futures[name] = pool.submit(worker.run_analyzer, name, doc_bytes)
         
-        symbolic_results = self.sda.analyze(docs)
-        symbol_density = symbolic_results['mean_density']
+        for name in modules:
+            if name not in futures:
+                # Create analyzers up front so threads never race to build them
+                self.get_analyzer(name)
+                
+                # Each thread records into the current analysis' recorder
+                context = contextvars.copy_context()
+                futures[name] = self._get_thread_pool().submit(
+                    context.run, self._run_analyzer, name, docs, features)
         
-        # Use Observer Simulation Layer for sentiment
-        sentiment = 0.0
-        try:
-            # Only run sentiment if text is substantial
-            if len(preprocessed_text) > 30:
-                observer_results = self.osl.analyze(docs)
-                sentiment = observer_results.get('emotional_response', 0.0)
-        except Exception as e:
-            logger.warning(f"Error in sentiment analysis: {e}")
-        
-        # Simplified metrics for speed
-        metrics = {
-            "entropy": entropy_score,
-            "symbolic_density": symbol_density,
-            "sentiment": sentiment,
-            "text_length": len(preprocessed_text),
-            "word_count": len(doc)
-        }
-        
-        # Add complexity metrics
-        metrics["entropy_score"] = (entropy_score * 0.5) + (symbol_density * 0.3) + (abs(sentiment) * 0.2)
-        
-        # Classification based on metrics
-        classification = "Stable Field"
-        if metrics["entropy_score"] > 0.7:
-            classification = "Collapsed Field"
-        elif metrics["entropy_score"] > 0.4:
-            classification = "Distorted Field"
-        
-        # Get current timestamp
-        import datetime
-        
-        results = {
-            "status": "success",
-            "metrics": metrics,
-            "classification": classification,
-            "timestamp": datetime.datetime.now().isoformat()
-        }
+        for name, future in futures.items():
+            future.add_done_callback(lambda f, n=name: finished.setdefault(n, time.perf_counter()))
         
-        return results
+        outputs = {}
+        for name, future in futures.items():
+            if name in remote:
+                # Worker processes return their measurements with the results
+                results, recorded = future.result()
+                instrumentation.merge(recorded)
+            else:
+                results = future.result()[0]
+            outputs[name] = (results, finished.get(name, time.perf_counter()) - start)
+        return outputs
+    
+    def _get_thread_pool(self):
+        """Return the analyzer thread pool, creating it on first use."""
+        if self._thread_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, 
+                                                   thread_name_prefix="fde-analyzer")
+        return self._thread_pool
+    
+    def _get_process_pool(self):
+        """Return the analyzer process pool, creating it on first use."""
+        if self._process_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            from . import worker
+            
+            # Spawned workers only restore Docs, so they start from a blank pipeline
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=worker.init_analyzer_worker,
+                initargs=(self.nlp.lang, self.analyzer_options)
+            )
+        return self._process_pool
+    
+    def close(self):
+        """Shut down the analyzer pools, if any were started."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown()
+        self._thread_pool = None
+        self._process_pool = None
+    
+    def _minimize_pipeline(self, calibrate: bool = True):
+        """
+        Remove spaCy components that no analyzer requires.
+        
+        When calibrating, the full and minimal pipelines are timed on a short
+        passage first and the per-document saving is logged.
+        
+        Args:
+            calibrate: Whether to measure the parse time saved
+        """
+        required = required_components(ANALYZERS)
+        unused = [pipe for pipe in self.nlp.pipe_names if pipe not in required]
+        if not unused:
+            return
+        
+        if calibrate:
+            full_time = self._time_parse([])
+            minimal_time = self._time_parse(unused)
+            saved = full_time - minimal_time
+            logger.info(f"Minimal spaCy pipeline (without {', '.join(unused)}) saves "
+                        f"{saved * 1000:.2f} ms per document "
+                        f"({saved / max(full_time, 1e-9):.0%} of {full_time * 1000:.2f} ms)")
+        
+        for pipe in unused:
+            self.nlp.remove_pipe(pipe)
+        logger.info(f"spaCy pipeline: {', '.join(self.nlp.pipe_names) or 'tokenizer only'}")
+    
+    def _time_parse(self, disabled: List[str], repeats: int = 3) -> float:
+        """
+        Time parsing the calibration passage.
+        
+        Args:
+            disabled: Components to disable while parsing
+            repeats: Number of timed runs (the fastest is used)
+            
+        Returns:
+            Parse time in seconds
+        """
+        timings = []
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            self.nlp(CALIBRATION_TEXT, disable=disabled)
+            timings.append(time.perf_counter() - start)
+        # First run warms up the pipeline
+        return min(timings[1:])
+    
+    @staticmethod
+    def select_modules(modules: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Normalize a module selection to registry order.
+        
+        Args:
+            modules: Names of analyzers, "full", or None for all analyzers
+            
+        Returns:
+            List of analyzer names
+            
+        Raises:
+            ValueError: If an unknown analyzer name is given
+        """
+        if modules is None:
+            return list(ANALYZERS)
+        if isinstance(modules, str):
+            modules = [modules]
+        
+        selected = set(modules)
+        if not selected or "full" in selected:
+            return list(ANALYZERS)
+        
+        unknown = selected - set(ANALYZERS)
+        if unknown:
+            raise ValueError(f"Unknown analysis modules: {', '.join(sorted(unknown))}")
+        
+        return [name for name in ANALYZERS if name in selected]
+    
+    def _disabled_components(self, modules: List[str]) -> List[str]:
+        """
+        List the pipeline components not needed by the selected modules.
+        
+        Args:
+            modules: Names of the analyzers to run
+            
+        Returns:
+            Names of spaCy components to disable while parsing
+        """
+        required = required_components(modules)
+        return [pipe for pipe in self.nlp.pipe_names if pipe not in required]
+    
+    def _segmentation(self, max_segment_length: Optional[int] = None, 
+                      segment_strategy: Optional[str] = None) -> Tuple[int, str]:
+        """
+        Resolve the segmentation of a call against the engine defaults.
+        
+        Args:
+            max_segment_length: Maximum segment length (the default if None)
+            segment_strategy: Unit of the length (the default if None)
+            
+        Returns:
+            Tuple of the maximum segment length and its unit
+        """
+        length = max_segment_length or self.segmentation[0]
+        strategy = segment_strategy or self.segmentation[1]
+        if strategy not in SEGMENT_STRATEGIES:
+            raise ValueError(f"Unknown segmentation strategy: {strategy}")
+        if length < 1:
+            raise ValueError("max_segment_length must be at least 1")
+        return length, strategy
+    
+    def _cache_key(self, preprocessed_text: str, modules: List[str], 
+                   segmentation: Optional[Tuple[int, str]] = None) -> str:
+        """
+        Build the result cache key for a preprocessed text.
+        
+        The key covers everything that affects results: the package and
+        results versions, the spaCy model, the analysis configuration
+        (including the segmentation) and the version of any reloadable
+        analyzer data.
+        
+        Args:
+            preprocessed_text: Preprocessed text to analyze
+            modules: Names of the analyzers to run
+            segmentation: Maximum segment length and its unit (the engine
+                default if None)
+            
+        Returns:
+            Cache key
+        """
+        model = f"{self.nlp.meta.get('name', '')}-{self.nlp.meta.get('version', '')}" \
+                f"[{','.join(self.nlp.pipe_names)}]"
+        options = {name: self.analyzer_options[name] for name in modules if name in self.analyzer_options}
+        length, strategy = segmentation or self.segmentation
+        config = f"fde-{__version__}-r{RESULTS_VERSION}|{model}|{','.join(modules)}|seg:{strategy}:{length}"
+        if options:
+            config += f"|{json.dumps(options, sort_keys=True, default=str)}"
+        
+        # Analyzers with reloadable data (e.g. lexicons) identify its version
+        for name in modules:
+            analyzer = self.get_analyzer(name)
+            if hasattr(analyzer, "cache_token"):
+                config += f"|{name}:{analyzer.cache_token()}"
+        return content_key(config, preprocessed_text)
+    
+    def _parse_segments(self, segments: List[str], modules: List[str]) -> List["Doc"]:
+        """
+        Parse segments with spaCy, reusing cached Docs for known segments.
+        
+        Only the pipeline components needed by the selected modules are run.
+        
+        Args:
+            segments: Segment texts
+            modules: Names of the analyzers to run
+            
+        Returns:
+            List of spaCy Doc objects, one per segment
+        """
+        disabled = self._disabled_components(modules)
+        
+        # Docs parsed with a different set of components are not interchangeable
+        pipeline = ",".join(pipe for pipe in self.nlp.pipe_names if pipe not in disabled)
+        keys = [content_key(pipeline, segment) for segment in segments]
+        docs = [self.doc_cache.get(key) for key in keys]
+        
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        if missing:
+            parsed = self.nlp.pipe((segments[i] for i in missing), disable=disabled)
+            for i, doc in zip(missing, parsed):
+                docs[i] = doc
+                self.doc_cache.put(keys[i], doc)
+        
+        return docs
+    
+    def _write_visualizations(self, results: Dict, output_dir: str):
+        """
+        Write visualizations for analysis results.
+        
+        Args:
+            results: Dictionary containing analysis results
+            output_dir: Directory to save visualization outputs
+        """
+        # Plotting libraries are only imported when visualizations are requested
+        from .utils.visualization import plot_entropy_heatmap, plot_drift_diagram, plot_fractal_signatures
+        
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        # Create visualizations for the modules that ran
+        if 'narrative_entropy' in results:
+            plot_entropy_heatmap(results['narrative_entropy']['entropy_values'], 
+                                str(output_path / "entropy_heatmap.png"))
+        
+        if 'fractal_drift' in results:
+            plot_drift_diagram(results['fractal_drift']['drift_vectors'], 
+                              str(output_path / "drift_diagram.png"))
+            
+            plot_fractal_signatures(results['fractal_drift']['fractal_signatures'], 
+                                  str(output_path / "fractal_signatures.png"))
+    
+    def stream_session(self) -> "StreamSession":
+        """
+        Create a new incremental stream session bound to this engine.
+        
+        Returns:
+            StreamSession for analyzing one live text buffer
+        """
+        from .stream import StreamSession
+        return StreamSession(self)
+        
+    def analyze_stream(self, text: str, session: Optional["StreamSession"] = None) -> Dict:
+        """
+        Analyze text input in real-time streaming mode.
+        
+        This method is optimized for quick analysis of text as it's being entered.
+        Sentences are parsed once and cached by content, so repeated calls on a
+        growing buffer only parse the edited tail and update running aggregates.
+        
+        Args:
+            text: Text to analyze (current buffer)
+            session: Stream session holding the state for this buffer; the
+                engine's default session is used if omitted
+            
+        Returns:
+            Dictionary containing streamlined analysis results
+        """
+        logger.debug("Processing text stream...")
+        
+        if session is None:
+            if self._default_stream_session is None:
+                self._default_stream_session = self.stream_session()
+            session = self._default_stream_session
+        
+        return session.update(text)
     
     # Field curvature methods removed as requested
@@ -6,12 +6,14 @@ grooming loops, obedience reinforcement, or false memory cues.
 """
 
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 import spacy
 import logging
-from collections import Counter
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ..utils.suffix_array import find_maximal_repeats
+from ..utils.features import DocFeatures, ensure_features
+from ..utils.instrumentation import timer, count
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,9 @@ class EchoPatternEngine:
     Echo Pattern Engine (EPE) class for detecting repeated phrases.
     """
     
+    # Echo search works on raw text, so the tokenizer alone is enough
+    REQUIRES = set()
+    
     def __init__(self, nlp: spacy.language.Language):
         """
         Initialize the Echo Pattern Engine.
@@ -30,12 +35,14 @@ class EchoPatternEngine:
         self.nlp = nlp
         logger.info("Echo Pattern Engine initialized")
     
-    def analyze(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
+    def analyze(self, docs: List[spacy.tokens.Doc], 
+                features: Optional[List[DocFeatures]] = None) -> Dict[str, Any]:
         """
         Analyze documents for echo patterns.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs`` (extracted if not given)
             
         Returns:
             Dictionary containing analysis results
@@ -50,18 +57,19 @@ class EchoPatternEngine:
                 "echo_intensity": []
             }
         
-        # Extract n-grams from each document
-        all_text = " ".join([doc.text for doc in docs])
-        ngrams = self._extract_ngrams(all_text)
-        
-        # Find echoes (repeated phrases)
-        echoes = self._find_echoes(ngrams, docs)
+        # Find echoes (maximal repeated phrases)
+        with timer("echo.find_echoes"):
+            echoes = self._find_echoes(docs)
+        count("echoes", len(echoes))
         
         # Extract echo patterns (phrases that appear in multiple contexts)
-        echo_patterns = self._extract_echo_patterns(echoes, docs)
+        with timer("echo.extract_echo_patterns"):
+            echo_patterns = self._extract_echo_patterns(echoes, docs)
+        count("echo_patterns", len(echo_patterns))
         
         # Calculate echo intensity for each segment
-        echo_intensity = self._calculate_echo_intensity(echo_patterns, docs)
+        with timer("echo.intensity"):
+            echo_intensity = self._calculate_echo_intensity(echo_patterns, ensure_features(docs, features))
         
         # Sort echoes by intensity (highest first)
         top_echoes = [(echo["phrase"], echo["intensity"]) 
@@ -80,70 +88,92 @@ class EchoPatternEngine:
             "echo_intensity": echo_intensity
         }
     
-    def _extract_ngrams(self, text: str, min_n: int = 3, max_n: int = 8) -> List[Tuple[str, int]]:
+    def _build_token_index(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
         """
-        Extract n-grams from text.
+        Build a word-level index over all documents.
+        
+        Words are whitespace-delimited, as in the echo phrases themselves.
+        Each document is followed by a unique separator id so that repeated
+        phrases never span two segments.
         
         Args:
-            text: Input text
-            min_n: Minimum n-gram length (in words)
-            max_n: Maximum n-gram length (in words)
+            docs: List of spaCy Doc objects
             
         Returns:
-            List of tuples (n-gram, count)
+            Dictionary with token ids, words, and per-token segment index
+            and character offsets (separators carry segment index -1)
         """
-        words = text.split()
-        if len(words) < min_n:
-            return []
-        
-        ngram_counter = Counter()
+        vocabulary = {}
+        token_ids = []
+        words = []
+        segment_indices = []
+        starts = []
+        ends = []
         
-        # Extract n-grams of different lengths
-        for n in range(min_n, min(max_n + 1, len(words) + 1)):
-            ngrams = [' '.join(words[i:i+n]) for i in range(len(words) - n + 1)]
-            ngram_counter.update(ngrams)
+        for i, doc in enumerate(docs):
+            for match in re.finditer(r'\S+', doc.text):
+                word = match.group(0)
+                token_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+                words.append(word)
+                segment_indices.append(i)
+                starts.append(match.start())
+                ends.append(match.end())
+            
+            # Unique separator between segments
+            token_ids.append(-(i + 1))
+            words.append("")
+            segment_indices.append(-1)
+            starts.append(0)
+            ends.append(0)
         
-        # Filter out n-grams that appear only once
-        return [(ngram, count) for ngram, count in ngram_counter.items() if count > 1]
+        return {
+            "token_ids": np.array(token_ids, dtype=np.int64),
+            "words": words,
+            "segment_indices": segment_indices,
+            "starts": starts,
+            "ends": ends
+        }
     
-    def _find_echoes(self, ngrams: List[Tuple[str, int]], docs: List[spacy.tokens.Doc]) -> List[Dict[str, Any]]:
+    def _find_echoes(self, docs: List[spacy.tokens.Doc], min_n: int = 3) -> List[Dict[str, Any]]:
         """
         Find echoes (repeated phrases) in documents.
         
+        Repeated phrases are enumerated as maximal repeats from a suffix
+        array over the token index, so each phrase is found together with
+        all of its positions in one pass, and sub-phrases that only ever
+        occur inside a longer repeat are not reported separately.
+        
         Args:
-            ngrams: List of n-grams and their counts
             docs: List of spaCy Doc objects
+            min_n: Minimum phrase length (in words)
             
         Returns:
             List of echo dictionaries
         """
+        index = self._build_token_index(docs)
         echoes = []
         
-        for ngram, count in ngrams:
-            # Skip n-grams that appear too infrequently
-            if count < 2:
-                continue
+        for length, positions in find_maximal_repeats(index["token_ids"], min_n):
+            first = int(positions[0])
+            phrase = " ".join(index["words"][first:first + length])
             
-            # Find all occurrences of this n-gram
             occurrences = []
-            for i, doc in enumerate(docs):
-                text = doc.text
-                # Find all occurrences in this document
-                for match in re.finditer(re.escape(ngram), text):
-                    occurrences.append({
-                        "segment_index": i,
-                        "start": match.start(),
-                        "end": match.end(),
-                        "context": self._extract_context(text, match.start(), match.end())
-                    })
-            
-            # If we found multiple occurrences, add to echoes
-            if len(occurrences) >= 2:
-                echoes.append({
-                    "phrase": ngram,
-                    "count": count,
-                    "occurrences": occurrences
+            for position in positions.tolist():
+                segment_index = index["segment_indices"][position]
+                start = index["starts"][position]
+                end = index["ends"][position + length - 1]
+                occurrences.append({
+                    "segment_index": segment_index,
+                    "start": start,
+                    "end": end,
+                    "context": self._extract_context(docs[segment_index].text, start, end)
                 })
+            
+            echoes.append({
+                "phrase": phrase,
+                "count": len(occurrences),
+                "occurrences": occurrences
+            })
         
         # Sort by count (most frequent first)
         echoes.sort(key=lambda x: x["count"], reverse=True)
@@ -185,42 +215,36 @@ class EchoPatternEngine:
         """
         echo_patterns = []
         
-        for echo in echoes:
+        # Vectorize every occurrence context once, with a shared vocabulary
+        context_matrix, empty_contexts, row_offsets = self._vectorize_contexts(echoes)
+        
+        for echo, row_offset in zip(echoes, row_offsets):
             # Skip echoes with too few occurrences
-            if len(echo["occurrences"]) < 2:
+            num_occurrences = len(echo["occurrences"])
+            if num_occurrences < 2:
                 continue
             
-            # Calculate context similarity for each pair of occurrences
-            context_similarities = []
-            for i in range(len(echo["occurrences"])):
-                for j in range(i+1, len(echo["occurrences"])):
-                    context_i = echo["occurrences"][i]["context"]
-                    context_j = echo["occurrences"][j]["context"]
-                    
-                    # Calculate similarity between contexts
-                    similarity = self._calculate_context_similarity(context_i, context_j)
-                    context_similarities.append(similarity)
+            # Context similarity for every pair of occurrences in one product
+            rows = np.arange(row_offset, row_offset + num_occurrences)
+            similarity_block = self._context_similarity_block(context_matrix, empty_contexts, rows)
             
             # Calculate mean context similarity
-            mean_similarity = np.mean(context_similarities) if context_similarities else 1.0
+            pair_similarities = similarity_block[np.triu_indices(num_occurrences, k=1)]
+            mean_similarity = np.mean(pair_similarities) if len(pair_similarities) else 1.0
             
             # Calculate echo intensity (higher for phrases in different contexts)
             intensity = echo["count"] * (1.0 - mean_similarity)
             
-            # Identify context shifts
+            # Identify context shifts between adjacent occurrences
             context_shifts = []
-            if len(echo["occurrences"]) >= 2:
-                for i in range(len(echo["occurrences"]) - 1):
-                    curr_context = echo["occurrences"][i]["context"]
-                    next_context = echo["occurrences"][i+1]["context"]
-                    
-                    similarity = self._calculate_context_similarity(curr_context, next_context)
-                    if similarity < 0.5:  # Threshold for context shift
-                        context_shifts.append({
-                            "from_segment": echo["occurrences"][i]["segment_index"],
-                            "to_segment": echo["occurrences"][i+1]["segment_index"],
-                            "similarity": similarity
-                        })
+            adjacent_similarities = np.diagonal(similarity_block, offset=1)
+            for i, similarity in enumerate(adjacent_similarities):
+                if similarity < 0.5:  # Threshold for context shift
+                    context_shifts.append({
+                        "from_segment": echo["occurrences"][i]["segment_index"],
+                        "to_segment": echo["occurrences"][i+1]["segment_index"],
+                        "similarity": float(similarity)
+                    })
             
             # Add to echo patterns if intensity is significant
             if intensity > 0.1:  # Threshold can be adjusted
@@ -238,43 +262,81 @@ class EchoPatternEngine:
         
         return echo_patterns
     
-    def _calculate_context_similarity(self, context1: str, context2: str) -> float:
+    def _vectorize_contexts(self, echoes: List[Dict[str, Any]]) -> Tuple[Any, np.ndarray, List[int]]:
         """
-        Calculate similarity between two contexts.
+        Vectorize the contexts of all echo occurrences into one TF-IDF matrix.
         
         Args:
-            context1: First context
-            context2: Second context
+            echoes: List of echo dictionaries
             
         Returns:
-            Similarity value (0.0 = completely different, 1.0 = identical)
+            Tuple of (L2-normalized sparse matrix with one row per occurrence or
+            None if vectorization failed, boolean mask of contexts with no terms,
+            row offset of each echo's first occurrence)
         """
-        # Simple approach using TF-IDF and cosine similarity
+        contexts = []
+        row_offsets = []
+        for echo in echoes:
+            row_offsets.append(len(contexts))
+            contexts.extend(occurrence["context"] for occurrence in echo["occurrences"])
+        
+        if not contexts:
+            return None, np.zeros(0, dtype=bool), row_offsets
+        
+        from sklearn.feature_extraction.text import TfidfVectorizer
         vectorizer = TfidfVectorizer()
         
         try:
-            tfidf_matrix = vectorizer.fit_transform([context1, context2])
-            similarity = (tfidf_matrix * tfidf_matrix.T).A[0, 1]
-        except:
-            # Fallback if vectorizer fails
-            similarity = 0.5
+            context_matrix = vectorizer.fit_transform(contexts).tocsr()
+        except ValueError:
+            # No usable terms in any context
+            return None, np.ones(len(contexts), dtype=bool), row_offsets
+        
+        empty_contexts = np.diff(context_matrix.indptr) == 0
+        
+        return context_matrix, empty_contexts, row_offsets
+    
+    def _context_similarity_block(self, context_matrix: Any, empty_contexts: np.ndarray, 
+                                  rows: np.ndarray) -> np.ndarray:
+        """
+        Calculate pairwise similarities between a set of contexts.
         
-        return float(similarity)
+        Args:
+            context_matrix: Normalized TF-IDF matrix from ``_vectorize_contexts``
+            empty_contexts: Mask of contexts with no terms
+            rows: Row indices of the contexts to compare
+            
+        Returns:
+            Square similarity matrix (0.0 = completely different, 1.0 = identical)
+        """
+        if context_matrix is None:
+            return np.full((len(rows), len(rows)), 0.5)
+        
+        block_matrix = context_matrix[rows]
+        similarity_block = (block_matrix @ block_matrix.T).toarray()
+        
+        # Contexts without any terms cannot be compared; treat them as neutral
+        empty = empty_contexts[rows]
+        if empty.any():
+            similarity_block[empty, :] = 0.5
+            similarity_block[:, empty] = 0.5
+        
+        return similarity_block
     
     def _calculate_echo_intensity(self, echo_patterns: List[Dict[str, Any]], 
-                                docs: List[spacy.tokens.Doc]) -> List[float]:
+                                features: List[DocFeatures]) -> List[float]:
         """
         Calculate echo intensity for each segment.
         
         Args:
             echo_patterns: List of echo pattern dictionaries
-            docs: List of spaCy Doc objects
+            features: Token features of each segment
             
         Returns:
             List of echo intensity values for each segment
         """
         # Initialize intensity values for each segment
-        intensity_values = [0.0] * len(docs)
+        intensity_values = [0.0] * len(features)
         
         for pattern in echo_patterns:
             # For each occurrence, add the pattern intensity to the segment
@@ -284,8 +346,8 @@ class EchoPatternEngine:
                     intensity_values[segment_index] += pattern["intensity"]
         
         # Normalize by the number of tokens in each segment
-        for i, doc in enumerate(docs):
-            num_tokens = len([token for token in doc if not token.is_punct and not token.is_space])
+        for i, doc_features in enumerate(features):
+            num_tokens = doc_features.num_words
             if num_tokens > 0:
                 intensity_values[i] /= num_tokens
         
@@ -5,11 +5,15 @@ This module detects recursion and metaphor reuse and compares narrative shape ac
 """
 
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
 import spacy
+from spacy.strings import hash_string
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from ..utils.shingles import word_ids, shingle_hashes, shingle_hashes_range
+from ..utils.minhash import minhash_signatures, lsh_candidate_pairs
+from ..utils.features import DocFeatures, ensure_features
+from ..utils.instrumentation import timer, count
 
 logger = logging.getLogger(__name__)
 
@@ -18,34 +22,75 @@ class FractalDriftDetector:
     Fractal Drift Detector (FDD) class for detecting recursion and metaphor reuse.
     """
     
-    def __init__(self, nlp: spacy.language.Language):
+    # Sentence boundaries and dependency labels (metaphor detection)
+    REQUIRES = {"sents", "dep"}
+    
+    SIGNATURE_MODES = ("exact", "lsh", "auto")
+    
+    def __init__(self, nlp: spacy.language.Language, max_signatures: Optional[int] = None,
+                 signature_threshold: float = 0.3, signature_mode: str = "exact",
+                 lsh_num_perm: int = 128, lsh_bands: int = 32, lsh_shingle_size: int = 1,
+                 lsh_min_segments: int = 5000, lsh_seed: int = 0,
+                 max_candidates: Optional[int] = 10000):
         """
         Initialize the Fractal Drift Detector.
         
         Args:
             nlp: spaCy language model
+            max_signatures: Maximum number of fractal signatures reported (all if
+                None); a capped list no longer gives the total count or every
+                segment's strongest signature
+            signature_threshold: Minimum similarity for a fractal signature
+            signature_mode: How signature candidates are found: "exact" compares
+                all segment pairs, "lsh" only pairs proposed by MinHash LSH, and
+                "auto" switches to LSH from ``lsh_min_segments`` segments
+            lsh_num_perm: MinHash signature length (higher is more accurate)
+            lsh_bands: Number of LSH bands; more bands (fewer rows per band)
+                find less similar pairs at the cost of more candidates
+            lsh_shingle_size: Words per shingle for MinHash (1 compares word
+                sets, which tracks the TF-IDF cosine most closely)
+            lsh_min_segments: Segment count from which "auto" uses LSH
+            lsh_seed: Seed of the MinHash permutations
+            max_candidates: Maximum number of candidate pairs, most similar
+                first, that common phrases are extracted from (all if None);
+                bounds the cost on long, repetitive texts, where the pairs
+                above ``signature_threshold`` grow quadratically, independently
+                of ``max_signatures``
         """
+        if signature_mode not in self.SIGNATURE_MODES:
+            raise ValueError(f"Unknown signature mode: {signature_mode}")
+        
         self.nlp = nlp
-        self.vectorizer = TfidfVectorizer(
-            min_df=1, max_df=0.9, 
-            stop_words='english', 
-            ngram_range=(1, 3)
-        )
+        self.max_signatures = max_signatures
+        self.signature_threshold = signature_threshold
+        self.signature_mode = signature_mode
+        self.lsh_num_perm = lsh_num_perm
+        self.lsh_bands = lsh_bands
+        self.lsh_shingle_size = lsh_shingle_size
+        self.lsh_min_segments = lsh_min_segments
+        self.lsh_seed = lsh_seed
+        self.max_candidates = max_candidates
+        # TF-IDF vectorizer, created on first use (scikit-learn is slow to import)
+        self.vectorizer = None
         
         # Metaphor indicators (words that often signal metaphorical language)
         self.metaphor_indicators = [
             "like", "as", "than", "seems", "appears", "resembles", 
             "reflects", "echoes", "mirrors", "symbolizes", "represents"
         ]
+        self._indicator_hashes = np.array([hash_string(word) for word in self.metaphor_indicators], 
+                                          dtype=np.uint64)
         
         logger.info("Fractal Drift Detector initialized")
     
-    def analyze(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
+    def analyze(self, docs: List[spacy.tokens.Doc], 
+                features: Optional[List[DocFeatures]] = None) -> Dict[str, Any]:
         """
         Analyze documents for fractal patterns and narrative drift.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs`` (extracted if not given)
             
         Returns:
             Dictionary containing analysis results
@@ -63,10 +108,20 @@ class FractalDriftDetector:
         # Extract text from docs
         texts = [doc.text for doc in docs]
         
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        if self.vectorizer is None:
+            self.vectorizer = TfidfVectorizer(
+                min_df=1, max_df=0.9, 
+                stop_words='english', 
+                ngram_range=(1, 3)
+            )
+        
         # Calculate TF-IDF vectors
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            feature_names = np.array(self.vectorizer.get_feature_names_out())
+            with timer("drift.tfidf"):
+                tfidf_matrix = self.vectorizer.fit_transform(texts)
+                feature_names = np.array(self.vectorizer.get_feature_names_out())
         except ValueError as e:
             logger.error(f"Error calculating TF-IDF: {e}")
             return {
@@ -78,41 +133,35 @@ class FractalDriftDetector:
                 "narrative_stability": 0.0
             }
         
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(tfidf_matrix)
+        count("ngrams", len(feature_names))
         
         # Calculate drift vectors (how each segment differs from the previous)
-        drift_vectors = []
-        for i in range(1, len(docs)):
-            # Get the TF-IDF vectors for consecutive segments
-            prev_vec = tfidf_matrix[i-1].toarray().flatten()
-            curr_vec = tfidf_matrix[i].toarray().flatten()
-            
-            # Calculate the drift vector (difference between vectors)
-            drift = curr_vec - prev_vec
-            
-            # Find the most significant terms (positive and negative drift)
-            pos_drift_indices = np.argsort(drift)[-5:]  # Top 5 positive drifts
-            neg_drift_indices = np.argsort(drift)[:5]   # Top 5 negative drifts
-            
-            pos_drift_terms = [(feature_names[idx], drift[idx]) for idx in pos_drift_indices if drift[idx] > 0]
-            neg_drift_terms = [(feature_names[idx], drift[idx]) for idx in neg_drift_indices if drift[idx] < 0]
-            
-            drift_vectors.append({
-                "segment_index": i,
-                "positive_drift": pos_drift_terms,
-                "negative_drift": neg_drift_terms,
-                "drift_magnitude": np.linalg.norm(drift)
-            })
+        with timer("drift.drift_vectors"):
+            drift_vectors = self._calculate_drift_vectors(tfidf_matrix, feature_names)
         
         # Detect metaphors and figurative language
-        metaphor_clusters = self._detect_metaphors(docs)
+        with timer("drift.metaphors"):
+            metaphor_clusters = self._detect_metaphors(docs, ensure_features(docs, features))
         
-        # Calculate fractal signatures (recurring patterns)
-        fractal_signatures = self._calculate_fractal_signatures(docs, similarity_matrix)
+        with timer("drift.similarity"):
+            if self._use_lsh(len(docs)):
+                # Cosine similarity only for pairs proposed by LSH, and the
+                # recursion score without materializing the similarity matrix
+                rows, cols, similarities = self._lsh_candidates(texts, tfidf_matrix)
+                recursion_score = self._calculate_recursion_score_sparse(tfidf_matrix)
+            else:
+                from sklearn.metrics.pairwise import cosine_similarity
+                
+                # Calculate similarity matrix over all non-adjacent pairs
+                similarity_matrix = cosine_similarity(tfidf_matrix)
+                rows, cols = np.triu_indices(len(docs), k=2)
+                similarities = similarity_matrix[rows, cols]
+                recursion_score = self._calculate_recursion_score(similarity_matrix)
+        count("similarity_pairs", len(similarities))
         
-        # Calculate recursion score
-        recursion_score = self._calculate_recursion_score(similarity_matrix)
+        # Calculate fractal signatures (recurring patterns)
+        with timer("drift.signatures"):
+            fractal_signatures = self._calculate_fractal_signatures(docs, rows, cols, similarities)
         
         # Calculate narrative stability
         narrative_stability = 1.0 - (sum(d["drift_magnitude"] for d in drift_vectors) / 
@@ -126,12 +175,64 @@ class FractalDriftDetector:
             "narrative_stability": narrative_stability
         }
     
-    def _detect_metaphors(self, docs: List[spacy.tokens.Doc]) -> List[Dict[str, Any]]:
+    def _calculate_drift_vectors(self, tfidf_matrix, feature_names: np.ndarray, 
+                                 top_k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Calculate the drift between consecutive segments.
+        
+        All consecutive differences are taken at once as a sparse matrix, and the
+        strongest terms of each row are selected among its nonzero entries only,
+        so the cost grows with the number of nonzeros rather than the vocabulary.
+        
+        Args:
+            tfidf_matrix: Sparse TF-IDF matrix, one row per segment
+            feature_names: Vocabulary terms by column
+            top_k: Number of positive and negative drift terms to keep
+            
+        Returns:
+            List of drift vectors, one per segment after the first
+        """
+        tfidf_matrix = tfidf_matrix.tocsr()
+        drift_matrix = (tfidf_matrix[1:] - tfidf_matrix[:-1]).tocsr()
+        drift_matrix.eliminate_zeros()
+        
+        # Drift magnitudes are the row norms of the difference matrix
+        magnitudes = np.sqrt(np.asarray(drift_matrix.multiply(drift_matrix).sum(axis=1)).ravel())
+        
+        drift_vectors = []
+        for row in range(drift_matrix.shape[0]):
+            start, end = drift_matrix.indptr[row], drift_matrix.indptr[row + 1]
+            columns = drift_matrix.indices[start:end]
+            values = drift_matrix.data[start:end]
+            
+            # Top positive drifts in ascending order, top negative drifts most negative first
+            positive = np.flatnonzero(values > 0)
+            if len(positive) > top_k:
+                positive = positive[np.argpartition(values[positive], -top_k)[-top_k:]]
+            positive = positive[np.argsort(values[positive], kind="stable")]
+            
+            negative = np.flatnonzero(values < 0)
+            if len(negative) > top_k:
+                negative = negative[np.argpartition(values[negative], top_k)[:top_k]]
+            negative = negative[np.argsort(values[negative], kind="stable")]
+            
+            drift_vectors.append({
+                "segment_index": row + 1,
+                "positive_drift": [(feature_names[columns[k]], values[k]) for k in positive],
+                "negative_drift": [(feature_names[columns[k]], values[k]) for k in negative],
+                "drift_magnitude": magnitudes[row]
+            })
+        
+        return drift_vectors
+    
+    def _detect_metaphors(self, docs: List[spacy.tokens.Doc], 
+                          features: List[DocFeatures]) -> List[Dict[str, Any]]:
         """
         Detect metaphors and figurative language in documents.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs``
             
         Returns:
             List of metaphor clusters
@@ -139,6 +240,10 @@ class FractalDriftDetector:
         metaphor_clusters = []
         
         for i, doc in enumerate(docs):
+            # Only documents containing an indicator need a sentence scan
+            if not np.isin(features[i].lower, self._indicator_hashes).any():
+                continue
+            
             # Look for sentences with metaphor indicators
             metaphors = []
             
@@ -184,73 +289,167 @@ class FractalDriftDetector:
         
         return metaphor_clusters
     
+    def _use_lsh(self, num_segments: int) -> bool:
+        """Whether signature candidates come from LSH for this many segments."""
+        if self.signature_mode == "auto":
+            return num_segments >= self.lsh_min_segments
+        return self.signature_mode == "lsh"
+    
+    def _lsh_candidates(self, texts: List[str], tfidf_matrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find candidate segment pairs with MinHash LSH and score them exactly.
+        
+        Args:
+            texts: Segment texts
+            tfidf_matrix: Sparse TF-IDF matrix with L2-normalized rows
+            
+        Returns:
+            Tuple (rows, cols, similarities) of non-adjacent candidate pairs
+            and their cosine similarity
+        """
+        vocabulary = {}
+        shingle_sets = []
+        for text in texts:
+            ids = word_ids(text.lower().split(), vocabulary)
+            # Segments shorter than a shingle are hashed as a single shingle
+            size = min(self.lsh_shingle_size, len(ids))
+            shingle_sets.append(np.unique(shingle_hashes(ids, size)) if size else ids)
+        
+        signatures = minhash_signatures(shingle_sets, self.lsh_num_perm, self.lsh_seed)
+        rows, cols = lsh_candidate_pairs(signatures, self.lsh_bands)
+        
+        non_adjacent = cols - rows >= 2
+        rows, cols = rows[non_adjacent], cols[non_adjacent]
+        
+        # Rows are L2-normalized, so cosine similarity is the dot product
+        tfidf_matrix = tfidf_matrix.tocsr()
+        similarities = np.asarray(tfidf_matrix[rows].multiply(tfidf_matrix[cols]).sum(axis=1)).ravel()
+        
+        logger.info(f"LSH proposed {len(rows)} candidate pairs for {len(texts)} segments")
+        return rows, cols, similarities
+    
     def _calculate_fractal_signatures(self, 
                                      docs: List[spacy.tokens.Doc], 
-                                     similarity_matrix: np.ndarray) -> List[Dict[str, Any]]:
+                                     rows: np.ndarray, cols: np.ndarray,
+                                     similarities: np.ndarray) -> List[Dict[str, Any]]:
         """
         Calculate fractal signatures (recurring patterns) in the documents.
         
         Args:
             docs: List of spaCy Doc objects
-            similarity_matrix: Similarity matrix between documents
+            rows: First segment index of each candidate pair
+            cols: Second segment index of each candidate pair (non-adjacent)
+            similarities: Cosine similarity of each candidate pair
             
         Returns:
-            List of fractal signatures
+            List of fractal signatures, most similar first (at most
+            ``max_signatures`` if set), found among the ``max_candidates``
+            most similar pairs
         """
-        fractal_signatures = []
+        # Candidate pairs: high similarity between non-adjacent segments
+        candidates = np.flatnonzero(similarities > self.signature_threshold)
         
-        # Find significant recurring patterns (high similarity between non-adjacent segments)
-        for i in range(len(docs)):
-            for j in range(i+2, len(docs)):  # Skip adjacent segments
-                similarity = similarity_matrix[i, j]
-                
-                # If similarity is high (threshold can be adjusted)
-                if similarity > 0.3:
-                    # Extract common terms between the segments
-                    doc_i_text = docs[i].text.lower()
-                    doc_j_text = docs[j].text.lower()
-                    
-                    # Find common phrases (simple approach using n-grams)
-                    common_phrases = self._find_common_phrases(doc_i_text, doc_j_text)
-                    
-                    if common_phrases:
-                        fractal_signatures.append({
-                            "segment_pair": (i, j),
-                            "similarity": float(similarity),
-                            "common_phrases": common_phrases[:5],  # Top 5 common phrases
-                            "distance": j - i
-                        })
+        # Most similar first; the stable sort keeps ties in segment order
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        if self.max_candidates is not None:
+            candidates = candidates[:self.max_candidates]
         
-        # Sort by similarity (highest first)
-        fractal_signatures.sort(key=lambda x: x["similarity"], reverse=True)
+        # Extract common phrases only until enough signatures are found, from
+        # shingle sets hashed once per segment
+        shingle_index = {}
+        vocabulary = {}
+        fractal_signatures = []
+        for k in candidates:
+            if self.max_signatures is not None and len(fractal_signatures) >= self.max_signatures:
+                break
+            
+            i, j = int(rows[k]), int(cols[k])
+            for index in (i, j):
+                if index not in shingle_index:
+                    shingle_index[index] = self._build_shingle_set(docs[index].text.lower(), vocabulary)
+            common_phrases = self._find_common_phrases(shingle_index[i], shingle_index[j])
+            
+            if common_phrases:
+                fractal_signatures.append({
+                    "segment_pair": (i, j),
+                    "similarity": float(similarities[k]),
+                    "common_phrases": common_phrases,
+                    "distance": j - i
+                })
         
         return fractal_signatures
     
-    def _find_common_phrases(self, text1: str, text2: str, min_length: int = 4) -> List[str]:
+    def _build_shingle_set(self, text: str, vocabulary: Dict[str, int], 
+                           min_length: int = 4, max_length: int = 9) -> Dict[str, Any]:
         """
-        Find common phrases between two texts.
+        Hash the word n-grams of a text for phrase matching.
         
         Args:
-            text1: First text
-            text2: Second text
-            min_length: Minimum length of phrases to consider
+            text: Lowercased segment text
+            vocabulary: Word-to-id mapping shared by the segments of one analysis
+            min_length: Minimum phrase length in words
+            max_length: Maximum phrase length in words
             
         Returns:
-            List of common phrases
+            Dictionary with the words and the unique shingle hashes (sorted),
+            with the length and first start position of each shingle
         """
-        words1 = text1.split()
-        words2 = text2.split()
+        words = text.split()
+        hashes_by_length = shingle_hashes_range(word_ids(words, vocabulary), min_length, max_length)
         
-        common_phrases = []
+        hashes = np.concatenate(hashes_by_length)
+        lengths = np.concatenate([np.full(len(h), n, dtype=np.int64) 
+                                  for n, h in enumerate(hashes_by_length, start=min_length)])
+        starts = np.concatenate([np.arange(len(h), dtype=np.int64) for h in hashes_by_length])
+        
+        # np.unique keeps the first occurrence of every hash
+        hashes, first = np.unique(hashes, return_index=True)
+        
+        return {
+            "words": words,
+            "hashes": hashes,
+            "lengths": lengths[first],
+            "starts": starts[first]
+        }
+    
+    def _find_common_phrases(self, shingles1: Dict[str, Any], shingles2: Dict[str, Any], 
+                             limit: int = 5) -> List[str]:
+        """
+        Find common phrases between two texts.
+        
+        Shingle hashes are intersected as integer arrays; only the reported
+        phrases are turned back into text.
         
-        # Check for common n-grams
-        for n in range(min_length, min(10, min(len(words1), len(words2)) + 1)):
-            ngrams1 = [' '.join(words1[i:i+n]) for i in range(len(words1) - n + 1)]
-            ngrams2 = [' '.join(words2[i:i+n]) for i in range(len(words2) - n + 1)]
+        Args:
+            shingles1: Shingle set of the first text (see ``_build_shingle_set``)
+            shingles2: Shingle set of the second text
+            limit: Maximum number of phrases returned
             
-            # Find intersection
-            common = set(ngrams1).intersection(set(ngrams2))
-            common_phrases.extend(list(common))
+        Returns:
+            List of common phrases, shortest first, then in order of
+            appearance in the first text
+        """
+        _, index1, index2 = np.intersect1d(shingles1["hashes"], shingles2["hashes"], 
+                                           assume_unique=True, return_indices=True)
+        if len(index1) == 0:
+            return []
+        
+        lengths = shingles1["lengths"][index1]
+        starts1 = shingles1["starts"][index1]
+        starts2 = shingles2["starts"][index2]
+        order = np.lexsort((starts1, lengths))
+        
+        words1 = shingles1["words"]
+        words2 = shingles2["words"]
+        common_phrases = []
+        for k in order:
+            n, start1, start2 = lengths[k], starts1[k], starts2[k]
+            phrase = words1[start1:start1 + n]
+            # Guard against hash collisions
+            if phrase == words2[start2:start2 + n]:
+                common_phrases.append(' '.join(phrase))
+                if len(common_phrases) >= limit:
+                    break
         
         return common_phrases
     
@@ -271,13 +470,38 @@ class FractalDriftDetector:
         if n <= 2:
             return 0.0
         
-        non_adjacent_similarities = []
-        for i in range(n):
-            for j in range(n):
-                if abs(i - j) >= 2:  # Non-adjacent segments
-                    non_adjacent_similarities.append(similarity_matrix[i, j])
+        # Average over the band |i - j| >= 2 (both triangles)
+        indices = np.arange(n)
+        non_adjacent = np.abs(indices[:, None] - indices[None, :]) >= 2
         
         # Calculate recursion score as average non-adjacent similarity
-        recursion_score = np.mean(non_adjacent_similarities) if non_adjacent_similarities else 0.0
+        recursion_score = similarity_matrix[non_adjacent].mean()
         
         return float(recursion_score)
+    
+    def _calculate_recursion_score_sparse(self, tfidf_matrix) -> float:
+        """
+        Calculate the recursion score without building the similarity matrix.
+        
+        With L2-normalized rows, the sum of all pairwise cosine similarities
+        is the squared norm of the row sum; the diagonal and the adjacent
+        pairs are subtracted to leave the |i - j| >= 2 band.
+        
+        Args:
+            tfidf_matrix: Sparse TF-IDF matrix with L2-normalized rows
+            
+        Returns:
+            Recursion score (same value as ``_calculate_recursion_score``)
+        """
+        tfidf_matrix = tfidf_matrix.tocsr()
+        n = tfidf_matrix.shape[0]
+        if n <= 2:
+            return 0.0
+        
+        row_sum = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+        total = float(row_sum @ row_sum)
+        diagonal = float(tfidf_matrix.multiply(tfidf_matrix).sum())
+        adjacent = float(tfidf_matrix[:-1].multiply(tfidf_matrix[1:]).sum())
+        
+        num_pairs = n * n - n - 2 * (n - 1)
+        return (total - diagonal - 2 * adjacent) / num_pairs
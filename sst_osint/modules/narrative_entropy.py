@@ -6,19 +6,42 @@ narrative trauma zones or emotional collapse.
 """
 
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import spacy
 import logging
-from scipy.stats import entropy
 from collections import Counter
 
+from ..utils.features import DocFeatures, ensure_features, counts_in_order
+from ..utils.instrumentation import timer
+
 logger = logging.getLogger(__name__)
 
+def entropy(freqs: np.ndarray, base: float = 2) -> float:
+    """
+    Shannon entropy of a frequency distribution.
+    
+    Equivalent to ``scipy.stats.entropy`` for non-negative inputs, without
+    the cost of importing scipy.stats.
+    
+    Args:
+        freqs: Counts or probabilities
+        base: Logarithm base
+        
+    Returns:
+        Entropy value
+    """
+    probs = np.asarray(freqs, dtype=float)
+    probs = probs[probs > 0] / probs.sum()
+    return float(0.0 - (probs * np.log(probs)).sum() / np.log(base))
+
 class NarrativeEntropyScanner:
     """
     Narrative Entropy Scanner (NES) class for measuring semantic entropy.
     """
     
+    # Lemma and dependency distributions, plus sentence vectors for coherence
+    REQUIRES = {"lemma", "dep", "sents", "tensor"}
+    
     def __init__(self, nlp: spacy.language.Language):
         """
         Initialize the Narrative Entropy Scanner.
@@ -29,12 +52,14 @@ class NarrativeEntropyScanner:
         self.nlp = nlp
         logger.info("Narrative Entropy Scanner initialized")
     
-    def analyze(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
+    def analyze(self, docs: List[spacy.tokens.Doc], 
+                features: Optional[List[DocFeatures]] = None) -> Dict[str, Any]:
         """
         Analyze documents for narrative entropy patterns.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs`` (extracted if not given)
             
         Returns:
             Dictionary containing analysis results
@@ -50,14 +75,19 @@ class NarrativeEntropyScanner:
                 "entropy_gradient": []
             }
         
+        features = ensure_features(docs, features)
+        
         # Calculate lexical entropy for each segment
-        lexical_entropy = [self._calculate_lexical_entropy(doc) for doc in docs]
+        with timer("entropy.lexical"):
+            lexical_entropy = [self._calculate_lexical_entropy(f) for f in features]
         
         # Calculate syntactic entropy for each segment
-        syntactic_entropy = [self._calculate_syntactic_entropy(doc) for doc in docs]
+        with timer("entropy.syntactic"):
+            syntactic_entropy = [self._calculate_syntactic_entropy(f) for f in features]
         
         # Calculate semantic coherence for each segment
-        semantic_coherence = [self._calculate_semantic_coherence(doc) for doc in docs]
+        with timer("entropy.semantic_coherence"):
+            semantic_coherence = [self._calculate_semantic_coherence(doc) for doc in docs]
         
         # Combine the entropy measures (weighted average)
         combined_entropy = [0.4 * l + 0.4 * s + 0.2 * (1 - c) for l, s, c in 
@@ -91,48 +121,47 @@ class NarrativeEntropyScanner:
             "semantic_coherence": semantic_coherence
         }
     
-    def _calculate_lexical_entropy(self, doc: spacy.tokens.Doc) -> float:
+    def _calculate_lexical_entropy(self, features: DocFeatures) -> float:
         """
         Calculate lexical entropy based on word frequency distribution.
         
         Args:
-            doc: spaCy Doc object
+            features: Token features of a document
             
         Returns:
             Lexical entropy value
         """
         # Count lemmas (normalized word forms)
-        lemma_counter = Counter(token.lemma_ for token in doc 
-                               if not token.is_punct and not token.is_space)
+        lemma_counts = counts_in_order(features.lemma[features.is_word])
         
-        if not lemma_counter:
+        if len(lemma_counts) == 0:
             return 0.0
         
         # Calculate frequency distribution
-        freqs = np.array(list(lemma_counter.values()))
+        freqs = lemma_counts
         freqs = freqs / freqs.sum()
         
         # Calculate Shannon entropy
         return float(entropy(freqs, base=2))
     
-    def _calculate_syntactic_entropy(self, doc: spacy.tokens.Doc) -> float:
+    def _calculate_syntactic_entropy(self, features: DocFeatures) -> float:
         """
         Calculate syntactic entropy based on dependency relations.
         
         Args:
-            doc: spaCy Doc object
+            features: Token features of a document
             
         Returns:
             Syntactic entropy value
         """
         # Count dependency relations
-        dep_counter = Counter(token.dep_ for token in doc)
+        dep_counts = counts_in_order(features.dep)
         
-        if not dep_counter:
+        if len(dep_counts) == 0:
             return 0.0
         
         # Calculate frequency distribution
-        freqs = np.array(list(dep_counter.values()))
+        freqs = dep_counts
         freqs = freqs / freqs.sum()
         
         # Calculate Shannon entropy
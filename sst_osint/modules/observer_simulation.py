@@ -6,10 +6,14 @@ and simulates "observer interference" for feedback loop modeling.
 """
 
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 import spacy
+from spacy.strings import hash_string
 import logging
-import random
+
+from ..utils.features import DocFeatures, ensure_features, word_hashes
+from ..utils.instrumentation import timer
+from ..utils.sentiment import SentimentBackend, create_sentiment_backend
 
 logger = logging.getLogger(__name__)
 
@@ -18,31 +22,60 @@ class ObserverSimulationLayer:
     Observer Simulation Layer (OSL) class for simulating resonance response.
     """
     
-    def __init__(self, nlp: spacy.language.Language):
+    # Persona features are computed from lemmas
+    REQUIRES = {"lemma"}
+    
+    # Segment features scored by the personas, in feature-vector order
+    FEATURES = ("emotionality", "factuality", "ambiguity")
+    
+    def __init__(self, nlp: spacy.language.Language, seed: Optional[int] = 0, 
+                 sample_size: int = 3, score_all_segments: bool = False,
+                 sentiment_backend: Union[str, SentimentBackend, None] = "lexicon",
+                 sentiment_options: Optional[Dict[str, Any]] = None):
         """
         Initialize the Observer Simulation Layer.
         
         Args:
             nlp: spaCy language model
+            seed: Seed of the generator that picks segments and questions; each
+                analysis starts a new generator from it, so results are
+                reproducible (None draws fresh entropy every time)
+            sample_size: Number of segments each persona responds to
+            score_all_segments: Whether personas respond to every segment
+                instead of a sample
+            sentiment_backend: Sentiment backend name (see
+                ``utils.sentiment.SENTIMENT_BACKENDS``), a backend object, or
+                None to disable sentiment shifts
+            sentiment_options: Keyword arguments for a named sentiment backend
         """
         self.nlp = nlp
+        self.seed = seed
+        self.sample_size = sample_size
+        self.score_all_segments = score_all_segments
         
         # Define analyst personas
         self._initialize_personas()
         
-        # Initialize sentiment analysis (simplified version)
-        self.has_sentiment = False
-        logger.warning("Sentiment analysis disabled: transformers library not available")
+        # Word lists used to score documents, hashed for lookup on lemma arrays
+        self._initialize_markers()
+        
+        # Offline sentiment backend, scoring all segments in one batch
+        self.sentiment = create_sentiment_backend(sentiment_backend, **(sentiment_options or {}))
+        self.has_sentiment = self.sentiment is not None
         
         logger.info("Observer Simulation Layer initialized")
     
     def _initialize_personas(self):
         """Initialize analyst personas for simulation."""
+        # Alignment and tension are affine in the segment features: weights
+        # for (emotionality, factuality, ambiguity) followed by a constant
         self.personas = [
             {
                 "name": "Clinical_Objective",
                 "description": "A clinical, objective observer who focuses on facts and avoids emotional language.",
                 "style": "clinical",
+                "alignment_weights": [-0.5, 0.5, 0.0, 0.5],
+                "tension_weights": [0.7, 0.0, 0.3, 0.0],
                 "questions": [
                     "What specific language patterns are evident in this text?",
                     "How does the narrative structure change throughout the text?",
@@ -55,6 +88,8 @@ class ObserverSimulationLayer:
                 "name": "Empathetic_Supporter",
                 "description": "An empathetic observer who responds with emotional support and validation.",
                 "style": "empathetic",
+                "alignment_weights": [0.7, -0.3, 0.0, 0.3],
+                "tension_weights": [-0.5, 0.5, 0.0, 0.5],
                 "questions": [
                     "How might the emotional state of the author shift throughout the text?",
                     "What unsaid emotions seem to underlie the narrative?",
@@ -67,6 +102,8 @@ class ObserverSimulationLayer:
                 "name": "Skeptical_Analyst",
                 "description": "A skeptical observer who questions assertions and looks for logical fallacies.",
                 "style": "skeptical",
+                "alignment_weights": [0.0, 0.3, 0.7, 0.0],
+                "tension_weights": [0.0, -0.5, -0.5, 1.0],
                 "questions": [
                     "What claims in this text lack sufficient evidence?",
                     "How might confirmation bias be operating in this narrative?",
@@ -76,13 +113,64 @@ class ObserverSimulationLayer:
                 ]
             }
         ]
+        
+        # Persona weight matrix: columns are the alignments of all personas,
+        # then their tensions
+        self._persona_weights = np.array(
+            [persona["alignment_weights"] for persona in self.personas] +
+            [persona["tension_weights"] for persona in self.personas],
+            dtype=np.float64
+        ).T
+    
+    def _initialize_markers(self):
+        """Define the marker word lists and compile them to lemma hashes."""
+        self.emotional_words = ["love", "hate", "fear", "angry", "sad", "happy", "worry", 
+                                "scared", "anxious", "excited", "terrible", "wonderful", 
+                                "awful", "amazing", "horrific", "beautiful", "ugly"]
+        
+        self.factual_indicators = ["fact", "evidence", "data", "research", "study", 
+                                   "statistic", "measured", "observed", "documented"]
+        
+        self.opinion_indicators = ["think", "believe", "feel", "sense", "seems", 
+                                   "appears", "might", "could", "perhaps", "maybe"]
+        
+        self.ambiguity_markers = ["maybe", "perhaps", "possibly", "might", "could", 
+                                  "uncertain", "unclear", "unknown", "somewhat", 
+                                  "somehow", "sort of", "kind of", "approximately"]
+        
+        self.certainty_markers = ["definitely", "certainly", "absolutely", "clearly", 
+                                  "obviously", "undoubtedly", "precisely", "exactly", 
+                                  "surely", "indeed", "without doubt"]
+        
+        # Single-token markers match lowercase lemmas; "sort of" and "kind of" are
+        # matched as lowercase bigrams
+        self._marker_hashes = {
+            name: word_hashes(word for word in getattr(self, name) if " " not in word)
+            for name in ("emotional_words", "factual_indicators", "opinion_indicators",
+                         "ambiguity_markers", "certainty_markers")
+        }
+        self._hedge_heads = np.array([hash_string("sort"), hash_string("kind")], dtype=np.uint64)
+        self._hedge_tail = np.uint64(hash_string("of"))
+    
+    def cache_token(self) -> str:
+        """
+        Identify the sentiment backend, for result cache keys.
+        
+        Returns:
+            Version string of the sentiment backend in use
+        """
+        if self.sentiment is None:
+            return "sentiment-none"
+        return f"sentiment-{getattr(self.sentiment, 'version_id', type(self.sentiment).__name__)}"
     
-    def analyze(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
+    def analyze(self, docs: List[spacy.tokens.Doc], 
+                features: Optional[List[DocFeatures]] = None) -> Dict[str, Any]:
         """
         Analyze documents by simulating different observer perspectives.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs`` (extracted if not given)
             
         Returns:
             Dictionary containing analysis results
@@ -93,218 +181,153 @@ class ObserverSimulationLayer:
                 "observer_responses": [],
                 "resonance_scores": {},
                 "feedback_loops": [],
-                "sentiment_shifts": []
+                "sentiment_shifts": [],
+                "segment_sentiment": []
             }
         
-        # For each persona, simulate responses to the text
-        observer_responses = []
+        features = ensure_features(docs, features)
         
-        for persona in self.personas:
-            responses = self._simulate_persona_response(docs, persona)
-            observer_responses.append({
-                "persona": persona["name"],
-                "responses": responses
-            })
+        with timer("observer.personas"):
+            # Score every segment against every persona at once
+            segment_features = self._segment_features(features)
+            alignment, tension = self._persona_scores(segment_features)
+            
+            # For each persona, simulate responses to the text
+            rng = np.random.default_rng(self.seed)
+            observer_responses = []
+            for p, persona in enumerate(self.personas):
+                responses = self._simulate_persona_response(persona, segment_features, 
+                                                            alignment[:, p], tension[:, p], rng)
+                observer_responses.append({
+                    "persona": persona["name"],
+                    "responses": responses
+                })
         
         # Calculate resonance scores for each persona
         resonance_scores = self._calculate_resonance_scores(docs, observer_responses)
         
         # Detect potential feedback loops
-        feedback_loops = self._detect_feedback_loops(docs, observer_responses)
+        with timer("observer.feedback_loops"):
+            feedback_loops = self._detect_feedback_loops(docs, observer_responses)
         
         # Analyze sentiment shifts
-        sentiment_shifts = self._analyze_sentiment_shifts(docs)
+        with timer("observer.sentiment"):
+            segment_sentiment = self._score_sentiment(features)
+            sentiment_shifts = self._analyze_sentiment_shifts(segment_sentiment)
         
         return {
             "observer_responses": observer_responses,
             "resonance_scores": resonance_scores,
             "feedback_loops": feedback_loops,
-            "sentiment_shifts": sentiment_shifts
+            "sentiment_shifts": sentiment_shifts,
+            "segment_sentiment": segment_sentiment
         }
     
-    def _simulate_persona_response(self, docs: List[spacy.tokens.Doc], 
-                                 persona: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _simulate_persona_response(self, persona: Dict[str, Any], segment_features: np.ndarray,
+                                   alignment: np.ndarray, tension: np.ndarray, 
+                                   rng: np.random.Generator) -> List[Dict[str, Any]]:
         """
         Simulate responses from a specific persona.
         
         Args:
-            docs: List of spaCy Doc objects
             persona: Persona information
+            segment_features: Feature matrix of all segments (see ``FEATURES``)
+            alignment: Alignment of each segment with this persona
+            tension: Tension of each segment with this persona
+            rng: Generator of this analysis
             
         Returns:
             List of simulated responses
         """
-        responses = []
-        
         # Select segments to respond to (not every segment gets a response)
-        num_segments = len(docs)
-        response_indices = sorted(random.sample(range(num_segments), 
-                                              min(3, num_segments)))
+        num_segments = len(segment_features)
+        if self.score_all_segments:
+            response_indices = np.arange(num_segments)
+        else:
+            response_indices = np.sort(rng.choice(num_segments, size=min(self.sample_size, num_segments), 
+                                                  replace=False))
         
-        for i in response_indices:
-            # Select a question appropriate for this segment
-            question = random.choice(persona["questions"])
-            
-            # Simulate resonance analysis
-            resonance = self._analyze_resonance(docs[i], persona)
-            
+        # Select a question for each response
+        questions = rng.integers(len(persona["questions"]), size=len(response_indices))
+        
+        responses = []
+        for i, question in zip(response_indices.tolist(), questions.tolist()):
+            emotionality, factuality, ambiguity = segment_features[i].tolist()
             responses.append({
                 "segment_index": i,
-                "question": question,
-                "resonance": resonance
+                "question": persona["questions"][question],
+                "resonance": {
+                    "alignment": float(alignment[i]),
+                    "tension": float(tension[i]),
+                    "resonance": float(alignment[i] - tension[i]),
+                    "emotionality": emotionality,
+                    "factuality": factuality,
+                    "ambiguity": ambiguity
+                }
             })
         
         return responses
     
-    def _analyze_resonance(self, doc: spacy.tokens.Doc, persona: Dict[str, Any]) -> Dict[str, float]:
+    def _persona_scores(self, segment_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Analyze resonance between a document and a persona.
+        Score segments against all personas.
         
         Args:
-            doc: spaCy Doc object
-            persona: Persona information
+            segment_features: Feature matrix of shape (segments, len(FEATURES))
             
         Returns:
-            Dictionary of resonance scores
+            Tuple (alignment, tension), each of shape (segments, personas)
         """
-        # This is a simplified simulation - in a real system, this would involve
-        # more sophisticated NLP techniques
-        
-        # Extract key features from the document
-        emotionality = self._calculate_emotionality(doc)
-        factuality = self._calculate_factuality(doc)
-        ambiguity = self._calculate_ambiguity(doc)
-        
-        # Calculate resonance based on persona style
-        if persona["style"] == "clinical":
-            alignment = (1.0 - emotionality) * 0.5 + factuality * 0.5
-            tension = emotionality * 0.7 + ambiguity * 0.3
-        
-        elif persona["style"] == "empathetic":
-            alignment = emotionality * 0.7 + (1.0 - factuality) * 0.3
-            tension = (1.0 - emotionality) * 0.5 + factuality * 0.5
-        
-        else:  # skeptical
-            alignment = factuality * 0.3 + ambiguity * 0.7
-            tension = (1.0 - factuality) * 0.5 + (1.0 - ambiguity) * 0.5
-        
-        # Calculate overall resonance
-        resonance = alignment - tension
-        
-        return {
-            "alignment": float(alignment),
-            "tension": float(tension),
-            "resonance": float(resonance),
-            "emotionality": float(emotionality),
-            "factuality": float(factuality),
-            "ambiguity": float(ambiguity)
-        }
+        # Append the constant column so the persona biases apply in the same product
+        design = np.hstack([segment_features, np.ones((len(segment_features), 1))])
+        scores = design @ self._persona_weights
+        num_personas = len(self.personas)
+        return scores[:, :num_personas], scores[:, num_personas:]
     
-    def _calculate_emotionality(self, doc: spacy.tokens.Doc) -> float:
+    def _segment_features(self, features: List[DocFeatures]) -> np.ndarray:
         """
-        Calculate emotionality of a document.
+        Calculate the emotionality, factuality and ambiguity of all segments.
         
-        Args:
-            doc: spaCy Doc object
-            
-        Returns:
-            Emotionality score (0.0-1.0)
-        """
-        # Count emotional words
-        emotional_words = ["love", "hate", "fear", "angry", "sad", "happy", "worry", 
-                          "scared", "anxious", "excited", "terrible", "wonderful", 
-                          "awful", "amazing", "horrific", "beautiful", "ugly"]
-        
-        count = 0
-        for token in doc:
-            if token.lemma_.lower() in emotional_words:
-                count += 1
-        
-        # Calculate emotionality as proportion of emotional words
-        emotionality = count / max(1, len(doc))
-        
-        # Scale to reasonable range
-        emotionality = min(1.0, emotionality * 5.0)
-        
-        return emotionality
-    
-    def _calculate_factuality(self, doc: spacy.tokens.Doc) -> float:
-        """
-        Calculate factuality of a document.
+        The tokens of all segments are matched against the marker lists in
+        one pass and the matches are counted per segment.
         
         Args:
-            doc: spaCy Doc object
+            features: Token features of the segments
             
         Returns:
-            Factuality score (0.0-1.0)
+            Array of shape (segments, len(FEATURES)) with scores in 0.0-1.0
         """
-        # Count factual indicators and opinion indicators
-        factual_indicators = ["fact", "evidence", "data", "research", "study", 
-                             "statistic", "measured", "observed", "documented"]
+        num_segments = len(features)
+        num_tokens = np.array([f.num_tokens for f in features], dtype=np.int64)
+        segment_ids = np.repeat(np.arange(num_segments), num_tokens)
+        lemma = np.concatenate([f.lemma_lower for f in features]) if num_segments else np.zeros(0, dtype=np.uint64)
+        lower = np.concatenate([f.lower for f in features]) if num_segments else np.zeros(0, dtype=np.uint64)
         
-        opinion_indicators = ["think", "believe", "feel", "sense", "seems", 
-                             "appears", "might", "could", "perhaps", "maybe"]
+        def counts(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(segment_ids[mask], minlength=num_segments)
         
-        factual_count = 0
-        opinion_count = 0
+        # Count each marker list per segment (the lists within each score are disjoint)
+        marker_counts = {name: counts(np.isin(lemma, hashes)) 
+                         for name, hashes in self._marker_hashes.items()}
         
-        for token in doc:
-            if token.lemma_.lower() in factual_indicators:
-                factual_count += 1
-            elif token.lemma_.lower() in opinion_indicators:
-                opinion_count += 1
+        # Bigram hedges ("sort of", "kind of") that stay within one segment
+        hedges = np.zeros(len(lower), dtype=bool)
+        hedges[:-1] = (np.isin(lower[:-1], self._hedge_heads) & (lower[1:] == self._hedge_tail) & 
+                       (segment_ids[:-1] == segment_ids[1:]))
+        ambiguity_count = marker_counts["ambiguity_markers"] + counts(hedges)
         
-        # Calculate factuality ratio
-        total = factual_count + opinion_count
-        if total == 0:
-            return 0.5  # Neutral if no indicators
+        # Emotionality: proportion of emotional words, scaled to a reasonable range
+        emotionality = np.minimum(1.0, marker_counts["emotional_words"] / np.maximum(1, num_tokens) * 5.0)
         
-        factuality = factual_count / total
+        # Factuality and ambiguity ratios, neutral (0.5) without any indicators
+        def ratio(count: np.ndarray, other: np.ndarray) -> np.ndarray:
+            total = count + other
+            return np.where(total == 0, 0.5, count / np.maximum(1, total))
         
-        return factuality
-    
-    def _calculate_ambiguity(self, doc: spacy.tokens.Doc) -> float:
-        """
-        Calculate ambiguity of a document.
+        factuality = ratio(marker_counts["factual_indicators"], marker_counts["opinion_indicators"])
+        ambiguity = ratio(ambiguity_count, marker_counts["certainty_markers"])
         
-        Args:
-            doc: spaCy Doc object
-            
-        Returns:
-            Ambiguity score (0.0-1.0)
-        """
-        # Count ambiguity markers
-        ambiguity_markers = ["maybe", "perhaps", "possibly", "might", "could", 
-                            "uncertain", "unclear", "unknown", "somewhat", 
-                            "somehow", "sort of", "kind of", "approximately"]
-        
-        certainty_markers = ["definitely", "certainly", "absolutely", "clearly", 
-                            "obviously", "undoubtedly", "precisely", "exactly", 
-                            "surely", "indeed", "without doubt"]
-        
-        ambiguity_count = 0
-        certainty_count = 0
-        
-        for token in doc:
-            if token.lemma_.lower() in ambiguity_markers:
-                ambiguity_count += 1
-            elif token.lemma_.lower() in certainty_markers:
-                certainty_count += 1
-        
-        # Look for bigrams
-        for i in range(len(doc) - 1):
-            bigram = doc[i].text.lower() + " " + doc[i+1].text.lower()
-            if bigram in ["sort of", "kind of"]:
-                ambiguity_count += 1
-        
-        # Calculate ambiguity score
-        total = ambiguity_count + certainty_count
-        if total == 0:
-            return 0.5  # Neutral if no markers
-        
-        ambiguity = ambiguity_count / total
-        
-        return ambiguity
+        return np.column_stack([emotionality, factuality, ambiguity]).astype(np.float64)
     
     def _calculate_resonance_scores(self, docs: List[spacy.tokens.Doc], 
                                    observer_responses: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -372,58 +395,49 @@ class ObserverSimulationLayer:
         
         return feedback_loops
     
-    def _analyze_sentiment_shifts(self, docs: List[spacy.tokens.Doc]) -> List[Dict[str, Any]]:
+    def _score_sentiment(self, features: List[DocFeatures]) -> List[float]:
+        """
+        Score the sentiment of all segments in one batch.
+        
+        Args:
+            features: Token features of the segments
+            
+        Returns:
+            Sentiment per segment (-1 to 1), or an empty list without a backend
+        """
+        if not self.has_sentiment:
+            return []
+        
+        try:
+            return [float(score) for score in self.sentiment.score(features)]
+        except Exception as e:
+            logger.error(f"Error scoring sentiment: {e}")
+            return []
+    
+    def _analyze_sentiment_shifts(self, sentiments: List[float]) -> List[Dict[str, Any]]:
         """
         Analyze sentiment shifts across documents.
         
         Args:
-            docs: List of spaCy Doc objects
+            sentiments: Sentiment per segment (-1 to 1)
             
         Returns:
             List of sentiment shifts
         """
         sentiment_shifts = []
         
-        # Skip if we don't have the sentiment pipeline
-        if not self.has_sentiment or len(docs) < 2:
-            return sentiment_shifts
-        
-        try:
-            # Calculate sentiment for each segment
-            sentiments = []
-            for doc in docs:
-                result = self.sentiment_pipeline(doc.text[:512])  # Truncate for pipeline
-                if result:
-                    label = result[0]["label"]
-                    score = result[0]["score"]
-                    
-                    # Convert to numeric score (-1 to 1)
-                    if label.lower() == "positive":
-                        numeric_score = score
-                    elif label.lower() == "negative":
-                        numeric_score = -score
-                    else:
-                        numeric_score = 0.0
-                    
-                    sentiments.append(numeric_score)
-                else:
-                    sentiments.append(0.0)
+        # Detect significant shifts
+        for i in range(1, len(sentiments)):
+            shift = sentiments[i] - sentiments[i-1]
             
-            # Detect significant shifts
-            for i in range(1, len(sentiments)):
-                shift = sentiments[i] - sentiments[i-1]
-                
-                # If shift is significant
-                if abs(shift) > 0.5:
-                    direction = "positive" if shift > 0 else "negative"
-                    sentiment_shifts.append({
-                        "from_segment": i-1,
-                        "to_segment": i,
-                        "direction": direction,
-                        "magnitude": abs(shift)
-                    })
-        
-        except Exception as e:
-            logger.error(f"Error analyzing sentiment shifts: {e}")
+            # If shift is significant
+            if abs(shift) > 0.5:
+                direction = "positive" if shift > 0 else "negative"
+                sentiment_shifts.append({
+                    "from_segment": i-1,
+                    "to_segment": i,
+                    "direction": direction,
+                    "magnitude": abs(shift)
+                })
         
         return sentiment_shifts
@@ -5,12 +5,18 @@ This module identifies symbol-heavy language or metaphor clusters and flags
 "emotional black holes" in testimony or grooming messages.
 """
 
+import os
+import hashlib
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
 import spacy
 import logging
 from collections import Counter
-import re
+
+from ..utils.aho_corasick import AhoCorasick
+from ..utils.lexicon import SymbolLexicon
+from ..utils.features import DocFeatures, ensure_features
+from ..utils.instrumentation import timer, count
 
 logger = logging.getLogger(__name__)
 
@@ -19,60 +25,40 @@ class SymbolicDensityAnalyzer:
     Symbolic Density Analyzer (SDA) class for identifying symbol-heavy language.
     """
     
-    def __init__(self, nlp: spacy.language.Language):
+    # Symbol banks are matched on lemmas
+    REQUIRES = {"lemma"}
+    
+    def __init__(self, nlp: spacy.language.Language, grooming_lexicon_path: Optional[str] = None,
+                 symbol_lexicon_path: Optional[str] = None, language: str = "en"):
         """
         Initialize the Symbolic Density Analyzer.
         
         Args:
             nlp: spaCy language model
+            grooming_lexicon_path: Optional text file of additional grooming
+                phrases (one per line, ``#`` starts a comment); it is reloaded
+                automatically when the file changes
+            symbol_lexicon_path: Symbol lexicon file (the latest bundled
+                lexicon for ``language`` if None)
+            language: Language of the bundled symbol lexicon
         """
         self.nlp = nlp
+        self.symbol_lexicon_path = symbol_lexicon_path
+        self.language = language
+        self.grooming_lexicon_path = grooming_lexicon_path
+        self._grooming_lexicon_mtime = None
         
         # Initialize symbol banks
         self._initialize_symbol_banks()
+        if grooming_lexicon_path:
+            self.reload_grooming_lexicon()
         
         logger.info("Symbolic Density Analyzer initialized")
     
     def _initialize_symbol_banks(self):
-        """Initialize dictionaries of symbolic language markers."""
-        # Emotional symbol bank (words with strong emotional loading)
-        self.emotional_symbols = {
-            "family": 0.7, "child": 0.75, "love": 0.8, "heart": 0.7, "pain": 0.8,
-            "fear": 0.85, "death": 0.9, "life": 0.7, "soul": 0.8, "spirit": 0.75,
-            "blood": 0.8, "god": 0.85, "heaven": 0.8, "hell": 0.85, "angel": 0.75,
-            "demon": 0.85, "devil": 0.9, "evil": 0.85, "good": 0.7, "pure": 0.75,
-            "dark": 0.8, "light": 0.8, "shadow": 0.85, "secret": 0.8, "truth": 0.75,
-            "lie": 0.8, "power": 0.75, "control": 0.8, "freedom": 0.8, "prison": 0.85,
-            "cage": 0.85, "trap": 0.8, "escape": 0.75, "voice": 0.7, "silence": 0.75,
-            "cry": 0.8, "tear": 0.75, "smile": 0.7, "laugh": 0.7, "scream": 0.85,
-            "touch": 0.75, "hurt": 0.8, "heal": 0.7, "wound": 0.8, "scar": 0.85,
-            "break": 0.75, "fix": 0.7, "trust": 0.8, "betray": 0.85, "promise": 0.75
-        }
-        
-        # Physical symbols (concrete objects that often carry symbolic weight)
-        self.physical_symbols = {
-            "door": 0.7, "window": 0.7, "mirror": 0.8, "knife": 0.85, "gun": 0.9,
-            "fire": 0.8, "water": 0.7, "earth": 0.7, "air": 0.7, "stone": 0.7,
-            "wall": 0.75, "chain": 0.85, "rope": 0.8, "mask": 0.85, "key": 0.8,
-            "lock": 0.8, "box": 0.7, "gift": 0.7, "throne": 0.8, "crown": 0.8,
-            "sword": 0.8, "shield": 0.75, "bridge": 0.7, "path": 0.7, "road": 0.7,
-            "star": 0.75, "sun": 0.75, "moon": 0.75, "eye": 0.8, "hand": 0.7,
-            "heart": 0.8, "head": 0.7, "body": 0.7, "flesh": 0.8, "bone": 0.75,
-            "blood": 0.8, "tear": 0.8, "rose": 0.75, "flower": 0.7, "tree": 0.7,
-            "forest": 0.75, "mountain": 0.7, "sea": 0.75, "river": 0.7, "island": 0.7
-        }
-        
-        # Abstract concept symbols (abstract ideas that often represent other things)
-        self.abstract_symbols = {
-            "time": 0.7, "memory": 0.8, "dream": 0.8, "nightmare": 0.85, "hope": 0.75,
-            "despair": 0.85, "fate": 0.8, "destiny": 0.8, "chance": 0.7, "luck": 0.7,
-            "justice": 0.75, "mercy": 0.75, "vengeance": 0.8, "revenge": 0.8, "forgiveness": 0.75,
-            "sin": 0.85, "virtue": 0.75, "innocence": 0.8, "guilt": 0.8, "shame": 0.85,
-            "honor": 0.75, "pride": 0.75, "humility": 0.7, "courage": 0.75, "fear": 0.8,
-            "love": 0.8, "hate": 0.85, "passion": 0.75, "desire": 0.8, "lust": 0.85,
-            "greed": 0.8, "envy": 0.8, "wrath": 0.85, "sloth": 0.7, "gluttony": 0.75,
-            "wisdom": 0.7, "knowledge": 0.7, "truth": 0.8, "lie": 0.8, "reality": 0.75
-        }
+        """Load the symbol lexicon and define grooming language markers."""
+        # Emotional, physical and abstract symbol banks, compiled for lemma-hash lookup
+        self.symbol_lexicon = SymbolLexicon.load(self.symbol_lexicon_path, self.language)
         
         # Grooming language patterns (phrases often used in grooming scenarios)
         self.grooming_patterns = [
@@ -86,21 +72,67 @@ class SymbolicDensityAnalyzer:
             r"you wanted this", r"you deserve this", r"you need to be punished", r"teach you a lesson"
         ]
         
-        # Combine all symbols
-        self.all_symbols = {}
-        self.all_symbols.update(self.emotional_symbols)
-        self.all_symbols.update(self.physical_symbols)
-        self.all_symbols.update(self.abstract_symbols)
+        # Compile grooming patterns into one automaton
+        self._build_grooming_matcher(self.grooming_patterns)
+    
+    def _build_grooming_matcher(self, patterns: List[str]):
+        """
+        Build the grooming phrase automaton and swap it in.
+        
+        Args:
+            patterns: Literal grooming phrases (matched case-insensitively)
+        """
+        # Drop duplicates, keeping the first occurrence
+        patterns = list(dict.fromkeys(pattern.lower() for pattern in patterns if pattern))
+        
+        # A single attribute assignment, so concurrent analyses see either lexicon
+        self.grooming_matcher = AhoCorasick(patterns)
+        self.grooming_lexicon_version = hashlib.sha256("\n".join(patterns).encode("utf-8")).hexdigest()[:16]
+        logger.info(f"Grooming matcher built with {len(patterns)} phrases")
+    
+    def reload_grooming_lexicon(self):
+        """
+        Load the external grooming phrase file on top of the built-in phrases.
+        
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = self.grooming_lexicon_path
+        mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            phrases = [line.split("#", 1)[0].strip() for line in f]
+        
+        self._build_grooming_matcher(self.grooming_patterns + [phrase for phrase in phrases if phrase])
+        self._grooming_lexicon_mtime = mtime
+    
+    def _reload_if_changed(self):
+        """Reload the external grooming phrase file if it was modified."""
+        if not self.grooming_lexicon_path:
+            return
+        try:
+            if os.path.getmtime(self.grooming_lexicon_path) != self._grooming_lexicon_mtime:
+                self.reload_grooming_lexicon()
+        except OSError as e:
+            logger.warning(f"Could not reload grooming lexicon: {e}")
+    
+    def cache_token(self) -> str:
+        """
+        Identify the current lexicon, for result cache keys.
         
-        # Compile grooming patterns
-        self.compiled_grooming_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.grooming_patterns]
+        Returns:
+            Version string of the lexicons in use
+        """
+        self._reload_if_changed()
+        return f"{self.symbol_lexicon.version_id}|grooming-{self.grooming_lexicon_version}"
     
-    def analyze(self, docs: List[spacy.tokens.Doc]) -> Dict[str, Any]:
+    def analyze(self, docs: List[spacy.tokens.Doc], 
+                features: Optional[List[DocFeatures]] = None) -> Dict[str, Any]:
         """
         Analyze documents for symbolic density patterns.
         
         Args:
             docs: List of spaCy Doc objects
+            features: Token features of ``docs`` (extracted if not given)
             
         Returns:
             Dictionary containing analysis results
@@ -121,23 +153,27 @@ class SymbolicDensityAnalyzer:
         symbol_density = []
         segment_symbols = []
         
-        for i, doc in enumerate(docs):
-            # Count symbols and their weights
-            symbols_found = self._extract_symbols(doc)
-            
-            # Calculate density (weighted sum of symbols / total words)
-            total_words = len([token for token in doc if not token.is_punct and not token.is_space])
-            total_weight = sum(weight for _, weight in symbols_found)
-            
-            density = total_weight / max(1, total_words)
-            symbol_density.append(density)
-            
-            # Store symbols found in this segment
-            segment_symbols.append({
-                "segment_index": i,
-                "symbols": [symbol for symbol, _ in symbols_found],
-                "density": density
-            })
+        lexicon = self.symbol_lexicon
+        with timer("symbolic.lookup"):
+            for i, doc_features in enumerate(ensure_features(docs, features)):
+                # Look up all lemmas at once
+                entries, total_words = self._symbol_entries(doc_features)
+                
+                # Calculate density (weighted sum of symbols / total words), summed
+                # in token order so results do not depend on NumPy's summation order
+                total_weight = sum(lexicon.weights[entries].tolist())
+                
+                density = total_weight / max(1, total_words)
+                symbol_density.append(density)
+                
+                # Store symbols found in this segment
+                segment_symbols.append({
+                    "segment_index": i,
+                    "symbols": [lexicon.lemmas[e] for e in entries],
+                    "entries": entries,
+                    "density": density
+                })
+        count("symbols", sum(len(segment["entries"]) for segment in segment_symbols))
         
         # Find emotional blackholes (segments with very high symbolic density)
         density_threshold = np.percentile(symbol_density, 90) if len(symbol_density) > 1 else 0
@@ -148,10 +184,13 @@ class SymbolicDensityAnalyzer:
         ]
         
         # Find symbol clusters (segments with many related symbols)
-        symbol_clusters = self._find_symbol_clusters(segment_symbols)
+        with timer("symbolic.clusters"):
+            symbol_clusters = self._find_symbol_clusters(segment_symbols)
         
         # Detect grooming language patterns
-        grooming_patterns = self._detect_grooming_patterns(docs)
+        with timer("symbolic.grooming"):
+            grooming_patterns = self._detect_grooming_patterns(docs)
+        count("grooming_matches", len(grooming_patterns))
         
         # Get top symbols across all segments
         all_symbols = [symbol for segment in segment_symbols for symbol in segment["symbols"]]
@@ -172,6 +211,20 @@ class SymbolicDensityAnalyzer:
             "grooming_patterns": grooming_patterns
         }
     
+    def _symbol_entries(self, features: DocFeatures) -> Tuple[np.ndarray, int]:
+        """
+        Find the lexicon entries of a document's words in one vectorized pass.
+        
+        Args:
+            features: Token features of a document
+            
+        Returns:
+            Tuple (lexicon entry index of each symbol in token order, number of
+            words excluding punctuation and whitespace)
+        """
+        entries = self.symbol_lexicon.lookup(features.lemma_lower[features.is_word])
+        return entries[entries >= 0], features.num_words
+    
     def _extract_symbols(self, doc: spacy.tokens.Doc) -> List[Tuple[str, float]]:
         """
         Extract symbolic language from a document.
@@ -182,19 +235,9 @@ class SymbolicDensityAnalyzer:
         Returns:
             List of tuples (symbol, weight)
         """
-        symbols_found = []
-        
-        # Check individual tokens
-        for token in doc:
-            if token.is_punct or token.is_space:
-                continue
-            
-            # Check if lemma is in symbol bank
-            lemma = token.lemma_.lower()
-            if lemma in self.all_symbols:
-                symbols_found.append((lemma, self.all_symbols[lemma]))
-        
-        return symbols_found
+        entries, _ = self._symbol_entries(DocFeatures(doc))
+        lexicon = self.symbol_lexicon
+        return [(lexicon.lemmas[e], float(lexicon.weights[e])) for e in entries]
     
     def _find_symbol_clusters(self, segment_symbols: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -207,40 +250,25 @@ class SymbolicDensityAnalyzer:
             List of symbol clusters
         """
         clusters = []
+        lexicon = self.symbol_lexicon
         
         for segment in segment_symbols:
             # Skip segments with few symbols
-            if len(segment["symbols"]) < 3:
+            entries = segment["entries"]
+            if len(entries) < 3:
                 continue
             
-            # Group symbols by type
-            emotional = [s for s in segment["symbols"] if s in self.emotional_symbols]
-            physical = [s for s in segment["symbols"] if s in self.physical_symbols]
-            abstract = [s for s in segment["symbols"] if s in self.abstract_symbols]
+            # Group symbols by category (a symbol may belong to several)
+            membership = lexicon.category_mask[entries]
+            counts = membership.sum(axis=0)
             
             # Check if we have a cluster in any category (at least 3 symbols)
-            if len(emotional) >= 3:
-                clusters.append({
-                    "segment_index": segment["segment_index"],
-                    "cluster_type": "emotional",
-                    "symbols": emotional,
-                    "count": len(emotional)
-                })
-            
-            if len(physical) >= 3:
-                clusters.append({
-                    "segment_index": segment["segment_index"],
-                    "cluster_type": "physical",
-                    "symbols": physical,
-                    "count": len(physical)
-                })
-            
-            if len(abstract) >= 3:
+            for c in np.flatnonzero(counts >= 3):
                 clusters.append({
                     "segment_index": segment["segment_index"],
-                    "cluster_type": "abstract",
-                    "symbols": abstract,
-                    "count": len(abstract)
+                    "cluster_type": lexicon.categories[c],
+                    "symbols": [lexicon.lemmas[e] for e in entries[membership[:, c]]],
+                    "count": int(counts[c])
                 })
         
         return clusters
@@ -255,21 +283,23 @@ class SymbolicDensityAnalyzer:
         Returns:
             List of detected grooming patterns
         """
+        self._reload_if_changed()
+        matcher = self.grooming_matcher
         grooming_detected = []
         
         for i, doc in enumerate(docs):
-            matches = []
             text = doc.text.lower()
             
-            # Check for grooming patterns
-            for j, pattern in enumerate(self.compiled_grooming_patterns):
-                for match in pattern.finditer(text):
-                    matches.append({
-                        "pattern": self.grooming_patterns[j],
-                        "text": match.group(0),
-                        "start": match.start(),
-                        "end": match.end()
-                    })
+            # All phrases are matched in one pass over the text
+            matches = [
+                {
+                    "pattern": matcher.patterns[pattern_id],
+                    "text": text[start:end],
+                    "start": start,
+                    "end": end
+                }
+                for pattern_id, start, end in matcher.find_all(text)
+            ]
             
             if matches:
                 grooming_detected.append({
@@ -0,0 +1,105 @@
+"""
+Aho-Corasick multi-pattern matching for the Field Distortion Engine.
+
+This module builds a single automaton over a list of literal phrases and
+finds every occurrence of every phrase in one pass over a text, so matching
+cost does not grow with the number of phrases.
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over literal string patterns.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        """
+        Build the automaton.
+
+        Args:
+            patterns: Literal patterns; a pattern's id is its index
+        """
+        self.patterns = list(patterns)
+
+        # Trie: transitions, failure links and the ids of patterns ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (pattern_id,)
+
+        # Breadth-first pass: failure links, and outputs inherited along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] += self._output[fail]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str):
+        """
+        Find all occurrences of all patterns, including overlapping ones.
+
+        Args:
+            text: Text to search
+
+        Yields:
+            Tuples (pattern id, start, end) in order of end position
+        """
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for pattern_id in output[state]:
+                    yield pattern_id, end - len(patterns[pattern_id]), end
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find the non-overlapping occurrences of each pattern.
+
+        Occurrences of the same pattern are taken left to right without
+        overlap (as ``re.finditer`` does for a literal pattern); occurrences of
+        different patterns may overlap.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            List of (pattern id, start, end), sorted by pattern id and start
+        """
+        last_end = {}
+        matches = []
+        for pattern_id, start, end in self.iter_matches(text):
+            if start >= last_end.get(pattern_id, 0):
+                matches.append((pattern_id, start, end))
+                last_end[pattern_id] = end
+
+        matches.sort()
+        return matches
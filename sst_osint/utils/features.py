@@ -0,0 +1,124 @@
+"""
+Shared token features for the Field Distortion Engine.
+
+This module extracts the token attributes the analyzers need from each Doc
+in a single ``doc.to_array`` call, so every analyzer works on the same NumPy
+arrays instead of iterating over the tokens again.
+"""
+
+import numpy as np
+from typing import Iterable, List, Optional
+
+import spacy
+from spacy.attrs import LEMMA, DEP, IS_PUNCT, IS_SPACE, LOWER
+from spacy.strings import hash_string
+
+FEATURE_ATTRS = [LEMMA, DEP, IS_PUNCT, IS_SPACE, LOWER]
+
+class DocFeatures:
+    """
+    Token attribute arrays of one Doc.
+
+    Attributes:
+        lemma: Lemma hash per token
+        lemma_lower: Lowercase lemma hash per token (for matching word lists)
+        dep: Dependency label hash per token
+        lower: Lowercase text hash per token
+        is_word: True for tokens that are neither punctuation nor whitespace
+        num_tokens: Number of tokens
+        num_words: Number of word tokens
+    """
+
+    __slots__ = ("lemma", "lemma_lower", "dep", "lower", "is_word", "num_tokens", "num_words")
+
+    def __init__(self, doc: spacy.tokens.Doc):
+        """
+        Extract the features of a Doc.
+
+        Args:
+            doc: spaCy Doc object
+        """
+        array = doc.to_array(FEATURE_ATTRS).reshape(len(doc), len(FEATURE_ATTRS))
+        self.lemma = array[:, 0]
+        self.lemma_lower = lowercase_hashes(self.lemma, doc.vocab.strings)
+        self.dep = array[:, 1]
+        self.lower = array[:, 4]
+        self.is_word = (array[:, 2] == 0) & (array[:, 3] == 0)
+        self.num_tokens = len(doc)
+        self.num_words = int(self.is_word.sum())
+
+def lowercase_hashes(hashes: np.ndarray, strings: spacy.strings.StringStore) -> np.ndarray:
+    """
+    Map string hashes to the hashes of the lowercased strings.
+
+    Each distinct string is lowercased once, so the cost grows with the
+    vocabulary of a Doc rather than its length.
+
+    Args:
+        hashes: Array of string hashes
+        strings: String store the hashes come from
+
+    Returns:
+        Array of lowercase string hashes (unknown hashes are kept)
+    """
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    lowered = np.array([hash_string(strings[int(h)].lower()) if int(h) in strings else int(h)
+                        for h in unique], dtype=np.uint64)
+    return lowered[inverse].reshape(np.shape(hashes))
+
+def extract_features(docs: Iterable[spacy.tokens.Doc]) -> List[DocFeatures]:
+    """
+    Extract the token features of several Docs.
+
+    Args:
+        docs: spaCy Doc objects
+
+    Returns:
+        List of DocFeatures, one per Doc
+    """
+    return [DocFeatures(doc) for doc in docs]
+
+def ensure_features(docs: List[spacy.tokens.Doc],
+                    features: Optional[List[DocFeatures]] = None) -> List[DocFeatures]:
+    """
+    Return the given features, or extract them if the caller had none.
+
+    Args:
+        docs: spaCy Doc objects
+        features: Features already extracted for ``docs``
+
+    Returns:
+        List of DocFeatures, one per Doc
+    """
+    return features if features is not None else extract_features(docs)
+
+def word_hashes(words: Iterable[str]) -> np.ndarray:
+    """
+    Hash lowercase words, for matching against ``DocFeatures.lemma_lower``.
+
+    Args:
+        words: Words (lowercased before hashing)
+
+    Returns:
+        Sorted array of unique string hashes
+    """
+    hashes = {hash_string(word.lower()) for word in words}
+    return np.array(sorted(hashes), dtype=np.uint64)
+
+def counts_in_order(values: np.ndarray) -> np.ndarray:
+    """
+    Count the distinct values of an array, in order of first occurrence.
+
+    This is the order of ``collections.Counter(values).values()``, which keeps
+    downstream floating-point sums identical to a Counter-based computation.
+
+    Args:
+        values: Array of hashable values (e.g. string hashes)
+
+    Returns:
+        Array of counts
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    _, first, counts = np.unique(values, return_index=True, return_counts=True)
+    return counts[np.argsort(first, kind="stable")]
@@ -0,0 +1,424 @@
+"""
+Timing, counting and profiling instrumentation for the Field Distortion Engine.
+
+Analysis stages wrap their work in ``timer(name)`` and report sizes with
+``count(name, value)``. Measurements go to the Recorder of the analysis in
+progress (returned in the results as the ``timings`` block) and to the
+process-wide ``METRICS`` registry, which renders cumulative totals in the
+Prometheus text exposition format. When ``FDE_METRICS_DIR`` names a directory
+shared by several processes (web workers, job workers), every process writes
+its totals there and the registry renders the sum over all of them.
+``profile()`` optionally captures a cProfile or pyinstrument report around a
+block of code.
+"""
+
+import io
+import os
+import glob
+import json
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+class Recorder:
+    """
+    Timings and counters of one analysis.
+
+    Repeated timers and counters with the same name accumulate. A Recorder may
+    be shared by analyzers running on several threads.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.timers: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name: str, seconds: float):
+        """
+        Add time to a timer.
+
+        Args:
+            name: Timer name
+            seconds: Elapsed time in seconds
+        """
+        with self._lock:
+            self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def add_count(self, name: str, value: int = 1):
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def merge(self, recorded: Dict[str, Dict]):
+        """
+        Add the measurements of another recorder (e.g. from a worker process).
+
+        Args:
+            recorded: Output of another recorder's ``as_dict``
+        """
+        for name, seconds in recorded.get("timers", {}).items():
+            self.add_time(name, seconds)
+        for name, value in recorded.get("counters", {}).items():
+            self.add_count(name, value)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """
+        Snapshot the measurements.
+
+        Returns:
+            Dictionary with "timers" (seconds) and "counters"
+        """
+        with self._lock:
+            return {"timers": dict(self.timers), "counters": dict(self.counters)}
+
+class MetricsRegistry:
+    """
+    Process-wide cumulative timers and counters.
+
+    With a shared directory, the registry writes its totals to a file of its
+    own there (at most every ``flush_interval`` seconds after a change) and
+    renders the totals of every file in the directory. Files of processes
+    that exited are kept so totals never decrease; clear the directory when
+    the whole deployment restarts.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        """
+        Initialize an empty registry.
+
+        Args:
+            directory: Directory shared with the registries of other processes
+                (metrics of this process only if None)
+            flush_interval: Longest delay in seconds before a change is written
+                to the shared directory
+        """
+        self._timer_sums: Dict[str, float] = {}
+        self._timer_counts: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._path = None
+        self._flush_timer = None
+
+    def observe(self, name: str, seconds: float):
+        """
+        Record one timed run of a stage.
+
+        Args:
+            name: Timer name
+            seconds: Elapsed time in seconds
+        """
+        with self._lock:
+            self._timer_sums[name] = self._timer_sums.get(name, 0.0) + seconds
+            self._timer_counts[name] = self._timer_counts.get(name, 0) + 1
+        self._schedule_flush()
+
+    def increment(self, name: str, value: int = 1):
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + int(value)
+        self._schedule_flush()
+
+    def reset(self):
+        """Clear the metrics of this process."""
+        with self._lock:
+            self._timer_sums.clear()
+            self._timer_counts.clear()
+            self._counters.clear()
+        self.flush()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Copy the metrics of this process.
+
+        Returns:
+            Dictionary with "timer_sums", "timer_counts" and "counters"
+        """
+        with self._lock:
+            return {
+                "timer_sums": dict(self._timer_sums),
+                "timer_counts": dict(self._timer_counts),
+                "counters": dict(self._counters)
+            }
+
+    def flush(self):
+        """Write the metrics of this process to the shared directory, if any."""
+        if not self.directory:
+            return
+        with self._lock:
+            self._flush_timer = None
+            # A process forked from this one (e.g. a web worker) needs a file of its own
+            if self._path is None or self._path[0] != os.getpid():
+                self._path = (os.getpid(), os.path.join(self.directory, 
+                                                        f"metrics-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"))
+        snapshot = self.snapshot()
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path[1]
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(temporary, path)
+
+    def _after_fork(self):
+        """Start a forked child with its own lock and, when shared, its own totals."""
+        self._lock = threading.Lock()
+        self._flush_timer = None
+        if self.directory:
+            # The parent's totals are already counted in the parent's file
+            self._timer_sums.clear()
+            self._timer_counts.clear()
+            self._counters.clear()
+
+    def _schedule_flush(self):
+        """Write the metrics to the shared directory shortly, batching changes."""
+        if not self.directory:
+            return
+        with self._lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(self.flush_interval, self._flush_quietly)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_quietly(self):
+        """Flush from the background timer, logging instead of raising."""
+        try:
+            self.flush()
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.directory}: {e}")
+
+    def aggregate(self) -> Dict[str, Dict]:
+        """
+        Sum the metrics of all processes sharing the directory.
+
+        Returns:
+            Snapshot (see ``snapshot``) of the totals; this process only if
+            there is no shared directory
+        """
+        if not self.directory:
+            return self.snapshot()
+
+        self.flush()
+        totals = {"timer_sums": {}, "timer_counts": {}, "counters": {}}
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics file {path}: {e}")
+                continue
+            for kind, total in totals.items():
+                for name, value in snapshot.get(kind, {}).items():
+                    total[name] = total.get(name, 0) + value
+        return totals
+
+    def render_prometheus(self, prefix: str = "fde") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Timers become a summary ``<prefix>_stage_seconds`` labelled by stage,
+        and counters become ``<prefix>_items_total`` labelled by item. The
+        totals cover every process sharing the directory (see ``aggregate``).
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Metrics text
+        """
+        totals = self.aggregate()
+        sums = totals["timer_sums"]
+        counts = totals["timer_counts"]
+        counters = totals["counters"]
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent in each analysis stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name in sorted(sums):
+            label = _escape_label(name)
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{label}"}} {sums[name]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{label}"}} {counts[name]}')
+
+        lines.append(f"# HELP {prefix}_items_total Items processed by the analysis stages.")
+        lines.append(f"# TYPE {prefix}_items_total counter")
+        for name in sorted(counters):
+            lines.append(f'{prefix}_items_total{{item="{_escape_label(name)}"}} {counters[name]}')
+
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry(os.environ.get("FDE_METRICS_DIR") or None)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=METRICS._after_fork)
+
+_current_recorder: contextvars.ContextVar = contextvars.ContextVar("fde_recorder", default=None)
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def current_recorder() -> Optional[Recorder]:
+    """Return the recorder of the analysis in progress, if any."""
+    return _current_recorder.get()
+
+@contextmanager
+def recording(recorder: Optional[Recorder] = None):
+    """
+    Make a recorder current for the duration of a block.
+
+    If a recorder is already current and none is given, the block records
+    into it, so nested stages add up in the outermost analysis.
+
+    Args:
+        recorder: Recorder to use (a new one if None)
+
+    Yields:
+        The current recorder
+    """
+    recorder = recorder or _current_recorder.get() or Recorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+@contextmanager
+def timer(name: str):
+    """
+    Time a block as the stage ``name``.
+
+    Args:
+        name: Stage name, e.g. "parse" or "echo.find_echoes"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        recorder = _current_recorder.get()
+        if recorder is not None:
+            recorder.add_time(name, elapsed)
+        METRICS.observe(name, elapsed)
+
+def count(name: str, value: int = 1):
+    """
+    Add to the counter ``name``.
+
+    Args:
+        name: Counter name, e.g. "segments" or "echoes"
+        value: Amount to add
+    """
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.add_count(name, value)
+    METRICS.increment(name, value)
+
+def merge(recorded: Dict[str, Dict]):
+    """
+    Add measurements taken elsewhere (e.g. in a worker process).
+
+    Each timer is counted as one run in ``METRICS``, unless ``METRICS`` shares
+    a directory with other processes: the other process then reports its
+    totals itself.
+
+    Args:
+        recorded: Output of a recorder's ``as_dict``
+    """
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.merge(recorded)
+    if METRICS.directory:
+        return
+    for name, seconds in recorded.get("timers", {}).items():
+        METRICS.observe(name, seconds)
+    for name, value in recorded.get("counters", {}).items():
+        METRICS.increment(name, value)
+
+class Profile:
+    """
+    Result of a profiling capture.
+
+    Attributes:
+        profiler: Profiler used ("cprofile" or "pyinstrument")
+        report: Text report, filled in when the capture ends
+    """
+
+    def __init__(self, profiler: str):
+        self.profiler = profiler
+        self.report = ""
+
+@contextmanager
+def profile(profiler: Optional[str] = "cprofile", limit: int = 40):
+    """
+    Capture a profile of a block.
+
+    pyinstrument is optional; cProfile is used if it is not installed.
+
+    Args:
+        profiler: "cprofile", "pyinstrument", or None to disable profiling
+        limit: Number of functions in a cProfile report
+
+    Yields:
+        Profile whose ``report`` is set when the block exits, or None if
+        profiling is disabled
+    """
+    if profiler is None:
+        yield None
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profiler}")
+
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("pyinstrument is not installed; profiling with cProfile instead")
+            profiler = "cprofile"
+
+    result = Profile(profiler)
+    if profiler == "pyinstrument":
+        sampler = Profiler()
+        sampler.start()
+        try:
+            yield result
+        finally:
+            sampler.stop()
+            result.report = sampler.output_text()
+        return
+
+    import cProfile
+    import pstats
+
+    tracer = cProfile.Profile()
+    tracer.enable()
+    try:
+        yield result
+    finally:
+        tracer.disable()
+        stream = io.StringIO()
+        pstats.Stats(tracer, stream=stream).sort_stats("cumulative").print_stats(limit)
+        result.report = stream.getvalue()
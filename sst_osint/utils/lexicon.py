@@ -0,0 +1,143 @@
+"""
+Compiled word lexicons for the Field Distortion Engine.
+
+Lexicons are versioned JSON files under ``sst_osint/data/lexicons`` named
+``<name>.<language>.v<version>.json``. At load time a lexicon is compiled into
+NumPy arrays keyed by spaCy string hash, so a whole Doc can be looked up at
+once from ``doc.to_array`` instead of token by token.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import numpy as np
+from typing import Dict, List, Optional
+
+from spacy.strings import hash_string
+
+logger = logging.getLogger(__name__)
+
+LEXICON_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "lexicons")
+
+def find_lexicon(name: str, language: str = "en", version: Optional[int] = None) -> str:
+    """
+    Locate a bundled lexicon file.
+
+    Args:
+        name: Lexicon name (e.g. "symbols")
+        language: Language code
+        version: Lexicon version (the latest available if None)
+
+    Returns:
+        Path to the lexicon file
+
+    Raises:
+        FileNotFoundError: If no matching lexicon exists
+    """
+    if version is not None:
+        path = os.path.join(LEXICON_DIR, f"{name}.{language}.v{version}.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No {name} lexicon for {language} version {version}")
+        return path
+
+    pattern = re.compile(rf"^{re.escape(name)}\.{re.escape(language)}\.v(\d+)\.json$")
+    versions = {}
+    for filename in os.listdir(LEXICON_DIR):
+        match = pattern.match(filename)
+        if match:
+            versions[int(match.group(1))] = filename
+
+    if not versions:
+        raise FileNotFoundError(f"No {name} lexicon for language {language}")
+    return os.path.join(LEXICON_DIR, versions[max(versions)])
+
+class SymbolLexicon:
+    """
+    Weighted, categorized word lexicon compiled to lemma-hash lookup arrays.
+
+    Entries are matched on lowercase lemmas, by hash: look up
+    ``DocFeatures.lemma_lower`` rather than the lemma hashes themselves.
+    """
+
+    def __init__(self, data: Dict, source: str = "<memory>"):
+        """
+        Compile a lexicon.
+
+        Args:
+            data: Lexicon document with "categories" mapping each category
+                name to {lemma: weight}; a lemma listed in several categories
+                takes the weight of the last one
+            source: Where the lexicon came from (for logging)
+        """
+        self.name = data.get("name", "lexicon")
+        self.language = data.get("language", "en")
+        self.version = data.get("version", 0)
+        self.source = source
+        self.digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+        self.categories: List[str] = list(data["categories"])
+        weights: Dict[str, float] = {}
+        members: Dict[str, set] = {}
+        for category, entries in data["categories"].items():
+            for lemma, weight in entries.items():
+                lemma = lemma.lower()
+                weights[lemma] = float(weight)
+                members.setdefault(lemma, set()).add(category)
+
+        # Entry arrays: lemma, weight and category membership per entry
+        self.lemmas: List[str] = list(weights)
+        self.weights = np.array([weights[lemma] for lemma in self.lemmas], dtype=np.float64)
+        self.category_mask = np.array(
+            [[category in members[lemma] for category in self.categories] for lemma in self.lemmas],
+            dtype=bool
+        ).reshape(len(self.lemmas), len(self.categories))
+
+        # Lookup arrays: sorted lemma hashes and the entry each belongs to
+        hashes = np.array([hash_string(lemma) for lemma in self.lemmas], dtype=np.uint64)
+        order = np.argsort(hashes)
+        self.hashes = hashes[order]
+        self.entry_index = np.arange(len(self.lemmas), dtype=np.int64)[order]
+
+        logger.info(f"Compiled {self.name} lexicon ({self.language} v{self.version}): "
+                    f"{len(self.lemmas)} entries in {len(self.categories)} categories")
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, language: str = "en") -> "SymbolLexicon":
+        """
+        Load and compile a symbol lexicon.
+
+        Args:
+            path: Lexicon file (the latest bundled symbol lexicon if None)
+            language: Language of the bundled lexicon to use
+
+        Returns:
+            Compiled lexicon
+        """
+        path = path or find_lexicon("symbols", language)
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), source=path)
+
+    @property
+    def version_id(self) -> str:
+        """Identifier of the lexicon contents, for cache keys."""
+        return f"{self.name}.{self.language}.v{self.version}-{self.digest}"
+
+    def lookup(self, lemma_hashes: np.ndarray) -> np.ndarray:
+        """
+        Look up lowercase lemma hashes.
+
+        Args:
+            lemma_hashes: Array of lowercase lemma hashes (``DocFeatures.lemma_lower``)
+
+        Returns:
+            Entry index per hash, -1 where the lemma is not in the lexicon
+        """
+        lemma_hashes = np.asarray(lemma_hashes, dtype=np.uint64)
+        if len(self.hashes) == 0 or len(lemma_hashes) == 0:
+            return np.full(len(lemma_hashes), -1, dtype=np.int64)
+
+        positions = np.minimum(np.searchsorted(self.hashes, lemma_hashes), len(self.hashes) - 1)
+        found = self.hashes[positions] == lemma_hashes
+        return np.where(found, self.entry_index[positions], -1)
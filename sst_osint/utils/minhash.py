@@ -0,0 +1,110 @@
+"""
+MinHash and locality-sensitive hashing for the Field Distortion Engine.
+
+This module estimates the Jaccard similarity of shingle sets with MinHash
+signatures and proposes candidate pairs of similar sets by banding the
+signatures into buckets, so near-duplicates can be found without comparing
+every pair.
+"""
+
+import numpy as np
+from typing import List, Tuple
+
+# Rows of shingle hashes permuted at once (bounds the temporary matrix size)
+_CHUNK_ROWS = 4096
+
+def minhash_signatures(shingle_sets: List[np.ndarray], num_perm: int = 128,
+                       seed: int = 0) -> np.ndarray:
+    """
+    Compute MinHash signatures of hashed shingle sets.
+
+    Each permutation is a random affine map modulo 2**64 whose high 32 bits
+    are kept, applied to all shingles of all sets in chunks.
+
+    Args:
+        shingle_sets: One array of uint64 shingle hashes per set
+        num_perm: Number of hash permutations (signature length)
+        seed: Seed for the permutation parameters
+
+    Returns:
+        Array of shape (len(shingle_sets), num_perm); empty sets get the
+        maximum value in every position
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint64).max, dtype=np.uint64)
+    sizes = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+    if sizes.sum() == 0:
+        return signatures
+
+    shingles = np.concatenate(shingle_sets).astype(np.uint64)
+    owners = np.repeat(np.arange(len(shingle_sets)), sizes)
+
+    with np.errstate(over="ignore"):
+        for start in range(0, len(shingles), _CHUNK_ROWS):
+            chunk = shingles[start:start + _CHUNK_ROWS]
+            permuted = (chunk[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)
+
+            # Shingles are grouped by set, so each set is a contiguous run
+            chunk_owners = owners[start:start + _CHUNK_ROWS]
+            runs = np.flatnonzero(np.r_[True, chunk_owners[1:] != chunk_owners[:-1]])
+            run_owners = chunk_owners[runs]
+            signatures[run_owners] = np.minimum(signatures[run_owners],
+                                                np.minimum.reduceat(permuted, runs, axis=0))
+
+    return signatures
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int = 32,
+                        max_bucket_size: int = 200) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Propose candidate pairs whose signatures agree on at least one band.
+
+    With ``r = num_perm // bands`` rows per band, a pair with Jaccard
+    similarity ``s`` becomes a candidate with probability
+    ``1 - (1 - s**r)**bands``; more bands raise recall, fewer raise speed.
+
+    Args:
+        signatures: MinHash signatures, one row per set
+        bands: Number of bands
+        max_bucket_size: Buckets larger than this are skipped, so a few very
+            common sets cannot make the output quadratic
+
+    Returns:
+        Tuple (rows, cols) of candidate pair indices with rows < cols
+    """
+    num_sets, num_perm = signatures.shape
+    rows_per_band = max(1, num_perm // bands)
+
+    # Sets with no shingles have the all-maximum signature and match nothing
+    valid = np.flatnonzero(signatures[:, 0] != np.iinfo(np.uint64).max)
+
+    pair_keys = []
+    with np.errstate(over="ignore"):
+        for band in range(min(bands, num_perm // rows_per_band)):
+            block = signatures[valid, band * rows_per_band:(band + 1) * rows_per_band]
+
+            # Collapse the band to one bucket key per set
+            keys = np.zeros(len(valid), dtype=np.uint64)
+            for column in range(block.shape[1]):
+                keys = keys * np.uint64(0x100000001B3) + block[:, column]
+
+            order = np.argsort(keys, kind="stable")
+            starts = np.flatnonzero(np.r_[True, np.diff(keys[order]) != 0])
+            sizes = np.diff(np.r_[starts, len(order)])
+
+            # Only buckets holding at least two sets produce pairs
+            for start, size in zip(starts[sizes >= 2], sizes[sizes >= 2]):
+                if size > max_bucket_size:
+                    continue
+                members = np.sort(valid[order[start:start + size]])
+                i, j = np.triu_indices(len(members), k=1)
+                pair_keys.append(members[i].astype(np.int64) * num_sets + members[j])
+
+    if not pair_keys:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    pair_keys = np.unique(np.concatenate(pair_keys))
+    return pair_keys // num_sets, pair_keys % num_sets
@@ -0,0 +1,191 @@
+"""
+Offline sentiment scoring for the Field Distortion Engine.
+
+A sentiment backend scores a batch of segments from their token features in
+one call, returning one valence in [-1, 1] per segment. The bundled backend
+is lexicon-based: a versioned valence lexicon compiled to lemma-hash arrays,
+with negation and intensifier handling, so it needs no model download and
+scores a whole corpus with a few array operations. Other backends (e.g. a
+small local model) can be registered in ``SENTIMENT_BACKENDS`` or passed as
+objects with the same ``score`` method.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Any, List, Optional, Union
+
+from spacy.strings import hash_string
+
+from .lexicon import SymbolLexicon, find_lexicon
+from .features import DocFeatures
+
+logger = logging.getLogger(__name__)
+
+class SentimentBackend(ABC):
+    """
+    Interface of sentiment backends.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def score(self, features: List[DocFeatures]) -> np.ndarray:
+        """
+        Score segments.
+
+        Args:
+            features: Token features of the segments
+
+        Returns:
+            Array of valences in [-1, 1], one per segment
+        """
+
+    @property
+    def version_id(self) -> str:
+        """Identifier of the backend and its data, for cache keys."""
+        return self.name
+
+class LexiconSentiment(SentimentBackend):
+    """
+    Lexicon-based sentiment backend.
+
+    Each token's valence is looked up by lemma, scaled by an intensifier
+    directly before it and flipped and dampened when a negator occurs within
+    ``negation_window`` tokens before it. A segment's summed valence ``v`` is
+    normalized to ``v / sqrt(v**2 + normalization)``.
+    """
+
+    name = "lexicon"
+
+    # Factor applied to the valence of negated words ("not good" is mildly negative)
+    NEGATION_SCALE = -0.74
+
+    def __init__(self, lexicon_path: Optional[str] = None, language: str = "en",
+                 negation_window: int = 3, normalization: float = 1.0):
+        """
+        Load and compile the sentiment lexicon.
+
+        Args:
+            lexicon_path: Lexicon file (the latest bundled sentiment lexicon if None)
+            language: Language of the bundled lexicon to use
+            negation_window: Number of tokens after a negator that it negates
+            normalization: Smoothing constant of the score normalization
+        """
+        path = lexicon_path or find_lexicon("sentiment", language)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.lexicon = SymbolLexicon(data, source=path)
+        self.negation_window = negation_window
+        self.normalization = normalization
+
+        # Negators and intensifiers are matched on lowercase token text
+        self._negator_hashes = np.array(sorted({hash_string(word.lower())
+                                                for word in data.get("negators", [])}),
+                                        dtype=np.uint64)
+        intensifiers = {hash_string(word.lower()): float(factor)
+                        for word, factor in data.get("intensifiers", {}).items()}
+        self._intensifier_hashes = np.array(sorted(intensifiers), dtype=np.uint64)
+        self._intensifier_factors = np.array([intensifiers[h] for h in sorted(intensifiers)],
+                                             dtype=np.float64)
+
+    @property
+    def version_id(self) -> str:
+        """Identifier of the lexicon and scoring parameters, for cache keys."""
+        return f"{self.lexicon.version_id}-w{self.negation_window}-n{self.normalization:g}"
+
+    def _intensity(self, lower: np.ndarray) -> np.ndarray:
+        """Return the intensifier factor of each token (1.0 for other tokens)."""
+        factors = np.ones(len(lower), dtype=np.float64)
+        if len(self._intensifier_hashes) == 0 or len(lower) == 0:
+            return factors
+        positions = np.minimum(np.searchsorted(self._intensifier_hashes, lower),
+                               len(self._intensifier_hashes) - 1)
+        found = self._intensifier_hashes[positions] == lower
+        factors[found] = self._intensifier_factors[positions[found]]
+        return factors
+
+    def token_valences(self, features: List[DocFeatures]) -> np.ndarray:
+        """
+        Calculate the valence of every token of several segments.
+
+        Args:
+            features: Token features of the segments
+
+        Returns:
+            Valence per token of the concatenated segments
+        """
+        if not features:
+            return np.zeros(0, dtype=np.float64)
+
+        lemma = np.concatenate([f.lemma_lower for f in features])
+        lower = np.concatenate([f.lower for f in features])
+        segment_ids = np.repeat(np.arange(len(features)),
+                                np.array([f.num_tokens for f in features], dtype=np.int64))
+
+        entries = self.lexicon.lookup(lemma)
+        valence = np.where(entries >= 0, self.lexicon.weights[np.maximum(entries, 0)], 0.0)
+        if not valence.any():
+            return valence
+
+        # Intensifier directly before a word, within the same segment
+        same_segment = np.zeros(len(lower), dtype=bool)
+        same_segment[1:] = segment_ids[1:] == segment_ids[:-1]
+        intensity = self._intensity(lower)
+        valence[1:] *= np.where(same_segment[1:], intensity[:-1], 1.0)
+
+        # Position of the last negator before each token, within the same segment
+        positions = np.arange(len(lower))
+        negator_positions = np.where(np.isin(lower, self._negator_hashes), positions, -1)
+        last_negator = np.empty(len(lower), dtype=np.int64)
+        last_negator[0] = -1
+        last_negator[1:] = np.maximum.accumulate(negator_positions)[:-1]
+        negated = (last_negator >= 0) & (positions - last_negator <= self.negation_window)
+        negated &= segment_ids[np.maximum(last_negator, 0)] == segment_ids
+        negated &= valence != 0
+
+        return np.where(negated, valence * self.NEGATION_SCALE, valence)
+
+    def score(self, features: List[DocFeatures]) -> np.ndarray:
+        """
+        Score segments.
+
+        Args:
+            features: Token features of the segments
+
+        Returns:
+            Array of valences in [-1, 1], one per segment
+        """
+        valence = self.token_valences(features)
+        segment_ids = np.repeat(np.arange(len(features)),
+                                np.array([f.num_tokens for f in features], dtype=np.int64))
+        totals = np.bincount(segment_ids, weights=valence, minlength=len(features))
+        return totals / np.sqrt(totals ** 2 + self.normalization)
+
+# Sentiment backends by name
+SENTIMENT_BACKENDS = {
+    "lexicon": LexiconSentiment,
+}
+
+def create_sentiment_backend(backend: Union[str, Any, None] = "lexicon",
+                             **options) -> Optional[SentimentBackend]:
+    """
+    Create a sentiment backend.
+
+    Args:
+        backend: Name of a registered backend, an object with a ``score``
+            method (returned as is), or None/"none" to disable sentiment
+        options: Keyword arguments for a registered backend
+
+    Returns:
+        Sentiment backend, or None if disabled
+    """
+    if backend is None or backend == "none":
+        return None
+    if not isinstance(backend, str):
+        return backend
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend: {backend}")
+    return SENTIMENT_BACKENDS[backend](**options)
@@ -0,0 +1,72 @@
+"""
+Word shingle hashing for the Field Distortion Engine.
+
+This module maps word sequences to integer ids and hashes every run of n
+consecutive words (a shingle) to a 64-bit integer with a polynomial rolling
+hash, so shingle sets can be stored as NumPy arrays and compared without
+building n-gram strings.
+"""
+
+import numpy as np
+from typing import Dict, List, Sequence
+
+# Multipliers of the polynomial hash and of the shingle-length salt (odd 64-bit constants)
+_HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+_LENGTH_SALT = np.uint64(0xC2B2AE3D27D4EB4F)
+
+def word_ids(words: Sequence[str], vocabulary: Dict[str, int]) -> np.ndarray:
+    """
+    Map words to integer ids, extending the vocabulary with unseen words.
+
+    Args:
+        words: Sequence of words
+        vocabulary: Mapping of word to id shared by the texts being compared
+
+    Returns:
+        Array of word ids (starting at 1)
+    """
+    ids = [vocabulary.setdefault(word, len(vocabulary) + 1) for word in words]
+    return np.array(ids, dtype=np.uint64)
+
+def shingle_hashes(ids: np.ndarray, n: int) -> np.ndarray:
+    """
+    Hash every run of ``n`` consecutive word ids.
+
+    Hashes of different shingle lengths are salted with ``n``, so shingles of
+    several lengths can share one set.
+
+    Args:
+        ids: Array of word ids
+        n: Shingle length in words
+
+    Returns:
+        Array of hashes, one per shingle start position
+    """
+    return shingle_hashes_range(ids, n, n)[0]
+
+def shingle_hashes_range(ids: np.ndarray, min_n: int, max_n: int) -> List[np.ndarray]:
+    """
+    Hash the shingles of every length from ``min_n`` to ``max_n``.
+
+    Shorter shingles are extended one word at a time, so the cost is the same
+    as hashing only the longest length.
+
+    Args:
+        ids: Array of word ids
+        min_n: Shortest shingle length
+        max_n: Longest shingle length
+
+    Returns:
+        List of hash arrays, one per length from ``min_n`` to ``max_n``
+    """
+    results = []
+    with np.errstate(over="ignore"):
+        hashes = ids.copy()
+        for n in range(1, max_n + 1):
+            if n > 1:
+                count = max(len(ids) - n + 1, 0)
+                hashes = hashes[:count] * _HASH_BASE + ids[n - 1:n - 1 + count]
+            if n >= min_n:
+                results.append(hashes + np.uint64(n) * _LENGTH_SALT)
+
+    return results
@@ -0,0 +1,146 @@
+"""
+Suffix array utilities for the Field Distortion Engine.
+
+This module provides a token-level suffix array, its LCP array and an
+enumeration of maximal repeated phrases, used to find echoes without
+materializing every n-gram.
+"""
+
+import numpy as np
+from typing import List, Sequence, Tuple
+
+def build_suffix_array(tokens: Sequence[int]) -> np.ndarray:
+    """
+    Build the suffix array of a token sequence.
+
+    Uses prefix doubling with vectorized NumPy sorts, so the number of
+    Python-level iterations is logarithmic in the sequence length.
+
+    Args:
+        tokens: Sequence of integer token ids
+
+    Returns:
+        Array of suffix start positions in lexicographic order
+    """
+    tokens = np.asarray(tokens, dtype=np.int64)
+    n = len(tokens)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Initial ranks are the dense ranks of the tokens themselves
+    rank = np.unique(tokens, return_inverse=True)[1].astype(np.int64).reshape(-1)
+    suffix_array = np.argsort(rank, kind="stable")
+
+    k = 1
+    while rank.max() < n - 1 and k < n:
+        # Rank of the suffix starting k tokens later (-1 past the end)
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+
+        suffix_array = np.lexsort((second, rank))
+
+        # Re-rank: a new rank starts wherever the (rank, second) pair changes
+        sorted_rank = rank[suffix_array]
+        sorted_second = second[suffix_array]
+        changed = np.empty(n, dtype=bool)
+        changed[0] = False
+        changed[1:] = (sorted_rank[1:] != sorted_rank[:-1]) | (sorted_second[1:] != sorted_second[:-1])
+
+        rank = np.empty(n, dtype=np.int64)
+        rank[suffix_array] = np.cumsum(changed)
+        k *= 2
+
+    return suffix_array.astype(np.int64)
+
+def build_lcp_array(tokens: Sequence[int], suffix_array: np.ndarray) -> np.ndarray:
+    """
+    Build the longest-common-prefix array using Kasai's algorithm.
+
+    Args:
+        tokens: Sequence of integer token ids
+        suffix_array: Suffix array of ``tokens``
+
+    Returns:
+        Array where ``lcp[i]`` is the common prefix length of the suffixes
+        at ``suffix_array[i - 1]`` and ``suffix_array[i]`` (``lcp[0] == 0``)
+    """
+    tokens = list(tokens)
+    n = len(tokens)
+    lcp = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return lcp
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[suffix_array] = np.arange(n)
+    sa = suffix_array.tolist()
+    rank = rank.tolist()
+
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and tokens[i + h] == tokens[j + h]:
+            h += 1
+        lcp[r] = h
+        if h > 0:
+            h -= 1
+
+    return lcp
+
+def find_maximal_repeats(tokens: Sequence[int], min_length: int = 1) -> List[Tuple[int, np.ndarray]]:
+    """
+    Find maximal repeated phrases in a token sequence.
+
+    A repeat is maximal when it cannot be extended to the left or right
+    without losing an occurrence, so nested sub-phrases of a longer repeat
+    are only reported if they also occur somewhere else. Token ids that
+    occur once (e.g. unique separators) never take part in a repeat.
+
+    Args:
+        tokens: Sequence of integer token ids
+        min_length: Minimum phrase length (in tokens)
+
+    Returns:
+        List of tuples (phrase length, sorted start positions)
+    """
+    tokens = np.asarray(tokens, dtype=np.int64)
+    n = len(tokens)
+    if n < 2:
+        return []
+
+    suffix_array = build_suffix_array(tokens)
+    lcp = build_lcp_array(tokens, suffix_array)
+
+    # Token preceding each suffix; suffixes at position 0 get a unique marker
+    # so they always count as left-diverse
+    preceding = np.empty(n, dtype=np.int64)
+    preceding[suffix_array > 0] = tokens[suffix_array[suffix_array > 0] - 1]
+    preceding[suffix_array == 0] = tokens.min() - 1
+
+    # Prefix count of changes in the preceding token, for O(1) left-maximality checks
+    preceding_changes = np.zeros(n, dtype=np.int64)
+    preceding_changes[1:] = np.cumsum(preceding[1:] != preceding[:-1])
+
+    repeats = []
+    stack = [(0, 0)]  # (lcp value, left bound) of open lcp-intervals
+    lcp_values = lcp.tolist()
+
+    for i in range(1, n + 1):
+        current = lcp_values[i] if i < n else -1
+        left_bound = i - 1
+
+        while stack and current < stack[-1][0]:
+            length, left_bound = stack.pop()
+            right_bound = i - 1
+
+            if length >= min_length and preceding_changes[right_bound] > preceding_changes[left_bound]:
+                positions = np.sort(suffix_array[left_bound:right_bound + 1])
+                repeats.append((length, positions))
+
+        if i < n and (not stack or current > stack[-1][0]):
+            stack.append((current, left_bound))
+
+    return repeats
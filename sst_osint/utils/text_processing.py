@@ -5,7 +5,8 @@ This module provides functions for preprocessing and segmenting text.
 """
 
 import re
-from typing import List
+from bisect import bisect_left
+from typing import IO, Iterable, Iterator, List, Optional, Pattern, Tuple
 
 def preprocess_text(text: str) -> str:
     """
@@ -17,6 +18,10 @@ def preprocess_text(text: str) -> str:
     Returns:
         Preprocessed text
     """
+    return _normalize_text(text).strip()
+
+def _normalize_text(text: str) -> str:
+    """Apply the substitutions of ``preprocess_text``, without stripping the ends."""
     # Remove excessive whitespace
     text = re.sub(r'\s+', ' ', text)
     
@@ -32,69 +37,309 @@ def preprocess_text(text: str) -> str:
     text = re.sub(r'!{2,}', '!', text)
     text = re.sub(r'\?{2,}', '?', text)
     
-    return text.strip()
+    return text
+
+# Units of the segment length limit
+SEGMENT_STRATEGIES = ("chars", "tokens")
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+# Approximates spaCy's tokenization closely enough to bound tokens per segment
+TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
 
-def segment_text(text: str, max_segment_length: int = 1000) -> List[str]:
+def segment_spans(text: str, max_segment_length: int = 1000, 
+                  strategy: str = "chars") -> List[Tuple[int, int]]:
     """
-    Segment text into smaller chunks for analysis.
+    Segment text into smaller chunks for analysis, as character offsets.
+    
+    Paragraphs are packed into segments up to the length limit; longer
+    paragraphs are packed by sentences, and sentences longer than the limit
+    are cut. With the "tokens" strategy the limit counts word and punctuation
+    tokens instead of characters, so the parsing cost of every segment (and
+    of every spaCy batch) is bounded.
+    
+    Segments are slices of ``text``: paragraphs and sentences packed into one
+    segment keep the whitespace between them as it is in the text. Packing
+    decisions count one space per sentence break and two per paragraph break,
+    so preprocessed text (see ``preprocess_text``) is cut exactly where
+    joining the pieces with single spaces would cut it; only the two spaces
+    around a ``[URL]`` replacement are kept where a join had one.
     
     Args:
         text: Input text
-        max_segment_length: Maximum length of each segment (in characters)
+        max_segment_length: Maximum length of each segment, in characters or tokens
+        strategy: Unit of ``max_segment_length``, "chars" or "tokens"
         
     Returns:
-        List of text segments
+        List of (start, end) character offsets of the segments
     """
+    if strategy not in SEGMENT_STRATEGIES:
+        raise ValueError(f"Unknown segmentation strategy: {strategy}")
+    
+    if strategy == "tokens":
+        token_starts = [match.start() for match in TOKEN_PATTERN.finditer(text)]
+        
+        def size(start: int, end: int) -> int:
+            return bisect_left(token_starts, end) - bisect_left(token_starts, start)
+        
+        def cut(start: int, end: int) -> List[Tuple[int, int]]:
+            first, last = bisect_left(token_starts, start), bisect_left(token_starts, end)
+            bounds = [start] + token_starts[first + max_segment_length:last:max_segment_length] + [end]
+            return list(zip(bounds[:-1], bounds[1:]))
+        
+        paragraph_separator = sentence_separator = 0
+    else:
+        def size(start: int, end: int) -> int:
+            return end - start
+        
+        def cut(start: int, end: int) -> List[Tuple[int, int]]:
+            return [(i, min(i + max_segment_length, end)) for i in range(start, end, max_segment_length)]
+        
+        # Packed paragraphs and sentences count as joined by "\n\n" and " "
+        paragraph_separator, sentence_separator = 2, 1
+    
     # If text is shorter than max_segment_length, return as single segment
-    if len(text) <= max_segment_length:
-        return [text]
+    if size(0, len(text)) <= max_segment_length:
+        return [(0, len(text))]
     
     # Try to segment at paragraph boundaries
-    paragraphs = re.split(r'\n\s*\n', text)
+    paragraphs = _split_spans(PARAGRAPH_BREAK, text, 0, len(text))
     
     # If each paragraph is short enough, use paragraphs as segments
-    if all(len(p) <= max_segment_length for p in paragraphs):
-        return [p for p in paragraphs if p.strip()]
+    if all(size(start, end) <= max_segment_length for start, end in paragraphs):
+        return [(start, end) for start, end in paragraphs if _strip_span(text, start, end)]
     
     # Otherwise, segment based on max length, trying to break at sentence boundaries
-    segments = []
-    current_segment = ""
+    spans = []
+    current = None
+    current_size = 0
     
-    for paragraph in paragraphs:
+    def pack(start: int, end: int, separator: int):
+        # Add a paragraph or sentence that fits to the current segment
+        nonlocal current, current_size
+        if current is None:
+            current = (start, end) if end > start else None
+            current_size = size(start, end)
+        else:
+            current = (current[0], end)
+            current_size += separator + size(start, end)
+    
+    for paragraph_start, paragraph_end in paragraphs:
+        paragraph_size = size(paragraph_start, paragraph_end)
+        
         # If adding this paragraph would exceed max length, finalize current segment
-        if len(current_segment) + len(paragraph) > max_segment_length:
-            if current_segment:
-                segments.append(current_segment)
+        if current_size + paragraph_size > max_segment_length:
+            if current is not None:
+                spans.append(current)
+            current, current_size = None, 0
             
             # If paragraph itself is too long, split it by sentences
-            if len(paragraph) > max_segment_length:
-                sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-                current_segment = ""
-                
-                for sentence in sentences:
+            if paragraph_size > max_segment_length:
+                for start, end in _split_spans(SENTENCE_BREAK, text, paragraph_start, paragraph_end):
+                    sentence_size = size(start, end)
+                    
                     # If adding this sentence would exceed max length, finalize current segment
-                    if len(current_segment) + len(sentence) > max_segment_length:
-                        if current_segment:
-                            segments.append(current_segment)
+                    if current_size + sentence_size > max_segment_length:
+                        if current is not None:
+                            spans.append(current)
+                        current, current_size = None, 0
                         
                         # If sentence itself is too long, split it by max length
-                        if len(sentence) > max_segment_length:
-                            # Split by max length
-                            for i in range(0, len(sentence), max_segment_length):
-                                segment = sentence[i:i + max_segment_length]
-                                segments.append(segment)
-                            current_segment = ""
+                        if sentence_size > max_segment_length:
+                            spans.extend(cut(start, end))
                         else:
-                            current_segment = sentence
+                            pack(start, end, sentence_separator)
                     else:
-                        current_segment += " " + sentence if current_segment else sentence
+                        pack(start, end, sentence_separator)
             else:
-                current_segment = paragraph
+                pack(paragraph_start, paragraph_end, paragraph_separator)
         else:
-            current_segment += "\n\n" + paragraph if current_segment else paragraph
+            pack(paragraph_start, paragraph_end, paragraph_separator)
     
     # Add final segment if not empty
-    if current_segment:
-        segments.append(current_segment)
+    if current is not None:
+        spans.append(current)
+    
+    return [span for span in (_strip_span(text, start, end) for start, end in spans) if span]
+
+def segment_text(text: str, max_segment_length: int = 1000, strategy: str = "chars") -> List[str]:
+    """
+    Segment text into smaller chunks for analysis.
+    
+    Args:
+        text: Input text
+        max_segment_length: Maximum length of each segment, in characters or tokens
+        strategy: Unit of ``max_segment_length``, "chars" or "tokens"
+        
+    Returns:
+        List of text segments (see ``segment_spans``)
+    """
+    return [text[start:end] for start, end in segment_spans(text, max_segment_length, strategy)]
+
+def _split_spans(pattern: Pattern, text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """Split ``text[start:end]`` at the matches of a pattern, as in ``re.split``, returning offsets."""
+    spans = []
+    for match in pattern.finditer(text, start, end):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, end))
+    return spans
+
+def _strip_span(text: str, start: int, end: int) -> Optional[Tuple[int, int]]:
+    """Narrow a span to exclude surrounding whitespace; None if nothing is left."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return (start, end) if end > start else None
+
+def read_chunks(file: IO[str], chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Read a text file incrementally in chunks of whole lines.
+    
+    Args:
+        file: Open text file
+        chunk_size: Approximate number of characters per chunk
+        
+    Yields:
+        Chunks of consecutive lines
+    """
+    lines = []
+    size = 0
+    for line in file:
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(lines)
+            lines = []
+            size = 0
+    
+    if lines:
+        yield "".join(lines)
+
+def iter_segments(chunks: Iterable[str], max_segment_length: int = 1000) -> Iterator[str]:
+    """
+    Preprocess and segment text arriving in chunks, without holding it all.
+    
+    Produces the same segments as ``segment_text(preprocess_text(text))`` on
+    the concatenated chunks (for text that is not blank), provided chunks end
+    at line boundaries (as from ``read_chunks``). The sentence in progress at
+    the end of a chunk is carried over until a sentence break is seen; a
+    sentence longer than a segment is cut into segments as soon as enough of
+    it has arrived.
+    
+    Args:
+        chunks: Pieces of raw text, in order
+        max_segment_length: Maximum length of each segment (in characters)
+        
+    Yields:
+        Text segments
+    """
+    pending = ""  # preprocessed text of the sentence in progress
+    pending_break = ""  # whitespace between the previous sentence and the pending one
+    cutting = False  # whole segments were already cut off the sentence in progress
+    started = False  # some text other than whitespace has arrived
+    at_break = False  # the text so far ends with a sentence break
+    line_start = True  # the previous chunk ended with whitespace (or none came yet)
+    head = ""  # all preprocessed text so far, while it may still be a single segment
+    
+    # Segment being packed, and its length counting one space per sentence break
+    # (as in segment_spans, while the text keeps the whitespace of the breaks)
+    current_segment = None
+    current_size = 0
+    
+    def cut(sentence: str) -> Iterator[str]:
+        for i in range(0, len(sentence), max_segment_length):
+            segment = sentence[i:i + max_segment_length].strip()
+            if segment:
+                yield segment
+    
+    def pack(sentences: List[Tuple[str, str]]) -> Iterator[str]:
+        nonlocal current_segment, current_size
+        for sentence_break, sentence in sentences:
+            # If adding this sentence would exceed max length, finalize current segment
+            if current_size + len(sentence) > max_segment_length:
+                if current_segment is not None:
+                    yield current_segment
+                current_segment, current_size = None, 0
+                
+                # If sentence itself is too long, split it by max length
+                if len(sentence) > max_segment_length:
+                    yield from cut(sentence)
+                    continue
+            
+            if current_segment is None:
+                current_segment = sentence or None
+                current_size = len(sentence)
+            else:
+                current_segment += sentence_break + sentence
+                current_size += 1 + len(sentence)
+    
+    for chunk in chunks:
+        if not chunk:
+            continue
+        
+        # Whitespace spanning two chunks collapses to the one space already
+        # produced by the previous chunk, as in preprocess_text
+        text = _normalize_text(chunk.lstrip() if line_start else chunk)
+        line_start = chunk[-1].isspace()
+        
+        if head is not None:
+            head += text
+            if len(head.strip()) > max_segment_length:
+                head = None
+        
+        # Leading whitespace of the text is stripped, and whitespace right
+        # after a sentence break belongs to the break
+        if not started:
+            text = text.lstrip()
+        elif at_break:
+            stripped = text.lstrip()
+            pending_break += text[:len(text) - len(stripped)]
+            text = stripped
+        if not text:
+            continue
+        started = True
+        
+        text = pending + text
+        sentences = []
+        start = 0
+        for match in SENTENCE_BREAK.finditer(text):
+            sentences.append((pending_break, text[start:match.start()]))
+            pending_break = match.group()
+            start = match.end()
+        pending = text[start:]
+        at_break = start == len(text)
+        
+        if cutting and sentences:
+            # The rest of the sentence being cut
+            yield from cut(sentences.pop(0)[1])
+            cutting = False
+        yield from pack(sentences)
+        
+        # Cut whole segments off a sentence that is already too long
+        length = len(pending.rstrip())
+        if length > max_segment_length:
+            if not cutting and current_segment is not None:
+                yield current_segment
+            current_segment, current_size = None, 0
+            cutting = True
+            
+            end = length // max_segment_length * max_segment_length
+            yield from cut(pending[:end])
+            pending = pending[end:]
+    
+    # Text that fits in one segment is not split into sentences
+    if head is not None:
+        if head.strip():
+            yield head.strip()
+        return
     
-    return [segment.strip() for segment in segments if segment.strip()]
+    pending = pending.rstrip()
+    if cutting:
+        yield from cut(pending)
+    elif pending:
+        yield from pack([(pending_break, pending)])
+    if current_segment is not None:
+        yield current_segment
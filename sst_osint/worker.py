@@ -0,0 +1,129 @@
+"""
+Worker process helpers for the Field Distortion Engine.
+
+This module holds the per-process state used by process pools: each worker
+loads its own FieldDistortionEngine (or, for parallel module execution, its
+own set of analyzers) once in the pool initializer and reuses it for every
+task it runs.
+"""
+
+import os
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Engine owned by the current worker process
+_engine = None
+
+# Analyzers owned by the current worker process, for parallel module execution
+_analyzer_nlp = None
+_analyzer_options = {}
+_analyzers = {}
+
+def init_worker(engine_options: Optional[Dict[str, Any]] = None):
+    """
+    Pool initializer: load a FieldDistortionEngine for this process.
+
+    Args:
+        engine_options: Keyword arguments for FieldDistortionEngine
+    """
+    global _engine
+    from .fde import FieldDistortionEngine
+
+    _engine = FieldDistortionEngine(**(engine_options or {}))
+    logger.info("Worker engine loaded.")
+
+def get_engine():
+    """Return the worker's engine, loading it with defaults if needed."""
+    if _engine is None:
+        init_worker()
+    return _engine
+
+def analyze_text(text: str) -> Dict[str, Any]:
+    """
+    Analyze a text with the worker's engine.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Dictionary containing analysis results
+    """
+    return get_engine().analyze(text)
+
+def analyze_file(path: str, modules: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Analyze a text file with the worker's engine and summarize the results.
+
+    Args:
+        path: Path of the text file
+        modules: Names of the analyzers to run (all if None)
+
+    Returns:
+        Dictionary with the path, size, summary metrics (see
+        ``cli.summarize_results``) and run time, or an "error" entry
+    """
+    from .cli import summarize_results
+
+    start = time.perf_counter()
+    line = {"path": path}
+    try:
+        line["bytes"] = os.path.getsize(path)
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            results = get_engine().analyze(f.read(), modules=modules)
+        if 'error' in results:
+            line["error"] = results['error']
+        else:
+            line.update(summarize_results(results))
+    except Exception as e:
+        logger.error(f"Error analyzing {path}: {e}")
+        line["error"] = str(e)
+
+    line["seconds"] = time.perf_counter() - start
+    return line
+
+def init_analyzer_worker(lang: str, analyzer_options: Optional[Dict[str, Dict]] = None):
+    """
+    Pool initializer for parallel module execution.
+    
+    Segments arrive as serialized Docs, so a blank pipeline of the same
+    language is enough to restore them; no model is loaded.
+    
+    Args:
+        lang: Language code of the engine's pipeline
+        analyzer_options: Keyword arguments for individual analyzers by name
+    """
+    global _analyzer_nlp, _analyzer_options
+    import spacy
+    
+    _analyzer_nlp = spacy.blank(lang)
+    _analyzer_options = analyzer_options or {}
+    _analyzers.clear()
+
+def run_analyzer(name: str, doc_bytes: bytes) -> Tuple[Dict[str, Any], Dict[str, Dict]]:
+    """
+    Run one analyzer over serialized segments.
+    
+    Args:
+        name: Name of the analyzer (see ``fde.ANALYZERS``)
+        doc_bytes: Segments serialized with ``spacy.tokens.DocBin``
+        
+    Returns:
+        Tuple (analyzer results, timers and counters recorded while running)
+    """
+    from spacy.tokens import DocBin
+    from .fde import analyzer_class
+    from .utils.instrumentation import Recorder, recording, timer
+    
+    analyzer = _analyzers.get(name)
+    if analyzer is None:
+        analyzer = analyzer_class(name)(_analyzer_nlp, **_analyzer_options.get(name, {}))
+        _analyzers[name] = analyzer
+    
+    with recording(Recorder()) as recorder:
+        docs = list(DocBin().from_bytes(doc_bytes).get_docs(_analyzer_nlp.vocab))
+        with timer(f"analyzer.{name}"):
+            results = analyzer.analyze(docs)
+    return results, recorder.as_dict()
@@ -0,0 +1,48 @@
+"""
+Tests for the Aho-Corasick matcher in sst_osint.utils.aho_corasick.
+"""
+
+import random
+import re
+
+from sst_osint.utils.aho_corasick import AhoCorasick
+
+def random_string(rng: random.Random, alphabet: str, max_length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+def naive_matches(patterns: list, text: str) -> list:
+    """Every occurrence of every non-empty pattern, overlapping ones included."""
+    return sorted((pattern_id, start, start + len(pattern))
+                  for pattern_id, pattern in enumerate(patterns) if pattern
+                  for start in range(len(text)) if text.startswith(pattern, start))
+
+def naive_find_all(patterns: list, text: str) -> list:
+    return sorted((pattern_id, match.start(), match.end())
+                  for pattern_id, pattern in enumerate(patterns) if pattern
+                  for match in re.finditer(re.escape(pattern), text))
+
+def test_matches_agree_with_naive_scan():
+    patterns = ["he", "she", "his", "hers", "her", "he"]
+    text = "ushers say she is his, and hers is hers"
+    automaton = AhoCorasick(patterns)
+    assert sorted(automaton.iter_matches(text)) == naive_matches(patterns, text)
+    assert automaton.find_all(text) == naive_find_all(patterns, text)
+
+def test_matches_are_reported_in_order_of_end_position():
+    automaton = AhoCorasick(["abc", "b", "bc", "c"])
+    ends = [end for _, _, end in automaton.iter_matches("xabcbc")]
+    assert ends == sorted(ends)
+
+def test_matches_agree_with_naive_scan_on_random_inputs():
+    rng = random.Random(0)
+    for _ in range(500):
+        patterns = [random_string(rng, "abc", 4) for _ in range(rng.randint(0, 8))]
+        text = random_string(rng, "abcd", 50)
+        automaton = AhoCorasick(patterns)
+        assert sorted(automaton.iter_matches(text)) == naive_matches(patterns, text), (patterns, text)
+        assert automaton.find_all(text) == naive_find_all(patterns, text), (patterns, text)
+
+def test_empty_patterns_never_match():
+    automaton = AhoCorasick(["", "a"])
+    assert len(automaton) == 2
+    assert automaton.find_all("aa") == [(1, 0, 1), (1, 1, 2)]
@@ -0,0 +1,98 @@
+"""
+Tests for the result caches in sst_osint.cache.
+"""
+
+import numpy as np
+
+from sst_osint.cache import DiskCache, LRUCache, ResultCache, content_key
+
+RESULT = {
+    "score": np.float32(0.25),
+    "values": np.arange(3),
+    "pair": (1, 2),
+    "nested": {"name": "drift", "items": [np.int64(4), 5.5]},
+}
+EXPECTED = {
+    "score": 0.25,
+    "values": [0, 1, 2],
+    "pair": [1, 2],
+    "nested": {"name": "drift", "items": [4, 5.5]},
+}
+
+def test_memory_and_disk_tiers_return_the_same_result(tmp_path):
+    cache = ResultCache(8, str(tmp_path))
+    cache.put("key", RESULT)
+    from_memory = cache.get("key")
+
+    cache.memory.clear()
+    from_disk = cache.get("key")
+
+    assert from_memory == from_disk == EXPECTED
+    assert type(from_memory["score"]) is type(from_disk["score"]) is float
+
+    # The disk hit was promoted to memory
+    assert cache.memory.get("key") == EXPECTED
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    ResultCache(8, str(tmp_path)).put("key", RESULT)
+    assert ResultCache(8, str(tmp_path)).get("key") == EXPECTED
+
+def test_results_are_copies(tmp_path):
+    cache = ResultCache(8, str(tmp_path))
+    result = {"items": [1, 2]}
+    cache.put("key", result)
+    result["items"].append(3)
+
+    cached = cache.get("key")
+    cached["items"].append(4)
+    assert cache.get("key") == {"items": [1, 2]}
+
+def test_missing_keys_and_clear(tmp_path):
+    cache = ResultCache(8, str(tmp_path))
+    assert cache.get("missing") is None
+    cache.put("key", {"a": 1})
+    cache.clear()
+    assert cache.get("key") is None
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = ResultCache(100, max_memory_bytes=100)
+    cache.put("large", {"text": "x" * 200})
+    assert cache.get("large") is None
+
+    for key in ("a", "b", "c"):
+        cache.put(key, {"text": "x" * 30})
+    assert cache.get("a") is None
+    assert cache.get("b") == cache.get("c") == {"text": "x" * 30}
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2
+
+def test_disk_cache_evicts_least_recently_accessed(tmp_path):
+    value = {"text": "".join(chr(ord("a") + i % 26) * (i % 7 + 1) for i in range(400))}
+    disk = DiskCache(str(tmp_path), max_bytes=1)
+    disk.put("too_large", value)
+    assert disk.get("too_large") is None
+
+    disk = DiskCache(str(tmp_path / "sized"))
+    disk.put("size", value)
+    with disk._connect() as conn:
+        size = conn.execute("SELECT size FROM results").fetchone()[0]
+
+    disk = DiskCache(str(tmp_path / "bounded"), max_bytes=2 * size)
+    disk.put("a", value)
+    disk.put("b", value)
+    disk.get("a")
+    disk.put("c", value)
+    assert disk.get("b") is None
+    assert disk.get("a") == disk.get("c") == value
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("a", "b") == content_key("a", "b")
@@ -0,0 +1,140 @@
+"""
+Tests for the failure and requeue paths of the background job queue (jobs.py).
+
+The worker pool is replaced by stand-ins, so no analysis runs.
+"""
+
+import uuid
+import importlib
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+
+import pytest
+
+class BrokenExecutor:
+    """Stand-in for a process pool whose workers died."""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("a worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    pytest.importorskip("flask_sqlalchemy")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # The app reads its configuration at import
+        database = tmp_path_factory.mktemp("jobs") / "jobs.db"
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{database}")
+        monkeypatch.setenv("FDE_JOB_AUTOSTART", "0")
+        monkeypatch.delenv("FDE_PRELOAD", raising=False)
+        yield importlib.import_module("app")
+
+@pytest.fixture
+def queue(app_module, monkeypatch):
+    from jobs import JobQueue
+    from models import AnalysisJob
+
+    queue = JobQueue(app_module.app, num_workers=1, stale_after=60)
+    replacements = []
+    def create_executor():
+        replacements.append(object())
+        return replacements[-1]
+    monkeypatch.setattr(queue, "_create_executor", create_executor)
+    queue.replacements = replacements
+
+    with app_module.app.app_context():
+        app_module.db.session.query(AnalysisJob).delete()
+        app_module.db.session.commit()
+        yield queue
+
+def add_job(db, status, started_at=None, text="Some text to analyze."):
+    from models import AnalysisJob
+
+    job = AnalysisJob(id=uuid.uuid4().hex, status=status, text=text, started_at=started_at)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+def get_job(db, job_id):
+    from models import AnalysisJob
+
+    db.session.expire_all()
+    return db.session.get(AnalysisJob, job_id)
+
+def test_stale_running_jobs_are_requeued(app_module, queue):
+    from models import AnalysisJob
+
+    db = app_module.db
+    stale = add_job(db, AnalysisJob.RUNNING, datetime.utcnow() - timedelta(seconds=120))
+    fresh = add_job(db, AnalysisJob.RUNNING, datetime.utcnow())
+
+    queue._requeue_stale()
+
+    assert get_job(db, stale).status == AnalysisJob.QUEUED
+    assert get_job(db, stale).started_at is None
+    assert get_job(db, fresh).status == AnalysisJob.RUNNING
+
+def test_claimed_job_is_requeued_when_the_pool_is_broken(app_module, queue):
+    from models import AnalysisJob
+
+    db = app_module.db
+    job_id = add_job(db, AnalysisJob.QUEUED)
+    broken = BrokenExecutor()
+    queue._executor = broken
+
+    job = queue._claim_next()
+    assert job[0] == job_id
+    with pytest.raises(BrokenProcessPool):
+        queue._run(job)
+
+    assert get_job(db, job_id).status == AnalysisJob.QUEUED
+    assert queue._in_flight == 0
+    assert broken.shut_down
+    assert queue._executor is queue.replacements[0]
+
+def test_running_job_fails_when_its_worker_dies(app_module, queue):
+    from models import AnalysisJob
+
+    db = app_module.db
+    job_id = add_job(db, AnalysisJob.RUNNING, datetime.utcnow())
+    broken = BrokenExecutor()
+    queue._executor = broken
+    queue._in_flight = 1
+
+    future = Future()
+    future.set_exception(BrokenProcessPool("a worker died"))
+    queue._finish(job_id, "Some text to analyze.", future, broken)
+
+    job = get_job(db, job_id)
+    assert job.status == AnalysisJob.FAILED
+    assert "a worker died" in job.error
+    assert job.finished_at is not None
+    assert queue._in_flight == 0
+    assert queue._executor is queue.replacements[0]
+
+    # Other jobs from the same broken pool do not replace the new pool again
+    other = add_job(db, AnalysisJob.RUNNING, datetime.utcnow())
+    queue._in_flight = 1
+    queue._finish(other, "Some text to analyze.", future, broken)
+    assert len(queue.replacements) == 1
+
+def test_analysis_errors_fail_the_job(app_module, queue):
+    from models import AnalysisJob
+
+    db = app_module.db
+    job_id = add_job(db, AnalysisJob.RUNNING, datetime.utcnow())
+    queue._in_flight = 1
+
+    future = Future()
+    future.set_result({"error": "Text is too short"})
+    queue._finish(job_id, "Short.", future)
+
+    job = get_job(db, job_id)
+    assert job.status == AnalysisJob.FAILED
+    assert job.error == "Text is too short"
@@ -0,0 +1,75 @@
+"""
+Tests for MinHash and LSH in sst_osint.utils.minhash.
+"""
+
+import itertools
+
+import numpy as np
+
+from sst_osint.utils.minhash import lsh_candidate_pairs, minhash_signatures
+
+MASK = 2**64 - 1
+
+def random_sets(rng: np.random.Generator, num_sets: int, max_size: int) -> list:
+    return [rng.integers(0, 2**63, size=rng.integers(0, max_size), dtype=np.uint64)
+            for _ in range(num_sets)]
+
+def naive_signatures(shingle_sets: list, num_perm: int, seed: int) -> np.ndarray:
+    """Apply each affine permutation to each shingle with Python integers."""
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)).tolist()
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64).tolist()
+    signatures = np.full((len(shingle_sets), num_perm), MASK, dtype=np.uint64)
+    for row, shingles in enumerate(shingle_sets):
+        for column in range(num_perm):
+            values = [((int(s) * a[column] + b[column]) & MASK) >> 32 for s in shingles.tolist()]
+            if values:
+                signatures[row, column] = min(values)
+    return signatures
+
+def naive_candidate_pairs(signatures: np.ndarray, bands: int) -> set:
+    """Pairs of non-empty sets whose signatures agree on a whole band."""
+    rows_per_band = max(1, signatures.shape[1] // bands)
+    valid = [i for i in range(len(signatures)) if signatures[i, 0] != MASK]
+    pairs = set()
+    for i, j in itertools.combinations(valid, 2):
+        for band in range(min(bands, signatures.shape[1] // rows_per_band)):
+            columns = slice(band * rows_per_band, (band + 1) * rows_per_band)
+            if np.array_equal(signatures[i, columns], signatures[j, columns]):
+                pairs.add((i, j))
+                break
+    return pairs
+
+def test_signatures_match_brute_force():
+    rng = np.random.default_rng(0)
+    # More shingles than one chunk, so sets are split across chunks
+    shingle_sets = random_sets(rng, 60, 200)
+    assert sum(len(s) for s in shingle_sets) > 4096
+    assert np.array_equal(minhash_signatures(shingle_sets, num_perm=16, seed=3),
+                          naive_signatures(shingle_sets, num_perm=16, seed=3))
+
+def test_empty_sets_get_the_maximum_signature():
+    signatures = minhash_signatures([np.zeros(0, dtype=np.uint64)] * 2, num_perm=8)
+    assert (signatures == MASK).all()
+
+def test_candidate_pairs_match_brute_force():
+    rng = np.random.default_rng(1)
+    # Near-duplicates of a few base sets, so many bands agree
+    bases = random_sets(rng, 5, 30)
+    noise = random_sets(rng, 40, 4)
+    shingle_sets = [np.unique(np.concatenate([bases[i % 5], noise[i]])) for i in range(40)]
+    shingle_sets.append(np.zeros(0, dtype=np.uint64))
+    signatures = minhash_signatures(shingle_sets, num_perm=32)
+
+    for bands in (4, 8, 32):
+        rows, cols = lsh_candidate_pairs(signatures, bands=bands, max_bucket_size=len(shingle_sets))
+        assert (rows < cols).all()
+        assert set(zip(rows.tolist(), cols.tolist())) == naive_candidate_pairs(signatures, bands)
+
+def test_oversized_buckets_are_skipped():
+    shingles = np.arange(10, dtype=np.uint64)
+    signatures = minhash_signatures([shingles] * 5, num_perm=8)
+    rows, cols = lsh_candidate_pairs(signatures, bands=4, max_bucket_size=4)
+    assert len(rows) == len(cols) == 0
+    rows, _ = lsh_candidate_pairs(signatures, bands=4, max_bucket_size=5)
+    assert len(rows) == 10
@@ -0,0 +1,72 @@
+"""
+Tests for incremental stream analysis in sst_osint.stream.
+
+The session tests need the en_core_web_sm spaCy model and are skipped without it.
+"""
+
+import math
+
+import pytest
+
+from sst_osint.stream import RunningEntropy
+
+SENTENCES = [
+    "She said it would be our secret, and that nobody else would understand.",
+    "Every night the door stayed locked while he promised the pain would end.",
+    "I trusted him because he told me I was special.",
+    "Now the memory feels like a shadow that follows me from room to room.",
+    "The river remembers what the town forgot!",
+    "Was it really a dream?",
+]
+
+@pytest.fixture(scope="module")
+def engine():
+    spacy = pytest.importorskip("spacy")
+    try:
+        spacy.load("en_core_web_sm")
+    except OSError:
+        pytest.skip("the en_core_web_sm spaCy model is not installed")
+
+    from sst_osint.fde import FieldDistortionEngine
+    engine = FieldDistortionEngine(cache_size=0, calibrate=False)
+    yield engine
+    engine.close()
+
+def assert_same_metrics(incremental, full):
+    assert incremental["status"] == full["status"]
+    assert incremental["metrics"] == pytest.approx(full["metrics"], abs=1e-9)
+    assert incremental["classification"] == full["classification"]
+
+def test_incremental_updates_match_a_fresh_analysis(engine):
+    session = engine.stream_session()
+    buffers = [" ".join(SENTENCES[:n]) for n in range(1, len(SENTENCES) + 1)]
+
+    # Edits in the middle and deletions at the end, after the buffer has grown
+    buffers.append(buffers[-1].replace("the door", "the heavy door"))
+    buffers.append(" ".join(SENTENCES[:3]))
+    buffers.append(" ".join(SENTENCES[:3] + SENTENCES[4:]))
+
+    for text in buffers:
+        assert_same_metrics(session.update(text), engine.stream_session().update(text))
+
+def test_reset_forgets_the_buffer(engine):
+    session = engine.stream_session()
+    session.update(" ".join(SENTENCES))
+    session.reset()
+    text = " ".join(SENTENCES[2:4])
+    assert_same_metrics(session.update(text), engine.stream_session().update(text))
+
+def test_short_buffers_need_more_text(engine):
+    assert engine.stream_session().update("Hi.")["status"] == "insufficient_data"
+
+def test_running_entropy_matches_direct_computation():
+    entropy = RunningEntropy()
+    entropy.update({"a": 3, "b": 1, "c": 4})
+    entropy.update({"a": 1}, -1)
+    counts = {"a": 2, "b": 1, "c": 4}
+    total = sum(counts.values())
+    expected = -sum(c / total * math.log2(c / total) for c in counts.values())
+    assert entropy.value() == pytest.approx(expected)
+
+    entropy.update(counts, -1)
+    assert entropy.value() == 0.0 and entropy.total == 0
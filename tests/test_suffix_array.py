@@ -0,0 +1,79 @@
+"""
+Tests for the suffix array utilities in sst_osint.utils.suffix_array.
+"""
+
+import random
+from collections import defaultdict
+
+import pytest
+
+from sst_osint.utils.suffix_array import build_lcp_array, build_suffix_array, find_maximal_repeats
+
+def random_tokens(rng: random.Random) -> list:
+    """Build a token sequence over a small alphabet, so repeats are common."""
+    return [rng.randint(0, rng.choice([1, 2, 3, 5])) for _ in range(rng.randint(0, 60))]
+
+def naive_suffix_array(tokens: list) -> list:
+    return sorted(range(len(tokens)), key=lambda i: tokens[i:])
+
+def naive_lcp(tokens: list, suffix_array: list) -> list:
+    lcp = [0] * len(tokens)
+    for r in range(1, len(tokens)):
+        first, second = tokens[suffix_array[r - 1]:], tokens[suffix_array[r]:]
+        while lcp[r] < min(len(first), len(second)) and first[lcp[r]] == second[lcp[r]]:
+            lcp[r] += 1
+    return lcp
+
+def naive_maximal_repeats(tokens: list, min_length: int = 1) -> set:
+    """Every phrase occurring twice or more whose occurrences differ on both sides."""
+    n = len(tokens)
+    repeats = set()
+    for length in range(max(1, min_length), n):
+        occurrences = defaultdict(list)
+        for start in range(n - length + 1):
+            occurrences[tuple(tokens[start:start + length])].append(start)
+        for positions in occurrences.values():
+            if len(positions) < 2:
+                continue
+            # The start and end of the sequence differ from every token
+            left = {tokens[p - 1] if p > 0 else "start" for p in positions}
+            right = {tokens[p + length] if p + length < n else "end" for p in positions}
+            if len(left) > 1 and len(right) > 1:
+                repeats.add((length, tuple(positions)))
+    return repeats
+
+@pytest.mark.parametrize("tokens", [
+    [],
+    [7],
+    [1, 1, 1, 1, 1],
+    [2, 1, 2, 1, 2, 1],
+    [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5],
+])
+def test_suffix_and_lcp_arrays_match_brute_force(tokens):
+    suffix_array = build_suffix_array(tokens)
+    assert suffix_array.tolist() == naive_suffix_array(tokens)
+    assert build_lcp_array(tokens, suffix_array).tolist() == naive_lcp(tokens, naive_suffix_array(tokens))
+
+def test_suffix_and_lcp_arrays_match_brute_force_on_random_sequences():
+    rng = random.Random(0)
+    for _ in range(300):
+        tokens = random_tokens(rng)
+        expected = naive_suffix_array(tokens)
+        suffix_array = build_suffix_array(tokens)
+        assert suffix_array.tolist() == expected, tokens
+        assert build_lcp_array(tokens, suffix_array).tolist() == naive_lcp(tokens, expected), tokens
+
+def test_maximal_repeats_match_brute_force_on_random_sequences():
+    rng = random.Random(1)
+    for _ in range(300):
+        tokens = random_tokens(rng)
+        min_length = rng.choice([1, 2, 3])
+        found = {(length, tuple(positions.tolist()))
+                 for length, positions in find_maximal_repeats(tokens, min_length)}
+        assert found == naive_maximal_repeats(tokens, min_length), (tokens, min_length)
+
+def test_maximal_repeats_skip_nested_phrases():
+    # "1 2 3" occurs twice; its sub-phrases only occur inside it
+    tokens = [1, 2, 3, 9, 1, 2, 3, 8]
+    repeats = [(length, positions.tolist()) for length, positions in find_maximal_repeats(tokens)]
+    assert repeats == [(3, [0, 4])]
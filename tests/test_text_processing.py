@@ -0,0 +1,53 @@
+"""
+Tests for the streaming segmenter in sst_osint.utils.text_processing.
+"""
+
+import io
+import random
+
+import pytest
+
+from sst_osint.utils.text_processing import iter_segments, preprocess_text, read_chunks, segment_text
+
+WORDS = ["a", "bb", "ccc", "end.", "why?", "!!", "wow!", "...", "x...", "??",
+         "http://example.com/p?q=1", "“q”", "it’s", "longwordxxxxxxxxxxxxxxxx"]
+SEPARATORS = [" ", " ", " ", "  ", "\t", "\n", "\n\n", " \n ", "\n   "]
+CHUNK_SIZES = [1, 2, 5, 10, 17, 50, 65536]
+
+def random_text(rng: random.Random) -> str:
+    """Build a text mixing sentence breaks, line breaks, URLs and repeated punctuation."""
+    parts = []
+    for _ in range(rng.randint(1, 120)):
+        parts.append(rng.choice(WORDS))
+        parts.append(rng.choice(SEPARATORS))
+    text = ("  " if rng.random() < 0.2 else "") + "".join(parts)
+    return text.rstrip() if rng.random() < 0.5 else text
+
+def chunked_segments(text: str, chunk_size: int, max_segment_length: int):
+    return list(iter_segments(read_chunks(io.StringIO(text), chunk_size), max_segment_length))
+
+@pytest.mark.parametrize("text, max_segment_length", [
+    ("bb bb end. \n !! why? a", 5),
+    ("see http://example.com\nnext line. and more", 8),
+    ("http://example.com\n... end. \n wow!", 8),
+    ("short text.\n", 1000),
+])
+def test_iter_segments_matches_segment_text(text, max_segment_length):
+    expected = segment_text(preprocess_text(text), max_segment_length)
+    for chunk_size in CHUNK_SIZES:
+        assert chunked_segments(text, chunk_size, max_segment_length) == expected
+
+def test_iter_segments_matches_segment_text_on_random_texts():
+    rng = random.Random(0)
+    for _ in range(500):
+        text = random_text(rng)
+        if not preprocess_text(text):
+            continue
+        max_segment_length = rng.choice([1, 3, 5, 8, 13, 40, 100, 1000])
+        expected = segment_text(preprocess_text(text), max_segment_length)
+        for chunk_size in CHUNK_SIZES:
+            assert chunked_segments(text, chunk_size, max_segment_length) == expected, \
+                (text, chunk_size, max_segment_length)
+
+def test_iter_segments_skips_blank_input():
+    assert chunked_segments(" \n\n \n", 1, 10) == []